@@ -1,8 +1,25 @@
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash
+from flask import Flask, render_template, request, redirect, url_for, session, jsonify, flash, g, Response, has_request_context
 import pandas as pd
+import numpy as np
 import os
 from functools import wraps, lru_cache
 import json
+import hashlib
+import threading
+import time
+import cProfile
+import pstats
+import io
+import marshal
+from concurrent.futures import ThreadPoolExecutor
+import uuid
+import tempfile
+from contextlib import contextmanager
+import click
+try:
+    import fcntl
+except ImportError:  # Windows - change log appends are then only serialised within a process
+    fcntl = None
 
 app = Flask(__name__)
 app.secret_key = 'placement_secret_key_2024'
@@ -12,6 +29,8 @@ STUDENTS_CSV = 'data/FULL NAME LIST.csv'
 PLACEMENT_CSV = 'data/Master_Placement_Fila.csv'
 ANALYSIS_CSV = 'data/Analysis - Overall.csv'
 ANALYSIS_FOLDER = 'data/ANALYSIS'
+# State every worker process shares (request profiles, metrics) lives on disk under here
+RUNTIME_FOLDER = os.environ.get('RUNTIME_FOLDER', 'data/runtime')
 
 # Hardcoded credentials with roles
 USERS = {
@@ -41,17 +60,128 @@ PR_MAPPING = {
     'PR12': 'MARIA BOBY'
 }
 
-# Class assignment based on Sl. no
-def get_class_from_slno(sl_no):
+# Cohorts - every batch has its own CSV files, caches and class-range table.
+# The files directly under data/ are the default cohort; other batches live in
+# data/cohorts/<cohort_id>/ with the same file names and an optional cohort.json:
+#     {"label": "MCA 2025-27", "class_ranges": [[1, 60, "MCA A"], [61, 120, "MCA B"]]}
+COHORTS_FOLDER = 'data/cohorts'
+COHORT_CONFIG_FILE = 'cohort.json'
+ALIAS_FILE = 'name_aliases.csv'
+CHANGE_LOG_FILE = 'changes.csv'
+STAGE_STORE_FILE = 'analysis_stages.bin'
+JOBS_FOLDER = 'jobs'
+DEFAULT_COHORT = 'current'
+CLASS_RANGES = [[1, 59, 'MCA A'], [60, 119, 'MCA B'], [120, 176, 'MSc AIML']]
+
+_cohort_registry = {'signature': None, 'cohorts': {}}
+_active_cohort = threading.local()
+
+def _read_cohort_config(folder):
+    config_path = os.path.join(folder, COHORT_CONFIG_FILE)
+    if not os.path.exists(config_path):
+        return {}
+    try:
+        with open(config_path) as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error reading {config_path}: {e}")
+        return {}
+
+def _build_cohorts(folders):
+    default_config = _read_cohort_config(os.path.dirname(STUDENTS_CSV))
+    cohorts = {
+        DEFAULT_COHORT: {
+            'id': DEFAULT_COHORT,
+            'label': default_config.get('label', 'Current Batch'),
+            'class_ranges': default_config.get('class_ranges', CLASS_RANGES),
+            'students_csv': STUDENTS_CSV,
+            'placement_csv': PLACEMENT_CSV,
+            'analysis_csv': ANALYSIS_CSV,
+            'analysis_folder': ANALYSIS_FOLDER,
+            'alias_csv': os.path.join(os.path.dirname(STUDENTS_CSV), ALIAS_FILE),
+            'change_log_csv': os.path.join(os.path.dirname(STUDENTS_CSV), CHANGE_LOG_FILE),
+            'stage_store': os.path.join(os.path.dirname(STUDENTS_CSV), STAGE_STORE_FILE),
+            'jobs_folder': os.path.join(os.path.dirname(STUDENTS_CSV), JOBS_FOLDER)
+        }
+    }
+    for cohort_id in folders:
+        folder = os.path.join(COHORTS_FOLDER, cohort_id)
+        config = _read_cohort_config(folder)
+        cohorts[cohort_id] = {
+            'id': cohort_id,
+            'label': config.get('label', cohort_id),
+            'class_ranges': config.get('class_ranges', CLASS_RANGES),
+            'students_csv': os.path.join(folder, os.path.basename(STUDENTS_CSV)),
+            'placement_csv': os.path.join(folder, os.path.basename(PLACEMENT_CSV)),
+            'analysis_csv': os.path.join(folder, os.path.basename(ANALYSIS_CSV)),
+            'analysis_folder': os.path.join(folder, os.path.basename(ANALYSIS_FOLDER)),
+            'alias_csv': os.path.join(folder, ALIAS_FILE),
+            'change_log_csv': os.path.join(folder, CHANGE_LOG_FILE),
+            'stage_store': os.path.join(folder, STAGE_STORE_FILE),
+            'jobs_folder': os.path.join(folder, JOBS_FOLDER)
+        }
+    return cohorts
+
+def get_cohorts():
+    """
+    Return {cohort_id: cohort} for the default cohort and every folder in COHORTS_FOLDER.
+    The folder is only re-scanned when it or a cohort.json changes.
+    """
+    folders = []
+    if os.path.isdir(COHORTS_FOLDER):
+        folders = sorted(
+            name for name in os.listdir(COHORTS_FOLDER)
+            if name != DEFAULT_COHORT and os.path.isdir(os.path.join(COHORTS_FOLDER, name))
+        )
+    config_folders = [os.path.dirname(STUDENTS_CSV)] + [os.path.join(COHORTS_FOLDER, name) for name in folders]
+    signature = (
+        STUDENTS_CSV, PLACEMENT_CSV, ANALYSIS_CSV, ANALYSIS_FOLDER, tuple(folders),
+        tuple(_file_signature(os.path.join(folder, COHORT_CONFIG_FILE)) for folder in config_folders)
+    )
+    if signature != _cohort_registry['signature']:
+        _cohort_registry['cohorts'] = _build_cohorts(folders)
+        _cohort_registry['signature'] = signature
+    return _cohort_registry['cohorts']
+
+def current_cohort():
+    """
+    The cohort being worked on: the one pinned with use_cohort(), else the one selected
+    for the current request, else the default cohort.
+    """
+    cohort_id = getattr(_active_cohort, 'cohort_id', None)
+    if cohort_id is None and has_request_context():
+        cohort_id = g.get('cohort')
+    return cohort_id or DEFAULT_COHORT
+
+@contextmanager
+def use_cohort(cohort_id):
+    previous = getattr(_active_cohort, 'cohort_id', None)
+    _active_cohort.cohort_id = cohort_id
+    try:
+        yield
+    finally:
+        _active_cohort.cohort_id = previous
+
+def cohort_config():
+    cohorts = get_cohorts()
+    return cohorts.get(current_cohort(), cohorts[DEFAULT_COHORT])
+
+# Class assignment based on Sl. no, using the cohort's class-range table
+def get_class_from_slno(sl_no, class_ranges=None):
     sl_no = int(sl_no)
-    if 1 <= sl_no <= 59:
-        return 'MCA A'
-    elif 60 <= sl_no <= 119:
-        return 'MCA B'
-    elif 120 <= sl_no <= 176:
-        return 'MSc AIML'
+    if class_ranges is None:
+        class_ranges = cohort_config()['class_ranges']
+    for first, last, class_name in class_ranges:
+        if first <= sl_no <= last:
+            return class_name
     return 'Unknown'
 
+def cohort_class_names():
+    """
+    The current cohort's class labels, in class-range order.
+    """
+    return list(dict.fromkeys(class_name for _, _, class_name in cohort_config()['class_ranges']))
+
 # Login required decorator
 def login_required(f):
     @wraps(f)
@@ -73,27 +203,578 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+# Cohort selection - ?cohort=<id> picks the cohort and is remembered in the session
+@app.before_request
+def select_cohort():
+    cohorts = get_cohorts()
+    requested = request.args.get('cohort')
+    if requested is not None:
+        if requested not in cohorts:
+            if request.path.startswith('/api/'):
+                return jsonify({'error': f'Unknown cohort: {requested}'}), 404
+            return f'Unknown cohort: {requested}', 404
+        session['cohort'] = requested
+    cohort_id = session.get('cohort', DEFAULT_COHORT)
+    g.cohort = cohort_id if cohort_id in cohorts else DEFAULT_COHORT
+
+# Request, data-load and cache metrics, exposed at /metrics. Each worker process counts in
+# memory and flushes a snapshot to RUNTIME_FOLDER/metrics/<pid>-<start>.json at most every
+# METRICS_FLUSH_SECONDS; a scrape adds the serving worker's live counters to every other
+# worker's latest snapshot, so the totals cover all workers whichever one answers.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_FLUSH_SECONDS = 5
+# Addresses allowed to scrape /metrics without logging in (comma separated)
+METRICS_ALLOWED_ADDRESSES = [address.strip() for address in os.environ.get('METRICS_ALLOWED_ADDRESSES', '127.0.0.1,::1').split(',') if address.strip()]
+_metrics = {
+    'request_latency': {},   # endpoint -> {'buckets': [count per bucket], 'sum': seconds, 'count': n}
+    'requests': {},          # (endpoint, status) -> count
+    'csv_loads': {},         # file -> count
+    'csv_bytes': {},         # file -> bytes read
+    'cache': {},             # (cache, 'hit'|'miss') -> count
+    'function_time': {}      # function or section -> {'sum': seconds, 'count': n}
+}
+_metrics_lock = threading.Lock()
+_metrics_file = {'path': None, 'flushed_at': 0.0}
+
+def _metrics_folder():
+    return os.path.join(RUNTIME_FOLDER, 'metrics')
+
+def _snapshot_metrics():
+    # {metric: [[key, value], ...]} with tuple keys as lists, so it survives a JSON round trip
+    with _metrics_lock:
+        return json.loads(json.dumps({
+            metric: [[list(key) if isinstance(key, tuple) else key, value] for key, value in values.items()]
+            for metric, values in _metrics.items()
+        }))
+
+def flush_metrics():
+    """
+    Write this process's counters to its snapshot file in the shared metrics folder.
+    """
+    folder = _metrics_folder()
+    try:
+        os.makedirs(folder, exist_ok=True)
+        if _metrics_file['path'] is None:
+            _metrics_file['path'] = os.path.join(folder, f'{os.getpid()}-{time.time_ns()}.json')
+        snapshot = _snapshot_metrics()
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=folder)
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(snapshot, handle)
+        os.replace(temp_path, _metrics_file['path'])
+        _metrics_file['flushed_at'] = time.time()
+    except Exception as e:
+        print(f"Error flushing metrics: {e}")
+
+def clear_shared_metrics():
+    """
+    Remove every worker's snapshot file - called once when the server starts, so counters
+    start from zero like a single process would.
+    """
+    folder = _metrics_folder()
+    if os.path.isdir(folder):
+        for filename in os.listdir(folder):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(folder, filename))
+
+def _reset_metrics_after_fork():
+    # A forked worker starts counting from zero; what the parent counted is in the parent's snapshot
+    global _metrics_lock
+    _metrics_lock = threading.Lock()
+    for values in _metrics.values():
+        values.clear()
+    _metrics_file.update(path=None, flushed_at=0.0)
+
+os.register_at_fork(after_in_child=_reset_metrics_after_fork)
+
+def _merge_metric(values, key, value):
+    if not isinstance(value, dict):
+        values[key] = values.get(key, 0) + value
+        return
+    entry = values.setdefault(key, {field: [0] * len(count) if isinstance(count, list) else 0 for field, count in value.items()})
+    for field, count in value.items():
+        entry[field] = [a + b for a, b in zip(entry[field], count)] if isinstance(count, list) else entry[field] + count
+
+def collected_metrics():
+    """
+    The counters of every worker: this process's live ones plus the other workers' snapshots.
+    """
+    snapshots = [_snapshot_metrics()]
+    folder = _metrics_folder()
+    if os.path.isdir(folder):
+        for filename in os.listdir(folder):
+            path = os.path.join(folder, filename)
+            if not filename.endswith('.json') or path == _metrics_file['path']:
+                continue
+            try:
+                with open(path) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+    merged = {metric: {} for metric in _metrics}
+    for snapshot in snapshots:
+        for metric, items in snapshot.items():
+            for key, value in items:
+                _merge_metric(merged.setdefault(metric, {}), tuple(key) if isinstance(key, list) else key, value)
+    return merged
+
+def record_cache_access(cache_name, hit):
+    key = (cache_name, 'hit' if hit else 'miss')
+    with _metrics_lock:
+        _metrics['cache'][key] = _metrics['cache'].get(key, 0) + 1
+
+def _record_function_time(name, seconds):
+    with _metrics_lock:
+        entry = _metrics['function_time'].setdefault(name, {'sum': 0.0, 'count': 0})
+        entry['sum'] += seconds
+        entry['count'] += 1
+
+@contextmanager
+def track_time(name):
+    """
+    Record the time spent inside the block under the given function/section name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_function_time(name, time.perf_counter() - start)
+
+def timed(f):
+    """
+    Decorator recording the time spent in a heavy analytics function.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        with track_time(f.__name__):
+            return f(*args, **kwargs)
+    return decorated_function
+
+def read_csv(path, **kwargs):
+    """
+    pd.read_csv that records how many times each data file is loaded and how many bytes are read.
+    """
+    if os.path.basename(os.path.dirname(os.path.abspath(path))) == os.path.basename(ANALYSIS_FOLDER):
+        label = 'ANALYSIS/*.csv'
+    else:
+        label = os.path.basename(path)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    with _metrics_lock:
+        _metrics['csv_loads'][label] = _metrics['csv_loads'].get(label, 0) + 1
+        _metrics['csv_bytes'][label] = _metrics['csv_bytes'].get(label, 0) + size
+    return pd.read_csv(path, **kwargs)
+
+# Column schemas applied by the loaders - low-cardinality text columns are stored as categoricals
+PLACEMENT_CATEGORICAL_COLUMNS = ['company_id', 'campus_type', 'placement_origin', 'status', 'pr_assigned', 'pr_name']
+STUDENT_CATEGORICAL_COLUMNS = ['Class']
+ANALYSIS_ID_COLUMNS = ['Name of the Student', 'Register Number', 'Name', 'Reg.no', 'Reg No']
+
+def _apply_categoricals(df, columns):
+    for col in columns:
+        if col in df.columns and df[col].notna().any():
+            df[col] = df[col].astype('category')
+    return df
+
+def with_object_columns(df):
+    """
+    Return a copy of df with categorical columns converted back to plain object columns,
+    for code paths that write arbitrary new values into the frame.
+    """
+    categorical = [col for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)]
+    return df.astype({col: object for col in categorical}) if categorical else df.copy()
+
+def _as_stage_flags(series):
+    """
+    Convert a 0/1 stage column to int8 flags (missing = 0).
+    Returns None when the column holds anything other than 0/1 values.
+    """
+    numeric = pd.to_numeric(series, errors='coerce')
+    if (numeric.isna() != series.isna()).any() or not numeric.dropna().isin([0, 1]).all():
+        return None
+    return numeric.fillna(0).astype('int8')
+
+def normalized_text(series, lower=False):
+    """
+    Equivalent of series.astype(str).str.strip() (and .str.lower()) that, for categorical
+    columns, normalises only the categories and returns a categorical, so equality masks
+    built on the result compare integer codes instead of strings.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        text = series.astype(str).str.strip()
+        return text.str.lower() if lower else text
+    categories = series.cat.categories.astype(str).str.strip()
+    if lower:
+        categories = categories.str.lower()
+    category_codes, uniques = pd.factorize(categories)
+    uniques = list(uniques)
+    if 'nan' not in uniques:
+        uniques.append('nan')
+    codes = series.cat.codes.to_numpy()
+    new_codes = np.where(codes >= 0, category_codes[codes], uniques.index('nan'))
+    return pd.Series(pd.Categorical.from_codes(new_codes, categories=uniques), index=series.index, name=series.name)
+
 # Load CSV files
 def load_students():
-    df = pd.read_csv(STUDENTS_CSV)
+    config = cohort_config()
+    df = read_csv(config['students_csv'])
     df.columns = df.columns.str.strip()
     df['Name'] = df['Name'].str.strip()
-    df['Class'] = df['Sl .no'].apply(get_class_from_slno)
-    return df
+    df['Class'] = df['Sl .no'].apply(get_class_from_slno, class_ranges=config['class_ranges'])
+    return _apply_categoricals(df, STUDENT_CATEGORICAL_COLUMNS)
+
+# Parsed placement file per cohort, reused until the file changes on disk; callers get a copy
+_placements_caches = {}  # cohort -> (signature, DataFrame)
 
 def load_placements():
-    df = pd.read_csv(PLACEMENT_CSV)
+    path = cohort_config()['placement_csv']
+    cohort_id = current_cohort()
+    cached = _placements_caches.get(cohort_id)
+    record_cache_access('placements', cached is not None and cached[0] == _file_signature(path))
+    if cached is None or cached[0] != _file_signature(path):
+        df = read_csv(path, dtype={'student_reg_nos': str})
+        df.columns = df.columns.str.strip()
+        
+        # Add unique record_id if it doesn't exist
+        if 'record_id' not in df.columns:
+            df.insert(0, 'record_id', range(1, len(df) + 1))
+            save_placements(df, resolve_record_ids=df['record_id'])
+        
+        df = add_normalized_columns(_apply_categoricals(df, PLACEMENT_CATEGORICAL_COLUMNS))
+        cached = _placements_caches[cohort_id] = (_file_signature(path), df)
+    return cached[1].copy()
+
+def load_company_analysis_file(filepath):
+    """
+    Read one ANALYSIS/CMPxx.csv, storing its 0/1 stage columns as int8 flags.
+    """
+    df = read_csv(filepath)
     df.columns = df.columns.str.strip()
+    for col in df.columns:
+        if col in ANALYSIS_ID_COLUMNS:
+            continue
+        flags = _as_stage_flags(df[col])
+        if flags is not None:
+            df[col] = flags
+    return df
+
+def save_placements(df, resolve_record_ids=()):
+    """
+    Write the placement file. student_reg_nos is resolved for the records in resolve_record_ids
+    (the ones added or edited); the other records keep their stored register numbers.
+    """
+    # Normalised columns are derived at load and never written back
+    df = df.drop(columns=list(PLACEMENT_NORMALIZED_COLUMNS), errors='ignore')
+    df = with_student_reg_nos(df, resolve_record_ids)
+    df.to_csv(cohort_config()['placement_csv'], index=False)
+
+# Cache for structures derived from the CSV files, rebuilt whenever a source file changes
+_derived_cache = {}           # (cohort, cache name) -> (signature, value)
+_derived_build_seconds = {}   # 'cohort/cache name' -> seconds taken by its last build
+
+def _file_signature(path):
+    """
+    Identify the current version of a file on disk by its modification time and size.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def get_cached_derived(name, sources, builder):
+    """
+    Return builder() for the given cache name, rebuilding only when one of the
+    source files has changed since the cached value was built.
+    """
+    cohort_id = current_cohort()
+    signature = tuple((path, _file_signature(path)) for path in sources)
+    entry = _derived_cache.get((cohort_id, name))
+    record_cache_access(name, entry is not None and entry[0] == signature)
+    if entry is None or entry[0] != signature:
+        start = time.perf_counter()
+        entry = (signature, builder())
+        _derived_cache[(cohort_id, name)] = entry
+        _derived_build_seconds[f'{cohort_id}/{name}'] = round(time.perf_counter() - start, 4)
+    return entry[1]
+
+def invalidate_derived_cache():
+    _derived_cache.clear()
+
+# Data generation - bumped whenever any CSV data file changes on disk (tracked per worker process)
+_data_generation = {'number': 0, 'signature': None}
+
+def _cohort_data_sources(cohort):
+    sources = [cohort['students_csv'], cohort['placement_csv'], cohort['analysis_csv'], cohort['alias_csv']]
+    if os.path.isdir(cohort['analysis_folder']):
+        sources += sorted(
+            os.path.join(cohort['analysis_folder'], filename)
+            for filename in os.listdir(cohort['analysis_folder']) if filename.endswith('.csv')
+        )
+    return sources
+
+def _data_sources():
+    sources = []
+    for cohort in get_cohorts().values():
+        sources += _cohort_data_sources(cohort)
+    return sources
+
+def get_cohort_data_version():
+    """
+    Fingerprint of the current cohort's data files. Unlike the generation number it is the
+    same in every worker, so it can key state shared on disk.
+    """
+    signature = [(os.path.basename(path), _file_signature(path)) for path in _cohort_data_sources(cohort_config())]
+    return hashlib.sha1(repr(signature).encode()).hexdigest()[:16]
+
+def get_data_generation():
+    """
+    Return the current data generation number.
+    """
+    signature = tuple((path, _file_signature(path)) for path in _data_sources())
+    if signature != _data_generation['signature']:
+        _data_generation['signature'] = signature
+        _data_generation['number'] += 1
+    return _data_generation['number']
+
+# Change log - placement record edits and ANALYSIS file changes, appended per cohort to
+# changes.csv and numbered with an increasing generation. Generations are read back from
+# the file itself, so they keep increasing across restarts and are shared by all workers.
+CHANGE_LOG_COLUMNS = ['generation', 'changed_at', 'entity', 'action', 'record_id', 'company_id', 'version']
+_change_log_lock = threading.Lock()
+
+def _read_change_log(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame({col: pd.Series(dtype=int if col == 'generation' else str) for col in CHANGE_LOG_COLUMNS})
+    df = read_csv(path, dtype=str, keep_default_na=False)
+    df['generation'] = df['generation'].astype(int)
+    return df
+
+def get_change_log():
+    """
+    The current cohort's change log, oldest change first.
+    """
+    path = cohort_config()['change_log_csv']
+    return get_cached_derived('change_log', [path], lambda: _read_change_log(path))
+
+def _append_changes(build_changes):
+    # build_changes(log) -> change dicts; runs while the log is locked against other writers
+    path = cohort_config()['change_log_csv']
+    try:
+        with _change_log_lock, open(path, 'a', newline='') as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            log = get_change_log()
+            changes = build_changes(log)
+            if not changes:
+                return
+            generation = int(log['generation'].max()) if len(log) else 0
+            changed_at = pd.Timestamp.now().isoformat(timespec='seconds')
+            rows = [
+                dict({col: '' for col in CHANGE_LOG_COLUMNS}, **change, generation=generation + position, changed_at=changed_at)
+                for position, change in enumerate(changes, start=1)
+            ]
+            pd.DataFrame(rows, columns=CHANGE_LOG_COLUMNS).to_csv(handle, header=handle.tell() == 0, index=False)
+    except Exception as e:
+        print(f"Error recording change: {e}")
+
+def record_placement_change(action, record_id, company_id):
+    """
+    Log that a placement record was 'added', 'updated' or 'deleted'.
+    """
+    _append_changes(lambda log: [{
+        'entity': 'placement', 'action': action,
+        'record_id': str(record_id), 'company_id': str(company_id).strip()
+    }])
+
+def record_analysis_changes(versions):
+    """
+    Log ANALYSIS files that were added, modified or removed since the log last saw them.
+    versions: {company_id: file version} for every file currently in the folder. Each
+    worker notices a change on its own, so a version that is already logged is skipped.
+    """
+    def build_changes(log):
+        seen = log[log['entity'] == 'analysis'].drop_duplicates('company_id', keep='last')
+        seen = {company_id: (action, version) for company_id, action, version in zip(seen['company_id'], seen['action'], seen['version'])}
+        changes = []
+        for company_id, version in versions.items():
+            action, logged_version = seen.get(company_id, ('deleted', None))
+            if action == 'deleted':
+                changes.append({'entity': 'analysis', 'action': 'added', 'company_id': company_id, 'version': version})
+            elif logged_version != version:
+                changes.append({'entity': 'analysis', 'action': 'updated', 'company_id': company_id, 'version': version})
+        for company_id, (action, _) in seen.items():
+            if action != 'deleted' and company_id not in versions:
+                changes.append({'entity': 'analysis', 'action': 'deleted', 'company_id': company_id})
+        return changes
+    _append_changes(build_changes)
+
+_analysis_versions_logged = {}  # cohort -> ANALYSIS file versions this worker last compared with the log
+
+def sync_analysis_change_log():
+    """
+    Bring the change log up to date with the ANALYSIS folder before it is read. Sheets are
+    dropped into the folder by hand, so their changes are found by comparing file versions;
+    the log is only touched when the folder changed since this worker last looked.
+    """
+    versions = {
+        os.path.basename(filepath).replace('.csv', '').strip(): _file_version(filepath)
+        for filepath in _analysis_files()
+    }
+    if _analysis_versions_logged.get(current_cohort()) != versions:
+        record_analysis_changes(versions)
+        _analysis_versions_logged[current_cohort()] = versions
+
+def get_change_generation():
+    """
+    The latest generation in the current cohort's change log (0 while it is empty) - the
+    value clients pass to /api/changes?since= to fetch what changed after a full load.
+    """
+    sync_analysis_change_log()
+    log = get_change_log()
+    return int(log['generation'].max()) if len(log) else 0
+
+# Analysis - Overall.csv - row 0 holds a "Company Name : X" banner over the first column of
+# each company, row 1 its "Number of Rounds : N", row 2 counts and row 3 the column headers.
+# The sheet is parsed once per file version into (company, stage) columns and a long table.
+OVERALL_HEADER_ROWS = 4
+
+def _overall_banner_values(row, prefix):
+    return row.astype(str).str.replace(prefix, '', regex=False).str.strip().where(row.notna(), '')
+
+def _unique_labels(labels):
+    # Same suffixes pandas gives duplicate CSV headers ("Round", "Round.1", ...)
+    seen = {}
+    unique = []
+    for label in labels:
+        count = seen.get(label, 0)
+        seen[label] = count + 1
+        unique.append(label if count == 0 else f'{label}.{count}')
+    return unique
+
+def _typed_stage_column(series):
+    flags = _as_stage_flags(series)
+    return flags if flags is not None else pd.to_numeric(series, errors='coerce')
+
+def parse_overall_analysis(path):
+    """
+    Parse the multi-header Analysis - Overall.csv.
+    Returns the companies with their column spans and stages, the sheet with its header row
+    as columns, a wide frame of typed stage values with (company, stage) MultiIndex columns,
+    and the same values in long format (student, reg_no, company, stage, value).
+    """
+    df = read_csv(path, header=None)
+    headers_row = df.iloc[3].tolist()
+    counts_row = df.iloc[2].tolist()
+    data_df = df.iloc[OVERALL_HEADER_ROWS:].reset_index(drop=True)
+    data_df.columns = headers_row
     
-    # Add unique record_id if it doesn't exist
-    if 'record_id' not in df.columns:
-        df.insert(0, 'record_id', range(1, len(df) + 1))
-        save_placements(df)
+    # Company spans run from one banner cell to the next
+    banner = df.iloc[0]
+    starts = np.flatnonzero(banner.notna() & banner.astype(str).str.contains('Company Name', regex=False))
+    ends = np.append(starts[1:], len(banner))
+    names = _overall_banner_values(banner, 'Company Name :')
+    rounds = _overall_banner_values(df.iloc[1], 'Number of Rounds :')
+    headers = [
+        str(header).strip() if pd.notna(header) else f'Unnamed: {position}'
+        for position, header in enumerate(headers_row)
+    ]
     
-    return df
+    companies = []
+    column_company = []
+    column_stage = []
+    for start, end in zip(starts, ends):
+        stages = _unique_labels(headers[start:end])
+        companies.append({
+            'name': names.iloc[start],
+            'rounds': rounds.iloc[start],
+            'start_col': int(start),
+            'end_col': int(end),
+            'stages': stages
+        })
+        column_company += [names.iloc[start]] * len(stages)
+        column_stage += stages
+    
+    # Typed stage values: 0/1 columns become int8 flags, anything else numeric
+    first_stage_col = int(starts[0]) if len(starts) else len(headers)
+    stage_block = df.iloc[OVERALL_HEADER_ROWS:, first_stage_col:].reset_index(drop=True)
+    wide = pd.DataFrame({
+        position: _typed_stage_column(stage_block[col])
+        for position, col in enumerate(stage_block.columns)
+    })
+    wide.columns = pd.MultiIndex.from_arrays([column_company, column_stage], names=['company', 'stage'])
+    
+    # Student identity columns sit before the first banner
+    id_df = pd.DataFrame(
+        df.iloc[OVERALL_HEADER_ROWS:, :first_stage_col].to_numpy(),
+        columns=_unique_labels(headers[:first_stage_col])
+    )
+    name_col, reg_no_col = _analysis_id_columns(id_df.columns)
+    students = pd.DataFrame({
+        'student': id_df[name_col].astype(str).str.strip() if name_col else pd.Series([''] * len(id_df)),
+        'reg_no': id_df[reg_no_col].astype(str).str.strip() if reg_no_col else pd.Series([''] * len(id_df))
+    })
+    
+    long = wide.stack(['company', 'stage'], future_stack=True).rename('value').reset_index(level=['company', 'stage'])
+    long = students.join(long, how='inner').reset_index(drop=True)
+    long['company'] = pd.Categorical(long['company'], categories=[company['name'] for company in companies])
+    long['stage'] = long['stage'].astype('category')
+    
+    return {
+        'companies': companies,
+        'data': data_df,
+        'headers': headers_row,
+        'counts': counts_row,
+        'students': students,
+        'wide': wide,
+        'long': long
+    }
 
-def save_placements(df):
-    df.to_csv(PLACEMENT_CSV, index=False)
+def get_overall_analysis():
+    """
+    The parsed Analysis - Overall.csv of the current cohort, cached until the file changes.
+    Returns None when the file is missing or cannot be parsed.
+    """
+    path = cohort_config()['analysis_csv']
+    
+    def build():
+        if not os.path.exists(path):
+            return None
+        try:
+            return parse_overall_analysis(path)
+        except Exception as e:
+            print(f"Error loading analysis data: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    return get_cached_derived('overall_analysis', [path], build)
+
+def get_overall_company_stats():
+    """
+    Applied / selected counts per company of the overall sheet. Applied counts the first
+    stage (or the last stage named "Applied") and selected the last stage.
+    """
+    overall = get_overall_analysis()
+    if overall is None:
+        return []
+    stats = []
+    for company in overall['companies']:
+        block = overall['wide'][company['name']]
+        stages = company['stages']
+        applied_stage = [stage for stage in stages if 'Applied' in stage][-1:] or stages[:1]
+        applied = int((block[applied_stage[0]] == 1).sum()) if applied_stage else 0
+        selected = int((block[stages[-1]] == 1).sum()) if stages else 0
+        stats.append({
+            'name': company['name'],
+            'rounds': company['rounds'],
+            'stages': stages,
+            'applied': applied,
+            'selected': selected,
+            'conversion_rate': round(selected / applied * 100, 2) if applied > 0 else 0
+        })
+    return stats
 
 # Load and parse Analysis - Overall.csv
 def load_analysis_data():
@@ -101,77 +782,56 @@ def load_analysis_data():
     Load and parse the Analysis - Overall.csv file which has a complex header structure.
     Returns a dictionary with company data and student progress information.
     """
-    try:
-        df = pd.read_csv(ANALYSIS_CSV, header=None)
-        
-        # Extract company names from row 0 (index 0)
-        company_row = df.iloc[0].tolist()
-        # Extract number of rounds from row 1 (index 1)
-        rounds_row = df.iloc[1].tolist()
-        # Extract counts from row 2 (index 2)
-        counts_row = df.iloc[2].tolist()
-        # Column headers from row 3 (index 3)
-        headers_row = df.iloc[3].tolist()
-        # Data starts from row 4 (index 4)
-        data_df = df.iloc[4:].copy()
-        
-        # Parse company information
-        companies = []
-        current_company = None
-        current_rounds = None
-        col_start = 0
-        
-        for i, cell in enumerate(company_row):
-            if pd.notna(cell) and 'Company Name' in str(cell):
-                # Extract company name
-                company_name = str(cell).replace('Company Name :', '').strip()
-                # Get number of rounds
-                rounds_str = str(rounds_row[i]) if i < len(rounds_row) and pd.notna(rounds_row[i]) else ''
-                rounds = rounds_str.replace('Number of Rounds :', '').strip() if rounds_str else ''
-                
-                if current_company:
-                    companies.append({
-                        'name': current_company,
-                        'rounds': current_rounds,
-                        'start_col': col_start,
-                        'end_col': i
-                    })
-                
-                current_company = company_name
-                current_rounds = rounds
-                col_start = i
-        
-        # Add last company
-        if current_company:
-            companies.append({
-                'name': current_company,
-                'rounds': current_rounds,
-                'start_col': col_start,
-                'end_col': len(company_row)
-            })
-        
-        # Set proper column names for data
-        data_df.columns = headers_row
-        data_df = data_df.reset_index(drop=True)
-        
-        return {
-            'companies': companies,
-            'data': data_df,
-            'headers': headers_row,
-            'counts': counts_row
-        }
-    except Exception as e:
-        print(f"Error loading analysis data: {e}")
-        import traceback
-        traceback.print_exc()
+    return get_overall_analysis()
+
+# Word index over student names - every name is tokenized once and each word maps to the
+# positions of the names containing it, so a lookup only scores names sharing a word
+def build_name_index(names):
+    """
+    Index upper-cased names (in the given order) by their words.
+    """
+    index = {'names': list(names), 'words': [], 'postings': {}}
+    for position, name in enumerate(index['names']):
+        words = set(name.split())
+        index['words'].append(words)
+        for word in words:
+            index['postings'].setdefault(word, []).append(position)
+    return index
+
+def fuzzy_match_name(index, name):
+    """
+    Find the first indexed name sharing enough words with `name` - two, or one when
+    `name` has exactly two words; both names need at least two words.
+    Returns (position, score) where score is the word-set Jaccard similarity, or None.
+    """
+    words = set(name.split())
+    if len(words) < 2:
         return None
+    required = min(2, len(words) - 1)
+    shared = {}
+    for word in words:
+        for position in index['postings'].get(word, ()):
+            shared[position] = shared.get(position, 0) + 1
+    candidates = [
+        position for position, count in shared.items()
+        if count >= required and len(index['words'][position]) >= 2
+    ]
+    if not candidates:
+        return None
+    position = min(candidates)
+    return position, round(shared[position] / len(words | index['words'][position]), 3)
 
 # Match names between Analysis - Overall.csv and FULL NAME LIST.csv
+@timed
 def match_analysis_names():
     """
     Match student names between Analysis - Overall.csv and FULL NAME LIST.csv
     Returns matching statistics and detailed comparison.
     """
+    config = cohort_config()
+    return get_cached_derived('analysis_name_matches', [config['students_csv'], config['analysis_csv']], _match_analysis_names)
+
+def _match_analysis_names():
     try:
         students_df = load_students()
         analysis_data = load_analysis_data()
@@ -181,13 +841,14 @@ def match_analysis_names():
         
         # Get student names from FULL NAME LIST.csv (normalized)
         full_list_names = {}
-        for _, row in students_df.iterrows():
-            name = str(row['Name']).strip().upper()
-            full_list_names[name] = {
-                'original': row['Name'],
-                'reg_no': row['Reg.no'],
-                'class': row['Class']
+        for name, reg_no, student_class in zip(students_df['Name'], students_df['Reg.no'], students_df['Class']):
+            full_list_names[str(name).strip().upper()] = {
+                'original': name,
+                'reg_no': reg_no,
+                'class': student_class
             }
+        name_index = build_name_index(full_list_names)
+        full_list_info = list(full_list_names.values())
         
         # Get student names from Analysis - Overall.csv
         analysis_df = analysis_data['data']
@@ -200,52 +861,42 @@ def match_analysis_names():
         matched = []
         not_matched = []
         
-        for _, row in analysis_df.iterrows():
-            analysis_name = str(row[name_col]).strip()
+        if 'Register Number' in analysis_df.columns:
+            analysis_reg_nos = [str(reg_no).strip() for reg_no in analysis_df['Register Number']]
+        else:
+            analysis_reg_nos = [''] * len(analysis_df)
+        
+        for raw_name, reg_no_analysis in zip(analysis_df[name_col], analysis_reg_nos):
+            analysis_name = str(raw_name).strip()
             analysis_name_upper = analysis_name.upper()
-            reg_no_analysis = str(row.get('Register Number', '')).strip() if 'Register Number' in row else ''
             
             # Try exact match first
             if analysis_name_upper in full_list_names:
-                matched.append({
-                    'analysis_name': analysis_name,
-                    'full_list_name': full_list_names[analysis_name_upper]['original'],
-                    'reg_no_analysis': reg_no_analysis,
-                    'reg_no_full_list': full_list_names[analysis_name_upper]['reg_no'],
-                    'class': full_list_names[analysis_name_upper]['class'],
-                    'match_type': 'exact'
-                })
-                analysis_names[analysis_name_upper] = True
+                full_info = full_list_names[analysis_name_upper]
+                match_type, score = 'exact', 1.0
             else:
-                # Try fuzzy matching
-                found = False
-                for full_name_upper, full_info in full_list_names.items():
-                    # Check if names are similar (word-based matching)
-                    analysis_words = set(analysis_name_upper.split())
-                    full_words = set(full_name_upper.split())
-                    
-                    # If most words match, consider it a match
-                    if len(analysis_words) >= 2 and len(full_words) >= 2:
-                        common_words = analysis_words.intersection(full_words)
-                        if len(common_words) >= min(2, len(analysis_words) - 1):
-                            matched.append({
-                                'analysis_name': analysis_name,
-                                'full_list_name': full_info['original'],
-                                'reg_no_analysis': reg_no_analysis,
-                                'reg_no_full_list': full_info['reg_no'],
-                                'class': full_info['class'],
-                                'match_type': 'fuzzy'
-                            })
-                            analysis_names[analysis_name_upper] = True
-                            found = True
-                            break
-                
-                if not found:
+                # Try fuzzy matching (word-based) against names sharing a word
+                fuzzy = fuzzy_match_name(name_index, analysis_name_upper)
+                if fuzzy is None:
                     not_matched.append({
                         'analysis_name': analysis_name,
                         'reg_no_analysis': reg_no_analysis
                     })
                     analysis_names[analysis_name_upper] = False
+                    continue
+                full_info = full_list_info[fuzzy[0]]
+                match_type, score = 'fuzzy', fuzzy[1]
+            
+            matched.append({
+                'analysis_name': analysis_name,
+                'full_list_name': full_info['original'],
+                'reg_no_analysis': reg_no_analysis,
+                'reg_no_full_list': full_info['reg_no'],
+                'class': full_info['class'],
+                'match_type': match_type,
+                'score': score
+            })
+            analysis_names[analysis_name_upper] = True
         
         # Find names in FULL NAME LIST that are not in Analysis
         only_in_full_list = []
@@ -277,84 +928,103 @@ def match_analysis_names():
         traceback.print_exc()
         return None
 
-# Cache for student lookups to improve performance
-_student_cache = {}
-_student_df_cache = None
+# Cache for student lookups to improve performance (one per cohort)
+_student_caches = {}
+_student_df_caches = {}  # cohort -> (roster file signature, DataFrame)
+
+def _student_lookup_cache():
+    return _student_caches.setdefault(current_cohort(), {})
 
 def _load_students_cached():
-    global _student_df_cache
-    if _student_df_cache is None:
-        _student_df_cache = load_students()
-    return _student_df_cache
+    cohort_id = current_cohort()
+    signature = _file_signature(cohort_config()['students_csv'])
+    cached = _student_df_caches.get(cohort_id)
+    record_cache_access('student_df', cached is not None and cached[0] == signature)
+    if cached is None or cached[0] != signature:
+        # Lookups resolved against the old roster are stale too
+        _student_caches.pop(cohort_id, None)
+        cached = _student_df_caches[cohort_id] = (signature, load_students())
+    return cached[1]
+
+def _prime_student_lookups(students_df):
+    # Same result the exact-name path of get_student_details would cache, first row wins
+    student_cache = _student_lookup_cache()
+    for row in students_df[['Name', 'Reg.no', 'Class']].to_dict('records'):
+        search_key = str(row['Name']).strip().upper()
+        if search_key != ' '.join(search_key.split()) or search_key in student_cache:
+            continue
+        student_cache[search_key] = {'name': row['Name'], 'reg_no': row['Reg.no'], 'class': row['Class']}
+
+def _roster_lookup(students_df):
+    by_name = {}
+    by_reg_no = {}
+    students = []
+    for row in students_df[['Name', 'Reg.no', 'Class']].to_dict('records'):
+        student = {'name': row['Name'], 'reg_no': row['Reg.no'], 'class': row['Class']}
+        students.append(student)
+        by_name.setdefault(normalize_name(row['Name']), student)
+        by_reg_no.setdefault(normalize_reg_no(row['Reg.no']), student)
+    return {
+        'by_name': by_name,
+        'by_reg_no': by_reg_no,
+        'students': students,
+        'name_index': build_name_index(normalize_name(student['name']) for student in students),
+        'reg_nos': [normalize_reg_no(student['reg_no']) for student in students]
+    }
 
-# Get student details by name or register number (improved function with fuzzy matching and caching)
+def get_roster_lookup():
+    """
+    Roster students keyed by normalized name and by register number (first row wins),
+    plus the students in roster order with a word index of their names.
+    """
+    return get_cached_derived(
+        'roster_lookup',
+        [cohort_config()['students_csv']],
+        lambda: _roster_lookup(_load_students_cached())
+    )
+
+def resolve_students(queries, source='lookup'):
+    """
+    Resolve a list of names or register numbers to roster students in one pass: exact name,
+    exact register number, then the alias table. Names the alias table has not seen are
+    batch-matched into it (recorded with the given source) before they are looked up.
+    Returns one student dict (or None) per query, in order.
+    """
+    roster = get_roster_lookup()
+    resolved = {}
+    unresolved = []
+    for query in queries:
+        key = str(query).strip()
+        if key not in resolved:
+            normalized = normalize_name(key)
+            resolved[key] = (roster['by_name'].get(normalized)
+                             or roster['by_reg_no'].get(normalized)
+                             or roster['by_reg_no'].get(normalize_reg_no(key)))
+            if resolved[key] is None and normalized:
+                unresolved.append(key)
+    if unresolved:
+        aliases = add_aliases(unresolved, source)
+        for key in unresolved:
+            reg_no = aliases.get(normalize_name(key))
+            resolved[key] = roster['by_reg_no'].get(reg_no) if reg_no else None
+    return [resolved[str(query).strip()] for query in queries]
+
+# Get student details by name or register number (exact name, exact register number, then the
+# alias table; spellings the table has not seen are batch-matched into it first)
 def get_student_details(name_or_reg_no):
     # Check cache first
     search_key = name_or_reg_no.strip().upper()
-    if search_key in _student_cache:
-        return _student_cache[search_key]
-    
-    students = _load_students_cached()
-    # Normalize the search term
-    normalized_search = ' '.join(name_or_reg_no.strip().upper().split())
-    
-    # Try exact match by name first
-    match = students[students['Name'].str.strip().str.upper() == normalized_search]
-    if not match.empty:
-        result = {
-            'name': match.iloc[0]['Name'],
-            'reg_no': match.iloc[0]['Reg.no'],
-            'class': match.iloc[0]['Class']
-        }
-        _student_cache[search_key] = result
-        return result
-    
-    # Try exact match by Register Number
-    match = students[students['Reg.no'].astype(str).str.strip().str.upper() == normalized_search]
-    if not match.empty:
-        result = {
-            'name': match.iloc[0]['Name'],
-            'reg_no': match.iloc[0]['Reg.no'],
-            'class': match.iloc[0]['Class']
-        }
-        _student_cache[search_key] = result
-        return result
-    
-    # Try fuzzy matching by name - split names into words and match
-    name_words = set(normalized_search.split())
-    for idx, row in students.iterrows():
-        db_name = ' '.join(str(row['Name']).strip().upper().split())
-        db_words = set(db_name.split())
-        
-        # Check if all words from search name are in database name
-        # This handles cases like "SOUJANYA BHAT" matching "SOUJANYA M BHAT"
-        if name_words.issubset(db_words) or db_words.issubset(name_words):
-            # Calculate similarity - more matching words = better match
-            matching_words = name_words.intersection(db_words)
-            if len(matching_words) >= 2 or (len(name_words) == 1 and len(matching_words) == 1):
-                result = {
-                    'name': row['Name'],
-                    'reg_no': row['Reg.no'],
-                    'class': row['Class']
-                }
-                _student_cache[search_key] = result
-                return result
-    
-    # Try partial match by Register Number
-    for idx, row in students.iterrows():
-        reg_no = str(row['Reg.no']).strip().upper()
-        if normalized_search in reg_no or reg_no in normalized_search:
-            result = {
-                'name': row['Name'],
-                'reg_no': row['Reg.no'],
-                'class': row['Class']
-            }
-            _student_cache[search_key] = result
-            return result
+    student_cache = _student_lookup_cache()
+    record_cache_access('student_lookup', search_key in student_cache)
+    if search_key in student_cache:
+        return student_cache[search_key]
+    
+    student = resolve_students([name_or_reg_no])[0]
     
     # Cache negative results too
-    _student_cache[search_key] = None
-    return None
+    result = dict(student) if student else None
+    student_cache[search_key] = result
+    return result
 
 # Get student class by name
 def get_student_class(name):
@@ -362,131 +1032,706 @@ def get_student_class(name):
     student_info = get_student_details(name)
     return student_info['class'] if student_info else None
 
-def _first_non_empty(series):
+def student_class_distribution(student_names):
     """
-    Return the first non-empty string value from a pandas Series-like iterable.
+    Comma separated classes of the students named in a placement record's student_names.
+    The typed names are added to the alias table first, so the classes agree with the
+    register numbers save_placements() will store for the same names.
     """
-    for value in series:
-        if pd.isna(value):
-            continue
-        value_str = str(value).strip()
-        if value_str:
-            return value_str
-    return ''
+    if not student_names:
+        return ''
+    add_aliases(student_names.split(','), 'placements')
+    classes = [get_student_class(name.strip()) for name in student_names.split(',')]
+    return ', '.join([c for c in classes if c])
 
-def _combine_unique(series, separator=', '):
+# Placement records store the register numbers of their students in student_reg_nos - one
+# entry per name in student_names, blank when the name matches no student - resolved when a
+# record is added or edited (backfill_student_reg_nos re-resolves every record), so read paths
+# join on reg_no instead of matching names
+def _split_student_names(names):
+    return [name.strip() for name in str(names).split(',') if name.strip()] if pd.notna(names) else []
+
+def resolve_student_reg_nos(names):
     """
-    Combine unique, non-empty string values from a Series into a single string.
+    Comma separated register numbers for a student_names cell (NaN when it has no names).
     """
-    seen = []
-    for value in series:
-        if pd.isna(value):
-            continue
-        value_str = str(value).strip()
-        if value_str and value_str not in seen:
-            seen.append(value_str)
-    return separator.join(seen)
+    names = _split_student_names(names)
+    if not names:
+        return np.nan
+    students = resolve_students(names, 'placements')
+    return ', '.join(normalize_reg_no(student['reg_no']) if student else '' for student in students)
 
-def _combine_student_names(series, separator=', '):
+def with_student_reg_nos(placements, record_ids):
     """
-    Combine unique student names across multiple rows, ignoring case and duplicates.
+    Copy of placements with student_reg_nos filled in from student_names for the given records.
     """
-    seen = []
-    seen_keys = set()
-    for value in series:
-        if pd.isna(value):
-            continue
-        for name in str(value).split(','):
-            name_clean = name.strip()
-            if not name_clean:
-                continue
-            key = name_clean.upper()
-            if key not in seen_keys:
-                seen.append(name_clean)
-                seen_keys.add(key)
-    return separator.join(seen)
+    placements = placements.copy()
+    if 'student_reg_nos' not in placements.columns:
+        placements['student_reg_nos'] = pd.Series(np.nan, index=placements.index, dtype=object)
+    rows = placements['record_id'].isin(list(record_ids))
+    if rows.any():
+        names = placements.loc[rows, 'student_names'] if 'student_names' in placements.columns else pd.Series(np.nan, index=placements.index[rows])
+        placements.loc[rows, 'student_reg_nos'] = [resolve_student_reg_nos(cell) for cell in names]
+    return placements
 
-def _normalize_status(status):
-    if not status:
-        return ''
-    status_map = {
-        'completed': 'Completed',
-        'complete': 'Completed',
-        'on-going': 'On-going',
-        'ongoing': 'On-going',
-        'on going': 'On-going',
-        'cancelled': 'Cancelled',
-        'canceled': 'Cancelled',
-        'on-hold': 'On-Hold',
-        'on hold': 'On-Hold'
-    }
-    normalized = status.strip().lower()
-    return status_map.get(normalized, status.strip().title())
+def placement_students(names, reg_nos):
+    """
+    (name, student) for each name in a student_names cell, student being the roster entry of
+    the stored register number (None when the name matched no student). Records saved
+    before student_reg_nos existed are resolved by name.
+    """
+    names = _split_student_names(names)
+    stored = [reg_no.strip() for reg_no in str(reg_nos).split(',')] if pd.notna(reg_nos) else []
+    if len(stored) != len(names):
+        return [(name, get_student_details(name)) for name in names]
+    roster = get_roster_lookup()['by_reg_no']
+    return [(name, roster.get(reg_no) if reg_no else None) for name, reg_no in zip(names, stored)]
 
-def get_unique_company_records(placements_df):
+def backfill_student_reg_nos():
     """
-    Collapse placement rows into unique company-level records based on company_id.
+    Resolve student_reg_nos for every record of the current cohort's placement file.
+    Returns (records, names, unresolved names).
     """
-    if placements_df.empty or 'company_id' not in placements_df.columns:
-        return pd.DataFrame(columns=[
-            'company_id', 'company_name', 'status', 'campus_type',
-            'placement_origin', 'pr_assigned', 'pr_name',
-            'role', 'package', 'student_names'
-        ])
-    
-    normalized = placements_df.copy()
-    normalized['company_id'] = normalized['company_id'].astype(str).str.strip()
+    placements = load_placements()
+    save_placements(placements, resolve_record_ids=placements['record_id'])
+    placements = load_placements()
+    pairs = [
+        pair
+        for names, reg_nos in zip(placements['student_names'], placements['student_reg_nos'])
+        for pair in placement_students(names, reg_nos)
+    ]
+    return len(placements), len(pairs), sum(1 for _, student in pairs if student is None)
+
+# Name aliases - every spelling of a student name seen in the roster, placement records and
+# ANALYSIS sheets, resolved to a register number by a batch matcher and saved per cohort in
+# name_aliases.csv. Admins review ambiguous matches at /admin/aliases; manual rows survive rebuilds.
+ALIAS_COLUMNS = ['alias', 'reg_no', 'match_type', 'candidates', 'sources']
+ALIAS_REVIEW_TYPES = ('ambiguous', 'unmatched')
+
+def normalize_name(name):
+    return ' '.join(str(name).strip().upper().split())
+
+def normalize_reg_no(reg_no):
+    return str(reg_no).strip().upper()
+
+def _collect_aliases(placements=None):
+    aliases = {}
+    
+    def add(name, source):
+        if pd.isna(name):
+            return
+        alias = normalize_name(name)
+        if alias:
+            aliases.setdefault(alias, set()).add(source)
+    
+    for name in _load_students_cached()['Name']:
+        add(name, 'roster')
+    if placements is None:
+        placements = load_placements()
+    if 'student_names' in placements.columns:
+        for names in placements['student_names'].dropna():
+            for name in str(names).split(','):
+                add(name, 'placements')
+    store = get_stage_store()
+    for company in store['companies'].values():
+        for col in company['id_columns']:
+            if 'name' in col.lower() and 'student' in col.lower():
+                for name in _store_column_values(store, company, col):
+                    add(name, 'analysis')
+    return aliases
+
+def word_subset_matches(index, name):
+    """
+    Positions (in index order) of indexed names whose words contain the words of `name` or
+    are contained in them, sharing at least two words (one when `name` is a single word).
+    """
+    words = set(name.split())
+    shared = {}
+    for word in words:
+        for position in index['postings'].get(word, ()):
+            shared[position] = shared.get(position, 0) + 1
+    return sorted(
+        position for position, count in shared.items()
+        if (count == len(words) or count == len(index['words'][position]))
+        and (count >= 2 or (len(words) == 1 and count == 1))
+    )
+
+def match_alias(alias, roster_index, roster_reg_nos):
+    """
+    Match one alias against the roster with the rules the request-time matchers used:
+    exact name, then word subset (e.g. "SOUJANYA BHAT" -> "SOUJANYA M BHAT"), then a substring
+    of a name, then a substring of a register number.
+    Returns (match_type, candidate register numbers in roster order).
+    """
+    names = roster_index['names']
+    exact = [position for position in roster_index['postings'].get(alias.split()[0], ()) if names[position] == alias]
+    if exact:
+        return 'exact', [roster_reg_nos[exact[0]]]
+    
+    positions = word_subset_matches(roster_index, alias)
+    match_type = 'fuzzy'
+    if not positions:
+        positions = [position for position, name in enumerate(names) if name and (alias in name or name in alias)]
+        match_type = 'partial'
+    if not positions:
+        # Partial register numbers typed into a search
+        positions = [position for position, reg_no in enumerate(roster_reg_nos) if reg_no and (alias in reg_no or reg_no in alias)]
+    
+    candidates = list(dict.fromkeys(roster_reg_nos[position] for position in positions))
+    if not candidates:
+        return 'unmatched', []
+    return (match_type if len(candidates) == 1 else 'ambiguous'), candidates
+
+def _read_alias_rows(path):
+    if not os.path.exists(path):
+        return {}
+    df = read_csv(path, dtype=str, keep_default_na=False)
+    return {row['alias']: row for row in df.reindex(columns=ALIAS_COLUMNS, fill_value='').to_dict('records')}
+
+def _write_alias_rows(path, rows):
+    # Written to a temporary file and swapped in, so other workers never read a partial table
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'w', newline='') as handle:
+            pd.DataFrame(list(rows.values()), columns=ALIAS_COLUMNS).to_csv(handle, index=False)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    # Cached lookups may have resolved through the old table
+    _student_caches.pop(current_cohort(), None)
+
+_alias_table_lock = threading.Lock()
+
+def _update_alias_rows(update):
+    # update(rows) -> new rows; runs while the table is locked against other writers
+    path = cohort_config()['alias_csv']
+    with _alias_table_lock, open(path + '.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        existing = _read_alias_rows(path)
+        rows = update(dict(existing))
+        if rows != existing or not os.path.exists(path):
+            _write_alias_rows(path, rows)
+
+@timed
+def refresh_alias_table(full=False, placements=None):
+    """
+    Batch-match every alias missing from the current cohort's table (every non-manual
+    alias when full=True) and save the table if anything changed. placements defaults to
+    the placement file on disk.
+    """
+    def update(existing):
+        aliases = _collect_aliases(placements)
+        students = _load_students_cached()
+        roster_names = [normalize_name(name) for name in students['Name']]
+        roster_reg_nos = [normalize_reg_no(reg_no) for reg_no in students['Reg.no']]
+        roster_index = build_name_index(roster_names)
+        
+        rows = {}
+        for alias, sources in aliases.items():
+            row = existing.get(alias)
+            if row is None or (full and row['match_type'] != 'manual'):
+                match_type, candidates = match_alias(alias, roster_index, roster_reg_nos)
+                row = {
+                    'alias': alias,
+                    'reg_no': candidates[0] if candidates else '',
+                    'match_type': match_type,
+                    'candidates': ';'.join(candidates)
+                }
+            rows[alias] = dict(row, sources=';'.join(sorted(sources)))
+        # Manual decisions are kept even when the name no longer appears in the data
+        for alias, row in existing.items():
+            if alias not in rows and (row['match_type'] == 'manual' or not full):
+                rows[alias] = row
+        return rows
+    
+    try:
+        _update_alias_rows(update)
+    except Exception as e:
+        print(f"Error refreshing alias table: {e}")
+
+def add_aliases(names, source):
+    """
+    Batch-match the given names that the current cohort's alias table has not seen yet and
+    add them to it, so request-time lookups stay dictionary lookups. Returns the alias table.
+    """
+    table = get_alias_table()
+    new_aliases = [alias for alias in dict.fromkeys(normalize_name(name) for name in names if pd.notna(name)) if alias and alias not in table]
+    if not new_aliases:
+        return table
+    
+    def update(rows):
+        roster = get_roster_lookup()
+        for alias in new_aliases:
+            if alias in rows:
+                continue
+            match_type, candidates = match_alias(alias, roster['name_index'], roster['reg_nos'])
+            rows[alias] = {
+                'alias': alias,
+                'reg_no': candidates[0] if candidates else '',
+                'match_type': match_type,
+                'candidates': ';'.join(candidates),
+                'sources': source
+            }
+        return rows
+    
+    try:
+        _update_alias_rows(update)
+    except Exception as e:
+        print(f"Error adding aliases: {e}")
+    return get_alias_table()
+
+def set_alias_override(alias, reg_no):
+    """
+    Record an admin decision for an alias. An empty reg_no marks the name as not a roster student.
+    """
+    alias = normalize_name(alias)
+    
+    def update(rows):
+        row = rows.get(alias, {'alias': alias, 'candidates': '', 'sources': ''})
+        rows[alias] = dict(row, reg_no=normalize_reg_no(reg_no) if reg_no else '', match_type='manual')
+        return rows
+    _update_alias_rows(update)
+
+def get_alias_table():
+    """
+    alias -> register number for the current cohort ('' when the alias is not a roster student).
+    The table is built by the batch matcher on first use.
+    """
+    path = cohort_config()['alias_csv']
+    if not os.path.exists(path):
+        refresh_alias_table()
+    return get_cached_derived(
+        'alias_table',
+        [path],
+        lambda: {alias: row['reg_no'] for alias, row in _read_alias_rows(path).items()}
+    )
+
+def resolve_analysis_rows(names, reg_nos=None):
+    """
+    Register number of each ANALYSIS row: the row's own register number when it is on the
+    roster, otherwise the alias-table entry for its name ('' when unresolved).
+    """
+    alias_table = get_alias_table()
+    roster_reg_nos = get_roster_lookup()['by_reg_no']
+    if reg_nos is None:
+        reg_nos = [None] * len(names)
+    resolved = []
+    for name, reg_no in zip(names, reg_nos):
+        if reg_no is not None and pd.notna(reg_no) and normalize_reg_no(reg_no) in roster_reg_nos:
+            resolved.append(normalize_reg_no(reg_no))
+        elif pd.isna(name):
+            resolved.append('')
+        else:
+            resolved.append(alias_table.get(normalize_name(name), ''))
+    return resolved
+
+def _first_non_empty(series):
+    """
+    Return the first non-empty string value from a pandas Series-like iterable.
+    """
+    for value in series:
+        if pd.isna(value):
+            continue
+        value_str = str(value).strip()
+        if value_str:
+            return value_str
+    return ''
+
+def _combine_unique(series, separator=', '):
+    """
+    Combine unique, non-empty string values from a Series into a single string.
+    """
+    seen = []
+    for value in series:
+        if pd.isna(value):
+            continue
+        value_str = str(value).strip()
+        if value_str and value_str not in seen:
+            seen.append(value_str)
+    return separator.join(seen)
+
+def _combine_student_names(series, separator=', '):
+    """
+    Combine unique student names across multiple rows, ignoring case and duplicates.
+    """
+    seen = []
+    seen_keys = set()
+    for value in series:
+        if pd.isna(value):
+            continue
+        for name in str(value).split(','):
+            name_clean = name.strip()
+            if not name_clean:
+                continue
+            key = name_clean.upper()
+            if key not in seen_keys:
+                seen.append(name_clean)
+                seen_keys.add(key)
+    return separator.join(seen)
+
+def _normalize_status(status):
+    if not status:
+        return ''
+    status_map = {
+        'completed': 'Completed',
+        'complete': 'Completed',
+        'on-going': 'On-going',
+        'ongoing': 'On-going',
+        'on going': 'On-going',
+        'cancelled': 'Cancelled',
+        'canceled': 'Cancelled',
+        'on-hold': 'On-Hold',
+        'on hold': 'On-Hold'
+    }
+    normalized = status.strip().lower()
+    return status_map.get(normalized, status.strip().title())
+
+def _normalize_campus_type(campus_type):
+    # "on campus" in any case is On Campus, anything mentioning "off" and "campus" is Off Campus
+    campus_type = campus_type.strip()
+    campus_type_lower = campus_type.lower()
+    if campus_type_lower == 'on campus':
+        return 'On Campus'
+    if 'off' in campus_type_lower and 'campus' in campus_type_lower:
+        return 'Off Campus'
+    return campus_type
+
+PLACEMENT_ORIGINS = ['CPCG', 'Department', 'Off Campus']
+
+def _normalize_origin(origin):
+    origin = origin.strip()
+    return next((label for label in PLACEMENT_ORIGINS if label.lower() == origin.lower()), origin)
+
+# Canonical status / campus type / origin of every placement row, computed once when the
+# placement file is loaded. Blank and missing cells normalise to ''.
+PLACEMENT_NORMALIZED_COLUMNS = {
+    'status_norm': ('status', _normalize_status),
+    'campus_norm': ('campus_type', _normalize_campus_type),
+    'origin_norm': ('placement_origin', _normalize_origin)
+}
+
+def add_normalized_columns(placements):
+    """
+    Add status_norm, campus_norm and origin_norm to a placements frame. Each distinct
+    raw value is normalised once; the results are categorical.
+    """
+    for column, (source, normalize) in PLACEMENT_NORMALIZED_COLUMNS.items():
+        if source not in placements.columns:
+            placements[column] = pd.Categorical([''] * len(placements))
+            continue
+        values = placements[source]
+        mapping = {value: normalize(str(value)) for value in values.dropna().unique()}
+        placements[column] = values.astype(object).map(mapping).fillna('').astype('category')
+    return placements
+
+def _build_company_record(company_id, group):
+    """
+    Build one company-level record from all placement rows of a single company.
+    Rows are expected in record_id order.
+    """
+    # Determine company status: if ANY record is "Completed", company is "Completed"
+    # Priority: Completed > On-going > On-Hold > Cancelled
+    statuses = set(group['status_norm'])
+    company_status = next(
+        (status for status in ('Completed', 'On-going', 'On-Hold', 'Cancelled') if status in statuses),
+        # Fallback to first non-empty status
+        _first_non_empty(group['status_norm'])
+    )
+    
+    pr_code = _first_non_empty(group.get('pr_assigned', []))
+    pr_name = _first_non_empty(group.get('pr_name', []))
+    if (not pr_name) and pr_code:
+        pr_name = PR_MAPPING.get(pr_code.strip(), '')
+    # Get campus_type - should be consistent within a group, but take the first non-empty
+    campus_type = _first_non_empty(group['campus_norm'])
+    
+    return {
+        'company_id': company_id,
+        'company_name': _first_non_empty(group.get('company_name', [])),
+        'status': company_status if company_status else '',
+        'campus_type': campus_type,
+        'placement_origin': _first_non_empty(group.get('placement_origin', [])),
+        'pr_assigned': pr_code,
+        'pr_name': pr_name,
+        'role': _combine_unique(group.get('role', [])),
+        'package': _combine_unique(group.get('package', [])),
+        'student_names': _combine_student_names(group.get('student_names', []))
+    }
+
+def _value_counts_dict(series):
+    """
+    Count labels in order of first appearance, treating blank labels as 'Unknown'.
+    """
+    labels = series.astype(str).str.strip().replace('', 'Unknown')
+    return {label: int(count) for label, count in labels.value_counts(sort=False).items()}
+
+def _nested_counts_dict(outer, inner):
+    """
+    Count (outer, inner) label pairs into {outer: {inner: count}}, keeping first-appearance order.
+    """
+    pairs = pd.DataFrame({
+        'outer': outer.astype(str).str.strip().replace('', 'Unknown'),
+        'inner': inner.astype(str).str.strip().replace('', 'Unknown')
+    })
+    nested = {}
+    for (outer_label, inner_label), count in pairs.groupby(['outer', 'inner'], sort=False).size().items():
+        nested.setdefault(outer_label, {})[inner_label] = int(count)
+    return nested
+
+@timed
+def build_company_views(placements_df):
+    """
+    Build every company-level view used by the companies page in a single groupby pass.
+    
+    Returns the unique company records for all, on-campus and off-campus rows,
+    the per-company record listing and the per-company unique student counts.
+    """
+    views = {
+        'company_overview': [],
+        'company_wise_records': [],
+        'on_campus_companies': [],
+        'off_campus_companies': []
+    }
+    if placements_df.empty or 'company_id' not in placements_df.columns:
+        return views
+    
+    normalized = placements_df.copy()
+    normalized['company_id'] = normalized['company_id'].astype(str).str.strip()
+    # On-campus: must be exactly "on campus" (handles "On Campus", "ON CAMPUS", "on campus", etc.)
+    # Off-campus: everything else that is not blank (includes "Off Campus", "Offcampus", etc.)
+    normalized['_on_campus'] = normalized['campus_norm'] == 'On Campus'
+    normalized['_off_campus'] = ~normalized['_on_campus'] & (normalized['campus_norm'] != '')
     normalized = normalized[normalized['company_id'] != '']
-    normalized = normalized.sort_values('record_id')
     
-    records = []
     for company_id, group in normalized.groupby('company_id'):
-        # Determine company status: if ANY record is "Completed", company is "Completed"
-        # Priority: Completed > On-going > On-Hold > Cancelled
-        statuses = group['status'].astype(str).str.strip().str.lower()
-        company_status = ''
-        
-        if (statuses == 'completed').any():
-            company_status = 'Completed'
-        elif (statuses.isin(['on-going', 'ongoing', 'on going'])).any():
-            company_status = 'On-going'
-        elif (statuses == 'on-hold').any() or (statuses == 'on hold').any():
-            company_status = 'On-Hold'
-        elif (statuses == 'cancelled').any():
-            company_status = 'Cancelled'
-        else:
-            # Fallback to first non-empty status
-            company_status = _normalize_status(_first_non_empty(group.get('status', [])))
-        
-        pr_code = _first_non_empty(group.get('pr_assigned', []))
-        pr_name = _first_non_empty(group.get('pr_name', []))
-        if (not pr_name) and pr_code:
-            pr_name = PR_MAPPING.get(pr_code.strip(), '')
-        # Get campus_type - should be consistent within a group, but take the first non-empty
-        campus_type = _first_non_empty(group.get('campus_type', []))
-        # Normalize campus_type to ensure consistency
-        if campus_type:
-            campus_type_lower = str(campus_type).strip().lower()
-            if campus_type_lower == 'on campus':
-                campus_type = 'On Campus'
-            elif 'off' in campus_type_lower and 'campus' in campus_type_lower:
-                campus_type = 'Off Campus'
-            else:
-                campus_type = str(campus_type).strip()
+        # Company-level records are built in record_id order, the record listing in file order
+        ordered = group if group['record_id'].is_monotonic_increasing else group.sort_values('record_id', kind='stable')
         
-        records.append({
+        unique_students = set()
+        for names in group['student_names'].dropna():
+            unique_students.update(n.strip().upper() for n in str(names).split(',') if n.strip())
+        
+        overview = _build_company_record(company_id, ordered)
+        overview['total_students_placed'] = len(unique_students)
+        views['company_overview'].append(overview)
+        
+        on_rows = ordered[ordered['_on_campus']]
+        if not on_rows.empty:
+            views['on_campus_companies'].append(_build_company_record(company_id, on_rows))
+        off_rows = ordered[ordered['_off_campus']]
+        if not off_rows.empty:
+            views['off_campus_companies'].append(_build_company_record(company_id, off_rows))
+        
+        first_row = group.iloc[0]
+        records = []
+        for _, row in group.iterrows():
+            record_id = row.get('record_id')
+            if pd.notna(record_id):
+                try:
+                    record_id = int(float(record_id))
+                except (ValueError, TypeError):
+                    record_id = None
+            records.append({
+                'record_id': record_id,
+                'status': str(row.get('status', '')).strip(),
+                'role': str(row.get('role', '')).strip(),
+                'package': str(row.get('package', '')).strip(),
+                'student_names': str(row.get('student_names', '')).strip(),
+                'noof_students_placed': str(row.get('noof_students_placed', '')).strip(),
+                'class_distribution': str(row.get('class_distribution', '')).strip()
+            })
+        views['company_wise_records'].append({
             'company_id': company_id,
-            'company_name': _first_non_empty(group.get('company_name', [])),
-            'status': company_status if company_status else '',
-            'campus_type': campus_type,
-            'placement_origin': _first_non_empty(group.get('placement_origin', [])),
-            'pr_assigned': pr_code,
-            'pr_name': pr_name,
-            'role': _combine_unique(group.get('role', [])),
-            'package': _combine_unique(group.get('package', [])),
-            'student_names': _combine_student_names(group.get('student_names', []))
+            'company_name': str(first_row.get('company_name', '')).strip(),
+            'campus_type': str(first_row.get('campus_type', '')).strip(),
+            'pr_assigned': str(first_row.get('pr_assigned', '')).strip(),
+            'pr_name': str(first_row.get('pr_name', '')).strip(),
+            'placement_origin': str(first_row.get('placement_origin', '')).strip(),
+            'records': records,
+            'total_students_placed': len(unique_students)
+        })
+    
+    return views
+
+@timed
+def build_pr_details(placements_df):
+    """
+    Summarise drives, companies, students, average package and company statuses
+    for every PR in one grouped pass over pr_assigned.
+    PR codes found in the data but missing from PR_MAPPING are listed after the mapped ones.
+    """
+    pr_codes = normalized_text(placements_df['pr_assigned']).astype(str)
+    pr_rows = placements_df.assign(_pr=pr_codes)
+    pr_rows = pr_rows[placements_df['pr_assigned'].notna() & (pr_rows['_pr'] != '')]
+    
+    drives = pr_rows.groupby('_pr').size()
+    
+    # Count students - count all students from student_names regardless of status
+    names = pr_rows['student_names'].dropna().astype(str).str.split(',').explode().str.strip()
+    names = names[names != '']
+    students = names.groupby(pr_rows.loc[names.index, '_pr']).nunique()
+    
+    # Calculate avg package - only from completed records
+    completed_rows = pr_rows[pr_rows['status_norm'] == 'Completed']
+    packages = completed_rows['package'].dropna().astype(str).str.strip()
+    packages = pd.to_numeric(
+        packages[packages.str.contains('LPA', regex=False)].str.split().str[0], errors='coerce'
+    ).dropna()
+    package_groups = packages.groupby(completed_rows.loc[packages.index, '_pr'])
+    avg_packages = (package_groups.sum() / package_groups.count()).round(2)
+    
+    # Unique company records per PR, one per company_id in record_id order
+    company_rows = pr_rows.copy()
+    company_rows['company_id'] = company_rows['company_id'].astype(str).str.strip()
+    company_rows = company_rows[company_rows['company_id'] != ''].sort_values('record_id', kind='stable')
+    pr_companies = {}
+    for (pr_code, company_id), group in company_rows.groupby(['_pr', 'company_id']):
+        record = _build_company_record(company_id, group)
+        pr_companies.setdefault(pr_code, []).append({
+            'company_id': record['company_id'],
+            'name': record['company_name'],
+            'status': record['status']
         })
-    return pd.DataFrame(records)
+    
+    pr_names = dict(PR_MAPPING)
+    for pr_code in sorted(set(drives.index) - set(PR_MAPPING)):
+        pr_name = _first_non_empty(pr_rows.loc[pr_rows['_pr'] == pr_code, 'pr_name'])
+        pr_names[pr_code] = pr_name if pr_name and pr_name not in pr_names.values() else pr_code
+    
+    pr_details = {}
+    for pr_code, pr_name in pr_names.items():
+        companies_list = pr_companies.get(pr_code, [])
+        status_counts = {}
+        for company in companies_list:
+            status_str = str(company['status']).strip() or 'Unknown'
+            status_counts[status_str] = status_counts.get(status_str, 0) + 1
+        
+        pr_details[pr_name] = {
+            'code': pr_code,
+            'drives': int(drives.get(pr_code, 0)),
+            'companies_count': len(companies_list),
+            'students': int(students.get(pr_code, 0)),
+            'avg_package': float(avg_packages[pr_code]) if pr_code in avg_packages.index else 0,
+            'companies': companies_list,
+            'status_counts': status_counts
+        }
+    return pr_details
+
+def _display_value(value):
+    """
+    Convert a raw cell value to display text, mapping NaN to an empty string.
+    """
+    if pd.isna(value):
+        return ''
+    return str(value)
+
+def _record_id_value(value):
+    if pd.isna(value):
+        return None
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return None
+
+@timed
+def build_company_status_index(placements_df):
+    """
+    Index placement records by company_id in a single scan.
+    
+    Each company maps to its set of (lower-case) statuses, completed/ongoing flags,
+    the ids of its Completed and On-going records, the On-going record details and
+    the company fields of its first On-going record. A company is "ongoing" when it
+    has an On-going record and no Completed record. company_names holds the latest
+    name recorded for each company.
+    """
+    index = {
+        'companies': {},
+        'ongoing_company_ids': [],
+        'company_names': {},
+        'name_to_company_id': {},
+        'max_company_number': 0
+    }
+    if placements_df.empty or 'company_id' not in placements_df.columns:
+        return index
+    
+    companies = index['companies']
+    for row in placements_df.to_dict('records'):
+        raw_company_id = row.get('company_id')
+        
+        company_name = row.get('company_name')
+        if pd.notna(company_name):
+            index['name_to_company_id'].setdefault(str(company_name).strip().upper(), raw_company_id)
+        if isinstance(raw_company_id, str) and raw_company_id.startswith('CMP'):
+            try:
+                index['max_company_number'] = max(index['max_company_number'], int(raw_company_id[3:]))
+            except ValueError:
+                pass
+        
+        if pd.isna(raw_company_id):
+            continue
+        company_id = str(raw_company_id).strip()
+        if not company_id:
+            continue
+        if str(company_name).strip():
+            # Latest name wins, matching the row-by-row mapping the analysis views used
+            index['company_names'][company_id] = str(company_name).strip()
+        
+        entry = companies.get(company_id)
+        if entry is None:
+            entry = companies[company_id] = {
+                'statuses': set(),
+                'has_completed': False,
+                'has_ongoing': False,
+                'completed_record_ids': [],
+                'ongoing_record_ids': [],
+                'ongoing_records': [],
+                'details': None
+            }
+        
+        status = row['status_norm']
+        entry['statuses'].add(status)
+        if status == 'Completed':
+            entry['has_completed'] = True
+            entry['completed_record_ids'].append(row.get('record_id'))
+        elif status == 'On-going':
+            entry['has_ongoing'] = True
+            entry['ongoing_record_ids'].append(row.get('record_id'))
+            if entry['details'] is None:
+                entry['details'] = {
+                    'company_id': company_id,
+                    'company_name': _display_value(row.get('company_name')),
+                    'campus_type': _display_value(row.get('campus_type')),
+                    'pr_assigned': _display_value(row.get('pr_assigned')),
+                    'pr_name': _display_value(row.get('pr_name')),
+                    'placement_origin': _display_value(row.get('placement_origin')),
+                    'status': _display_value(row.get('status'))
+                }
+            entry['ongoing_records'].append({
+                'record_id': _record_id_value(row.get('record_id')),
+                'role': _display_value(row.get('role')),
+                'package': _display_value(row.get('package')),
+                'student_names': _display_value(row.get('student_names')),
+                'noof_students_placed': _display_value(row.get('noof_students_placed'))
+            })
+    
+    for company_id, entry in companies.items():
+        entry['is_ongoing'] = entry['has_ongoing'] and not entry['has_completed']
+        if entry['is_ongoing']:
+            index['ongoing_company_ids'].append(company_id)
+    return index
+
+def get_company_status_index(placements_df=None):
+    """
+    Company status index for the current placements file, built once per file version.
+    An already loaded placements frame can be passed to avoid re-reading the CSV.
+    """
+    return get_cached_derived(
+        'company_status_index',
+        [cohort_config()['placement_csv']],
+        lambda: build_company_status_index(placements_df if placements_df is not None else load_placements())
+    )
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -512,113 +1757,117 @@ def logout():
     session.pop('role', None)
     return redirect(url_for('login'))
 
+# Dashboard aggregates for one cohort
+@timed
+def build_dashboard_stats(students, placements):
+    """
+    Headline numbers, class/PR/company breakdowns and campus/origin splits shown on the dashboard.
+    """
+    # Filter only completed company records for dashboard metrics
+    completed_placements = placements[placements['status_norm'] == 'Completed'].copy()
+    
+    # Normalize company IDs for completed records
+    if not completed_placements.empty and 'company_id' in completed_placements.columns:
+        completed_placements['company_id'] = completed_placements['company_id'].astype(str).str.strip()
+        completed_placements = completed_placements[completed_placements['company_id'] != '']
+    
+    # Ensure we always have a DataFrame to work with
+    if completed_placements.empty:
+        completed_placements = placements.iloc[0:0].copy()
+    
+    # Get unique placed students - count all students from student_names regardless of status
+    placed_students = set()
+    for names in placements['student_names'].dropna():
+        if names and names != '':
+            placed_students.update([n.strip().upper() for n in str(names).split(',')])
+    
+    total_students = len(students)
+    total_placed = len(placed_students)
+    
+    company_ids = completed_placements['company_id'] if 'company_id' in completed_placements.columns else pd.Series(dtype=str)
+    total_companies = company_ids.nunique()
+    
+    # Calculate average package
+    packages = []
+    for pkg in completed_placements['package'].dropna():
+        pkg_str = str(pkg).strip()
+        if 'LPA' in pkg_str.upper():
+            try:
+                num = float(pkg_str.split()[0])
+                packages.append(num)
+            except:
+                pass
+    avg_package = round(sum(packages) / len(packages), 2) if packages else 0
+    
+    # Placement by class - optimized with caching - count all students from student_names regardless of status
+    class_counts = {}
+    with track_time('dashboard_class_counts'):
+        reg_nos = placements['student_reg_nos'] if 'student_reg_nos' in placements.columns else [np.nan] * len(placements)
+        for names, stored_reg_nos in zip(placements['student_names'], reg_nos):
+            for name, student in placement_students(names, stored_reg_nos):
+                if student and student['class']:
+                    class_counts[student['class']] = class_counts.get(student['class'], 0) + 1
+    
+    # PR stats
+    pr_stats = {}
+    for pr_code, pr_name in PR_MAPPING.items():
+        pr_data = completed_placements[completed_placements['pr_assigned'] == pr_code]
+        pr_stats[pr_name] = len(pr_data)
+    
+    # Top companies - count all students from student_names regardless of status
+    company_student_counts = placements.groupby('company_id', observed=True)['student_names'].apply(
+        lambda x: sum([
+            len([n.strip() for n in str(names).split(',') if n.strip()])
+            for names in x.dropna() if names
+        ])
+    ).sort_values(ascending=False).head(10) if not placements.empty else pd.Series(dtype=float)
+    
+    company_name_map = placements.set_index('company_id')['company_name'].to_dict() if not placements.empty else {}
+    top_companies = {
+        company_name_map.get(company_id, str(company_id)): int(count)
+        for company_id, count in company_student_counts.items()
+    }
+    
+    # Campus Type Stats (On Campus vs Off Campus)
+    campus_stats = {'On Campus': 0, 'Off Campus': 0}
+    for campus_type in completed_placements['campus_norm']:
+        if campus_type in campus_stats:
+            campus_stats[campus_type] += 1
+    
+    # Placement Origin Stats (CPCG vs Department)
+    origin_stats = {}
+    for origin in completed_placements['origin_norm']:
+        if origin:
+            origin_stats[origin] = origin_stats.get(origin, 0) + 1
+    
+    return {
+        'total_students': total_students,
+        'total_placed': total_placed,
+        'total_companies': total_companies,
+        'avg_package': avg_package,
+        'class_counts': class_counts,
+        'pr_stats': pr_stats,
+        'top_companies': top_companies,
+        'campus_stats': campus_stats,
+        'origin_stats': origin_stats
+    }
+
+def get_dashboard_stats():
+    """
+    Dashboard aggregates for the current cohort, rebuilt only when its student, placement or alias file changes.
+    """
+    config = cohort_config()
+    return get_cached_derived(
+        'dashboard_stats',
+        [config['students_csv'], config['placement_csv'], config['alias_csv']],
+        lambda: build_dashboard_stats(load_students(), load_placements())
+    )
+
 @app.route('/')
 @login_required
 def dashboard():
     try:
-        students = load_students()
-        placements = load_placements()
-        
-        # Filter only completed company records for dashboard metrics
-        status_series = placements['status'] if 'status' in placements.columns else pd.Series([''] * len(placements), index=placements.index)
-        completed_mask = status_series.astype(str).str.strip().str.lower() == 'completed'
-        completed_placements = placements[completed_mask].copy()
-        
-        # Normalize company IDs for completed records
-        if not completed_placements.empty and 'company_id' in completed_placements.columns:
-            completed_placements['company_id'] = completed_placements['company_id'].astype(str).str.strip()
-            completed_placements = completed_placements[completed_placements['company_id'] != '']
-        
-        # Ensure we always have a DataFrame to work with
-        if completed_placements.empty:
-            completed_placements = placements.iloc[0:0].copy()
-        
-        # Get unique placed students - count all students from student_names regardless of status
-        placed_students = set()
-        for names in placements['student_names'].dropna():
-            if names and names != '':
-                placed_students.update([n.strip().upper() for n in str(names).split(',')])
-        
-        total_students = len(students)
-        total_placed = len(placed_students)
-        
-        company_ids = completed_placements['company_id'] if 'company_id' in completed_placements.columns else pd.Series(dtype=str)
-        total_companies = company_ids.nunique()
-        
-        # Calculate average package
-        packages = []
-        for pkg in completed_placements['package'].dropna():
-            pkg_str = str(pkg).strip()
-            if 'LPA' in pkg_str.upper():
-                try:
-                    num = float(pkg_str.split()[0])
-                    packages.append(num)
-                except:
-                    pass
-        avg_package = round(sum(packages) / len(packages), 2) if packages else 0
-        
-        # Placement by class - optimized with caching - count all students from student_names regardless of status
-        class_counts = {}
-        print("Starting class count calculation...")
-        for idx, row in placements.iterrows():
-            if pd.notna(row.get('student_names')) and str(row.get('student_names', '')).strip():
-                names = [n.strip() for n in str(row['student_names']).split(',') if n.strip()]
-                for name in names:
-                    try:
-                        student_class = get_student_class(name)
-                        if student_class:
-                            class_counts[student_class] = class_counts.get(student_class, 0) + 1
-                    except Exception as e:
-                        print(f"Error getting class for {name}: {e}")
-                        continue
-        print(f"Class counts: {class_counts}")
-        
-        # PR stats
-        pr_stats = {}
-        for pr_code, pr_name in PR_MAPPING.items():
-            pr_data = completed_placements[completed_placements['pr_assigned'] == pr_code]
-            pr_stats[pr_name] = len(pr_data)
-        
-        # Top companies - count all students from student_names regardless of status
-        company_student_counts = placements.groupby('company_id')['student_names'].apply(
-            lambda x: sum([
-                len([n.strip() for n in str(names).split(',') if n.strip()])
-                for names in x.dropna() if names
-            ])
-        ).sort_values(ascending=False).head(10) if not placements.empty else pd.Series(dtype=float)
-        
-        company_name_map = placements.set_index('company_id')['company_name'].to_dict() if not placements.empty else {}
-        top_companies = {
-            company_name_map.get(company_id, str(company_id)): int(count)
-            for company_id, count in company_student_counts.items()
-        }
-        
-        # Campus Type Stats (On Campus vs Off Campus)
-        campus_stats = {'On Campus': 0, 'Off Campus': 0}
-        for campus_type in completed_placements['campus_type'].dropna():
-            campus_str = str(campus_type).strip()
-            if campus_str in campus_stats:
-                campus_stats[campus_str] += 1
-        
-        # Placement Origin Stats (CPCG vs Department)
-        origin_stats = {}
-        for origin in completed_placements['placement_origin'].dropna():
-            origin_str = str(origin).strip()
-            if origin_str:
-                origin_stats[origin_str] = origin_stats.get(origin_str, 0) + 1
-        
-        print("Dashboard data prepared successfully")
-        
-        return render_template('dashboard.html',
-                             total_students=total_students,
-                             total_placed=total_placed,
-                             total_companies=total_companies,
-                             avg_package=avg_package,
-                             class_counts=class_counts,
-                             pr_stats=pr_stats,
-                             top_companies=top_companies,
-                             campus_stats=campus_stats,
-                             origin_stats=origin_stats)
+        return render_template('dashboard.html', **get_dashboard_stats())
     except Exception as e:
         print(f"Dashboard error: {e}")
         import traceback
@@ -665,62 +1914,7 @@ def students():
 @login_required
 def pr_dashboard():
     placements = load_placements()
-    
-    pr_details = {}
-    for pr_code, pr_name in PR_MAPPING.items():
-        pr_data = placements[placements['pr_assigned'] == pr_code]
-        unique_company_records = get_unique_company_records(pr_data)
-        
-        # Count students - count all students from student_names regardless of status
-        students_placed = set()
-        for _, row in pr_data.iterrows():
-            if pd.notna(row.get('student_names')) and str(row['student_names']).strip():
-                names = [n.strip() for n in str(row['student_names']).split(',') if n.strip()]
-                students_placed.update(names)
-        
-        # Calculate avg package - only from completed records
-        packages = []
-        for _, row in pr_data.iterrows():
-            # Filter by status='completed' to be consistent with dashboard
-            status = str(row.get('status', '')).strip().lower()
-            if status != 'completed':
-                continue  # Skip non-completed records
-            
-            pkg = row.get('package')
-            if pd.notna(pkg):
-                pkg_str = str(pkg).strip()
-                if 'LPA' in pkg_str:
-                    try:
-                        packages.append(float(pkg_str.split()[0]))
-                    except:
-                        pass
-        
-        status_counts = {}
-        for status in unique_company_records.get('status', []):
-            status_str = str(status).strip() or 'Unknown'
-            status_counts[status_str] = status_counts.get(status_str, 0) + 1
-        
-        companies_list = []
-        if not unique_company_records.empty:
-            companies_list = [
-                {
-                    'company_id': row.get('company_id', ''),
-                    'name': row.get('company_name', 'N/A'),
-                    'status': row.get('status', 'Unknown')
-                }
-                for _, row in unique_company_records.fillna('').iterrows()
-            ]
-        
-        pr_details[pr_name] = {
-            'code': pr_code,
-            'drives': len(pr_data),
-            'companies_count': len(companies_list),
-            'students': len(students_placed),
-            'avg_package': round(sum(packages) / len(packages), 2) if packages else 0,
-            'companies': companies_list,
-            'status_counts': status_counts
-        }
-    
+    pr_details = build_pr_details(placements)
     return render_template('pr_dashboard.html', pr_details=pr_details)
 
 @app.route('/companies')
@@ -728,177 +1922,37 @@ def pr_dashboard():
 def companies():
     placements = load_placements()
     
-    # First, filter placements by campus type BEFORE getting unique companies
-    # This ensures on-campus visualizations only include on-campus companies
-    # Strictly filter: only "On Campus" (case-insensitive, any spacing) for on-campus
-    # Everything else (Off Campus, Offcampus, empty, etc.) goes to off-campus
-    campus_type_series = placements['campus_type'].astype(str).str.strip().str.casefold()
-    
-    # On-campus: must be exactly "on campus" (handles "On Campus", "ON CAMPUS", "on campus", etc.)
-    on_campus_mask = campus_type_series == 'on campus'
-    on_campus_placements = placements[on_campus_mask].copy()
-    
-    # Off-campus: everything that is NOT "on campus" (includes "Off Campus", "Offcampus", empty, etc.)
-    off_campus_mask = ~on_campus_mask & (campus_type_series != '')
-    off_campus_placements = placements[off_campus_mask].copy()
-    
-    # Verify filtering: ensure no off-campus records in on-campus data
-    if not on_campus_placements.empty:
-        # Double-check: remove any records that might have slipped through
-        on_campus_placements = on_campus_placements[
-            on_campus_placements['campus_type'].astype(str).str.strip().str.casefold() == 'on campus'
-        ].copy()
-    
-    # Build unique company-level view for ALL companies (for the main table)
-    unique_company_df = get_unique_company_records(placements)
-    if not unique_company_df.empty:
-        unique_company_df['campus_type'] = unique_company_df['campus_type'].fillna('').str.strip()
-        unique_company_df['placement_origin'] = unique_company_df['placement_origin'].fillna('').str.strip()
-        unique_company_df['status'] = unique_company_df['status'].fillna('').str.strip()
-    
-    # Calculate total students placed per company - count all students from student_names regardless of status
-    company_student_counts = {}
-    for _, row in placements.iterrows():
-        company_id = str(row.get('company_id', '')).strip()
-        if company_id and company_id != '':
-            student_names = row.get('student_names')
-            if pd.notna(student_names) and str(student_names).strip():
-                # Count unique students (split by comma and count)
-                names = [n.strip() for n in str(student_names).split(',') if n.strip()]
-                if company_id not in company_student_counts:
-                    company_student_counts[company_id] = set()
-                company_student_counts[company_id].update([n.upper() for n in names])
-    
-    # Convert sets to counts and add to company overview
-    company_overview = unique_company_df.to_dict('records')
-    for company in company_overview:
-        company_id = str(company.get('company_id', '')).strip()
-        # Count unique students placed for this company
-        unique_students = company_student_counts.get(company_id, set())
-        company['total_students_placed'] = len(unique_students)
-    
-    # Build unique company-level view for ON-CAMPUS ONLY (for on-campus visualizations)
-    on_campus_unique_df = get_unique_company_records(on_campus_placements)
-    if not on_campus_unique_df.empty:
-        on_campus_unique_df['campus_type'] = on_campus_unique_df['campus_type'].fillna('').str.strip()
-        on_campus_unique_df['placement_origin'] = on_campus_unique_df['placement_origin'].fillna('').str.strip()
-        on_campus_unique_df['status'] = on_campus_unique_df['status'].fillna('').str.strip()
-        
-        # CRITICAL: Double-check and remove any off-campus companies that might have slipped through
-        # Filter out any companies where campus_type is NOT "On Campus"
-        on_campus_unique_df = on_campus_unique_df[
-            on_campus_unique_df['campus_type'].str.casefold() == 'on campus'
-        ].copy()
-    
-    # Build unique company-level view for OFF-CAMPUS ONLY (for off-campus visualizations)
-    off_campus_unique_df = get_unique_company_records(off_campus_placements)
-    if not off_campus_unique_df.empty:
-        off_campus_unique_df['campus_type'] = off_campus_unique_df['campus_type'].fillna('').str.strip()
-        off_campus_unique_df['placement_origin'] = off_campus_unique_df['placement_origin'].fillna('').str.strip()
-        off_campus_unique_df['status'] = off_campus_unique_df['status'].fillna('').str.strip()
-        
-        # CRITICAL: Double-check and remove any on-campus companies
-        # Filter out any companies where campus_type IS "On Campus"
-        off_campus_unique_df = off_campus_unique_df[
-            off_campus_unique_df['campus_type'].str.casefold() != 'on campus'
-        ].copy()
-    
-    # Use the filtered dataframes for visualizations
-    on_campus_df = on_campus_unique_df if not on_campus_unique_df.empty else pd.DataFrame()
-    off_campus_df = off_campus_unique_df if not off_campus_unique_df.empty else pd.DataFrame()
+    # All company-level views (overall, on-campus only, off-campus only, record listing)
+    # come from one groupby pass over the placements
+    views = build_company_views(placements)
+    company_overview = views['company_overview']
+    on_campus_companies_list = views['on_campus_companies']
+    off_campus_companies_list = views['off_campus_companies']
+    on_campus_df = pd.DataFrame(on_campus_companies_list, columns=['status', 'placement_origin'])
+    off_campus_df = pd.DataFrame(off_campus_companies_list, columns=['status', 'placement_origin'])
     
     # Calculate status statistics based on unique companies
-    def _status_counts(df):
-        stats = {}
-        if df.empty:
-            return stats
-        for _, row in df.iterrows():
-            status_str = str(row.get('status', '')).strip() or 'Unknown'
-            stats[status_str] = stats.get(status_str, 0) + 1
-        return stats
-    
-    on_campus_status_stats = _status_counts(on_campus_df)
-    off_campus_status_stats = _status_counts(off_campus_df)
+    on_campus_status_stats = _value_counts_dict(on_campus_df['status'])
+    off_campus_status_stats = _value_counts_dict(off_campus_df['status'])
     
     # On-campus detailed breakdown: Status -> Origin
-    on_campus_status_origin = {}
-    if not on_campus_df.empty:
-        for _, row in on_campus_df.iterrows():
-            status = str(row.get('status', '')).strip() or 'Unknown'
-            origin = str(row.get('placement_origin', '')).strip() or 'Unknown'
-            if status not in on_campus_status_origin:
-                on_campus_status_origin[status] = {}
-            on_campus_status_origin[status][origin] = on_campus_status_origin[status].get(origin, 0) + 1
+    on_campus_status_origin = _nested_counts_dict(on_campus_df['status'], on_campus_df['placement_origin'])
     
     # Completed on-campus breakdown (CPCG vs Department)
-    completed_on_campus_breakdown = {}
-    if not on_campus_df.empty:
-        completed_df = on_campus_df[on_campus_df['status'].str.lower() == 'completed']
-        for _, row in completed_df.iterrows():
-            origin = str(row.get('placement_origin', '')).strip() or 'Unknown'
-            completed_on_campus_breakdown[origin] = completed_on_campus_breakdown.get(origin, 0) + 1
+    completed_on_campus_df = on_campus_df[on_campus_df['status'] == 'Completed']
+    completed_on_campus_breakdown = _value_counts_dict(completed_on_campus_df['placement_origin'])
     
     # Off-campus origin snapshot
-    off_campus_origin_stats = {}
-    if not off_campus_df.empty:
-        for _, row in off_campus_df.iterrows():
-            origin = str(row.get('placement_origin', '')).strip() or 'Unknown'
-            off_campus_origin_stats[origin] = off_campus_origin_stats.get(origin, 0) + 1
-    
-    # Build company-wise records for easy understanding
-    # Group all records by company_id to show all records per company
-    company_wise_records = {}
-    for _, row in placements.iterrows():
-        company_id = str(row.get('company_id', '')).strip()
-        if company_id and company_id != '':
-            if company_id not in company_wise_records:
-                company_wise_records[company_id] = {
-                    'company_id': company_id,
-                    'company_name': str(row.get('company_name', '')).strip(),
-                    'campus_type': str(row.get('campus_type', '')).strip(),
-                    'pr_assigned': str(row.get('pr_assigned', '')).strip(),
-                    'pr_name': str(row.get('pr_name', '')).strip(),
-                    'placement_origin': str(row.get('placement_origin', '')).strip(),
-                    'records': []
-                }
-            
-            # Add this record
-            record_id = row.get('record_id')
-            if pd.notna(record_id):
-                try:
-                    record_id = int(float(record_id))
-                except (ValueError, TypeError):
-                    record_id = None
-            
-            company_wise_records[company_id]['records'].append({
-                'record_id': record_id,
-                'status': str(row.get('status', '')).strip(),
-                'role': str(row.get('role', '')).strip(),
-                'package': str(row.get('package', '')).strip(),
-                'student_names': str(row.get('student_names', '')).strip(),
-                'noof_students_placed': str(row.get('noof_students_placed', '')).strip(),
-                'class_distribution': str(row.get('class_distribution', '')).strip()
-            })
-    
-    # Add student counts to company_wise_records
-    for company_id, company_data in company_wise_records.items():
-        unique_students = company_student_counts.get(company_id, set())
-        company_data['total_students_placed'] = len(unique_students)
-    
-    # Convert to list and sort by company_id
-    company_wise_list = sorted(company_wise_records.values(), key=lambda x: x['company_id'])
+    off_campus_origin_stats = _value_counts_dict(off_campus_df['placement_origin'])
     
     # Replace NaN with empty strings for display
-    placements = placements.fillna('')
+    placements = with_object_columns(placements.drop(columns=list(PLACEMENT_NORMALIZED_COLUMNS))).fillna('')
     companies_list = placements.to_dict('records')
-    # Convert dataframes to dict for template (for modal filtering)
-    on_campus_companies_list = on_campus_df.to_dict('records') if not on_campus_df.empty else []
-    off_campus_companies_list = off_campus_df.to_dict('records') if not off_campus_df.empty else []
     
     return render_template('companies.html',
                            companies=companies_list,
                            company_overview=company_overview,
-                           company_wise_records=company_wise_list,
+                           company_wise_records=views['company_wise_records'],
                            company_count=len(company_overview),
                            pr_mapping=PR_MAPPING,
                            on_campus_status_stats=on_campus_status_stats,
@@ -906,8 +1960,8 @@ def companies():
                            completed_on_campus_breakdown=completed_on_campus_breakdown,
                            off_campus_status_stats=off_campus_status_stats,
                            off_campus_origin_stats=off_campus_origin_stats,
-                           on_campus_total=len(on_campus_df),
-                           off_campus_total=len(off_campus_df),
+                           on_campus_total=len(on_campus_companies_list),
+                           off_campus_total=len(off_campus_companies_list),
                            on_campus_companies=on_campus_companies_list,
                            off_campus_companies=off_campus_companies_list)
 
@@ -919,77 +1973,12 @@ def ongoing_companies():
     Companies are identified by company_id. If ANY record for a company is "Completed",
     the company is considered completed and excluded from this list.
     """
-    placements = load_placements()
+    status_index = get_company_status_index()
     
-    # First, identify companies that have ANY completed records (exclude these)
-    completed_company_ids = set()
-    for _, row in placements.iterrows():
-        company_id = str(row.get('company_id', '')).strip()
-        status = str(row.get('status', '')).strip().lower()
-        if company_id and status == 'completed':
-            completed_company_ids.add(company_id)
-    
-    # Filter ongoing companies, but exclude companies that have any completed records
-    ongoing_mask = placements['status'].astype(str).str.strip().str.lower().isin(['on-going', 'ongoing', 'on going'])
-    ongoing_placements = placements[ongoing_mask].copy()
-    
-    # Remove companies that have any completed records
-    if not ongoing_placements.empty:
-        ongoing_placements = ongoing_placements[
-            ~ongoing_placements['company_id'].astype(str).str.strip().isin(completed_company_ids)
-        ].copy()
-    
-    # Get unique company records
-    unique_companies = {}
-    for idx, row in ongoing_placements.iterrows():
-        # Helper function to safely get values from pandas Series
-        def safe_get(key, default=''):
-            if key not in row.index:
-                return default
-            value = row[key]
-            # Convert NaN to default
-            if pd.isna(value):
-                return default
-            # Convert to string for text fields
-            if isinstance(default, str):
-                return str(value) if value is not None else default
-            # Return as-is for numeric fields
-            return value
-        
-        company_id = str(safe_get('company_id', '')).strip()
-        if company_id and company_id != 'nan':
-            if company_id not in unique_companies:
-                unique_companies[company_id] = {
-                    'company_id': company_id,
-                    'company_name': safe_get('company_name', ''),
-                    'campus_type': safe_get('campus_type', ''),
-                    'pr_assigned': safe_get('pr_assigned', ''),
-                    'pr_name': safe_get('pr_name', ''),
-                    'placement_origin': safe_get('placement_origin', ''),
-                    'status': safe_get('status', ''),
-                    'records': []
-                }
-            
-            # Get record_id as int if possible
-            record_id_val = safe_get('record_id', None)
-            if record_id_val is not None and not pd.isna(record_id_val):
-                try:
-                    record_id_val = int(float(record_id_val))
-                except (ValueError, TypeError):
-                    record_id_val = None
-            else:
-                record_id_val = None
-            
-            unique_companies[company_id]['records'].append({
-                'record_id': record_id_val,
-                'role': safe_get('role', ''),
-                'package': safe_get('package', ''),
-                'student_names': safe_get('student_names', ''),
-                'noof_students_placed': safe_get('noof_students_placed', '')
-            })
-    
-    # Convert to list for template
-    companies_list = list(unique_companies.values())
+    companies_list = []
+    for company_id in status_index['ongoing_company_ids']:
+        entry = status_index['companies'][company_id]
+        companies_list.append(dict(entry['details'], records=[dict(r) for r in entry['ongoing_records']]))
     
     return render_template('ongoing_companies.html',
                          companies=companies_list,
@@ -1007,6 +1996,7 @@ def add_record():
     
     if request.method == 'POST':
         placements = load_placements()
+        status_index = get_company_status_index(placements)
         
         # Generate unique record_id
         max_record_id = placements['record_id'].max() if len(placements) > 0 else 0
@@ -1019,43 +2009,23 @@ def add_record():
         # If company_id is provided, use it (for ongoing companies)
         if provided_company_id:
             new_id = provided_company_id
+        elif company_name.upper() in status_index['name_to_company_id']:
+            # Company name already exists (exact match, case-insensitive) - reuse its ID
+            new_id = status_index['name_to_company_id'][company_name.upper()]
         else:
-            # Check if company name already exists (exact match, case-insensitive)
-            existing_company = placements[placements['company_name'].str.strip().str.upper() == company_name.upper()]
-            
-            if not existing_company.empty:
-                # Reuse existing company ID
-                new_id = existing_company.iloc[0]['company_id']
-            else:
-                # Generate new company ID
-                existing_ids = placements['company_id'].tolist()
-                max_id = 0
-                for cid in existing_ids:
-                    if isinstance(cid, str) and cid.startswith('CMP'):
-                        try:
-                            num = int(cid[3:])
-                            max_id = max(max_id, num)
-                        except:
-                            pass
-                new_id = f'CMP{str(max_id + 1).zfill(2)}'
+            # Generate new company ID
+            new_id = f'CMP{str(status_index["max_company_number"] + 1).zfill(2)}'
         
         # Auto-detect class
         student_names = request.form.get('student_names', '').strip()
-        class_dist = ''
-        if student_names:
-            names = [n.strip() for n in student_names.split(',')]
-            classes = [get_student_class(name) for name in names]
-            class_dist = ', '.join([c for c in classes if c])
+        class_dist = student_class_distribution(student_names)
         
         # Check if adding a Completed record when On-going record exists for same company
         new_status = request.form.get('status', '').strip()
-        if new_status.lower() == 'completed' and new_id:
-            existing_ongoing = placements[
-                (placements['company_id'].astype(str).str.strip() == new_id) &
-                (placements['status'].astype(str).str.strip().str.lower().isin(['on-going', 'ongoing', 'on going']))
-            ]
-            if not existing_ongoing.empty:
-                ongoing_ids = existing_ongoing['record_id'].astype(str).tolist()
+        if _normalize_status(new_status) == 'Completed' and new_id:
+            company_entry = status_index['companies'].get(str(new_id).strip())
+            if company_entry and company_entry['ongoing_record_ids']:
+                ongoing_ids = [str(rid) for rid in company_entry['ongoing_record_ids']]
                 flash(f'Note: This company already has On-going record(s) (ID: {", ".join(ongoing_ids)}). If you meant to update the status, please edit the existing record instead of creating a new one.', 'info')
         
         new_record = {
@@ -1075,10 +2045,11 @@ def add_record():
         }
         
         placements = pd.concat([placements, pd.DataFrame([new_record])], ignore_index=True)
-        save_placements(placements)
+        save_placements(placements, resolve_record_ids=[new_record_id])
+        record_placement_change('added', new_record_id, new_id)
         flash('Record added successfully!', 'success')
         # Redirect to ongoing companies if it was an ongoing company
-        if request.form.get('status', '').lower() in ['on-going', 'ongoing', 'on going']:
+        if _normalize_status(new_status) == 'On-going':
             return redirect(url_for('ongoing_companies'))
         return redirect(url_for('companies'))
     
@@ -1090,47 +2061,17 @@ def add_record():
     }
     
     # Get all ongoing companies for dropdown
-    placements = load_placements()
-    
-    # First, identify companies that have ANY completed records (exclude these)
-    completed_company_ids = set()
-    for _, row in placements.iterrows():
-        company_id = str(row.get('company_id', '')).strip()
-        status = str(row.get('status', '')).strip().lower()
-        if company_id and status == 'completed':
-            completed_company_ids.add(company_id)
-    
-    # Filter ongoing companies, but exclude companies that have any completed records
-    ongoing_mask = placements['status'].astype(str).str.strip().str.lower().isin(['on-going', 'ongoing', 'on going'])
-    ongoing_placements = placements[ongoing_mask].copy()
-    
-    # Remove companies that have any completed records
-    if not ongoing_placements.empty:
-        ongoing_placements = ongoing_placements[
-            ~ongoing_placements['company_id'].astype(str).str.strip().isin(completed_company_ids)
-        ].copy()
-    
-    # Get unique ongoing companies
+    status_index = get_company_status_index()
     ongoing_companies = []
-    if not ongoing_placements.empty:
-        unique_companies = {}
-        for _, row in ongoing_placements.iterrows():
-            company_id = str(row.get('company_id', '')).strip()
-            company_name = str(row.get('company_name', '')).strip()
-            if company_id and company_id != 'nan' and company_id not in unique_companies:
-                unique_companies[company_id] = company_name
-        
-        ongoing_companies = []
-        for cid, name in sorted(unique_companies.items()):
-            # Get additional company details from the first record
-            company_record = ongoing_placements[ongoing_placements['company_id'].astype(str).str.strip() == cid].iloc[0]
-            ongoing_companies.append({
-                'id': cid,
-                'name': name,
-                'campus_type': str(company_record.get('campus_type', '')).strip() if pd.notna(company_record.get('campus_type')) else '',
-                'placement_origin': str(company_record.get('placement_origin', '')).strip() if pd.notna(company_record.get('placement_origin')) else '',
-                'pr_assigned': str(company_record.get('pr_assigned', '')).strip() if pd.notna(company_record.get('pr_assigned')) else ''
-            })
+    for cid in sorted(status_index['ongoing_company_ids']):
+        details = status_index['companies'][cid]['details']
+        ongoing_companies.append({
+            'id': cid,
+            'name': details['company_name'].strip(),
+            'campus_type': details['campus_type'].strip(),
+            'placement_origin': details['placement_origin'].strip(),
+            'pr_assigned': details['pr_assigned'].strip()
+        })
     
     return render_template('add_record.html', 
                          pr_mapping=PR_MAPPING, 
@@ -1143,39 +2084,36 @@ def edit_record(record_id):
     placements = load_placements()
     
     if request.method == 'POST':
+        placements = with_object_columns(placements)
         idx = placements[placements['record_id'] == record_id].index[0]
         
         # Get current record details before update
         current_record = placements.iloc[idx]
-        current_status = str(current_record.get('status', '')).strip().lower()
+        current_status = current_record['status_norm']
         current_company_id = str(current_record.get('company_id', '')).strip()
         
         student_names = request.form.get('student_names', '').strip()
-        class_dist = ''
-        if student_names:
-            names = [n.strip() for n in student_names.split(',')]
-            classes = [get_student_class(name) for name in names]
-            class_dist = ', '.join([c for c in classes if c])
+        class_dist = student_class_distribution(student_names)
         
         # Get the new status value
         new_status = request.form.get('status', '').strip()
         
         # Check for potential duplicate: if changing from On-going to Completed,
         # check if there's already a Completed record for the same company
-        if (current_status in ['on-going', 'ongoing', 'on going'] and 
-            new_status.lower() == 'completed' and 
+        if (current_status == 'On-going' and 
+            _normalize_status(new_status) == 'Completed' and 
             current_company_id):
             
             # Check for existing Completed records with same company_id (excluding current record)
-            existing_completed = placements[
-                (placements['record_id'] != record_id) &
-                (placements['company_id'].astype(str).str.strip() == current_company_id) &
-                (placements['status'].astype(str).str.strip().str.lower() == 'completed')
+            company_entry = get_company_status_index(placements)['companies'].get(current_company_id)
+            existing_completed = [
+                str(rid) for rid in (company_entry['completed_record_ids'] if company_entry else [])
+                if rid != record_id
             ]
             
-            if not existing_completed.empty:
+            if existing_completed:
                 # Warn about existing completed record but still allow the update
-                flash(f'Warning: There is already a Completed record for this company (record_id: {", ".join(existing_completed["record_id"].astype(str).tolist())}). Make sure you are updating the correct record, not creating a duplicate.', 'warning')
+                flash(f'Warning: There is already a Completed record for this company (record_id: {", ".join(existing_completed)}). Make sure you are updating the correct record, not creating a duplicate.', 'warning')
         
         placements.at[idx, 'company_name'] = request.form.get('company_name')
         placements.at[idx, 'campus_type'] = request.form.get('campus_type')
@@ -1190,29 +2128,33 @@ def edit_record(record_id):
         placements.at[idx, 'class_distribution'] = class_dist
         
         # Save to CSV - this ensures the change is persisted
-        save_placements(placements)
+        save_placements(placements, resolve_record_ids=[record_id])
+        record_placement_change('updated', record_id, current_company_id)
         
         # Show appropriate message based on status change
-        if new_status.lower() == 'completed':
+        if _normalize_status(new_status) == 'Completed':
             flash('Record updated successfully! Status changed to Completed. Students will now be counted in placement statistics.', 'success')
         else:
             flash('Record updated successfully!', 'success')
         
         # Redirect based on status - if completed, go to dashboard to see updated count
-        if new_status.lower() == 'completed':
+        if _normalize_status(new_status) == 'Completed':
             return redirect(url_for('dashboard'))
         return redirect(url_for('companies'))
     
     # Replace NaN with empty strings for display
-    record = placements[placements['record_id'] == record_id].iloc[0].fillna('').to_dict()
+    record = placements[placements['record_id'] == record_id].drop(columns=list(PLACEMENT_NORMALIZED_COLUMNS)).iloc[0].fillna('').to_dict()
     return render_template('edit_record.html', record=record, pr_mapping=PR_MAPPING)
 
 @app.route('/delete_record/<int:record_id>')
 @admin_required
 def delete_record(record_id):
     placements = load_placements()
+    deleted = placements[placements['record_id'] == record_id]
     placements = placements[placements['record_id'] != record_id]
     save_placements(placements)
+    for company_id in deleted['company_id']:
+        record_placement_change('deleted', record_id, company_id)
     flash('Record deleted successfully!', 'success')
     return redirect(url_for('companies'))
 
@@ -1280,11 +2222,7 @@ def company_stats(company_id):
         
         for _, record in company_records.iterrows():
             if pd.notna(record.get('student_names')) and str(record.get('student_names', '')).strip():
-                names = [n.strip() for n in str(record['student_names']).split(',') if n.strip()]
-                for name in names:
-                    # Use improved function to get student details
-                    student_info = get_student_details(name)
-                    
+                for name, student_info in placement_students(record['student_names'], record.get('student_reg_nos')):
                     if student_info:
                         # Student found in database
                         student_details.append({
@@ -1341,217 +2279,415 @@ def convert_to_native(obj):
         return None
     return obj
 
-# Get complete student application history from all ANALYSIS CSVs
-def get_student_application_history(student_name):
+def _analysis_id_columns(columns):
+    # Name and register number columns of an ANALYSIS sheet (the last matching column wins)
+    name_col = None
+    reg_no_col = None
+    for col in columns:
+        if 'name' in col.lower() and 'student' in col.lower():
+            name_col = col
+        if 'register' in col.lower() and 'number' in col.lower():
+            reg_no_col = col
+    return name_col, reg_no_col
+
+def _application_stage_positions(columns):
+    # Positions of the stage columns of a sheet, as _company_application reads them
+    name_col, reg_no_col = _analysis_id_columns(columns)
+    # Exclude Name and Register Number columns - these are identifiers, not rounds
+    exclude_cols = [name_col]
+    if reg_no_col:
+        exclude_cols.append(reg_no_col)
+    # Also exclude common variations
+    exclude_cols.extend(['Register Number', 'Name', 'Name of the Student', 'Reg.no', 'Reg No'])
+    return [position for position, col in enumerate(columns) if col not in exclude_cols]
+
+def _company_application(stages, passed, company_id, company_name):
     """
-    Get complete application history for a specific student across all companies.
-    Returns detailed progression through each company's recruitment rounds.
+    One student's progression through one company's rounds, or None if they did not apply.
+    passed holds one flag per stage.
     """
-    students_df = load_students()
-    placements = load_placements()
+    # Track progression through stages
+    progression = []
+    applied = False
+    last_passed_stage = None
+    reached_stage_index = -1
+    failed_at_stage = None
     
-    # Get company name mapping from placements
-    company_name_map = {}
-    if not placements.empty and 'company_id' in placements.columns:
-        for _, row in placements.iterrows():
-            company_id = str(row.get('company_id', '')).strip()
-            company_name = str(row.get('company_name', '')).strip()
-            if company_id and company_name:
-                company_name_map[company_id] = company_name
+    for idx, stage in enumerate(stages):
+        # Track if student applied (first stage or any stage with "Applied" in name)
+        if idx == 0:
+            applied = passed[idx]  # First stage always indicates application
+        elif 'Applied' in stage and passed[idx]:
+            applied = True
+        
+        if passed[idx]:
+            last_passed_stage = stage
+            reached_stage_index = idx
+            progression.append({
+                'stage': stage,
+                'passed': True,
+                'index': idx
+            })
+        else:
+            progression.append({
+                'stage': stage,
+                'passed': False,
+                'index': idx
+            })
+            
+            # If this is the first stage after last passed, this is where they failed
+            if last_passed_stage and failed_at_stage is None and idx > reached_stage_index:
+                failed_at_stage = stage
     
-    # Find student in FULL NAME LIST
-    student_info = get_student_details(student_name)
-    if not student_info:
+    # Only add if student actually applied
+    if not applied:
         return None
     
-    student_name_upper = student_info['name'].upper()
-    
-    # Load all ANALYSIS CSVs and track student's progress
-    application_history = []
-    companies_not_applied = []
+    # Determine final status
+    if last_passed_stage == 'Selected' or (stages and last_passed_stage == stages[-1] and reached_stage_index == len(stages) - 1):
+        final_status = 'Selected'
+    elif failed_at_stage:
+        final_status = f'Failed at {failed_at_stage}'
+    elif last_passed_stage and last_passed_stage != stages[0]:
+        final_status = f'Reached {last_passed_stage}'
+    else:
+        final_status = 'Applied Only'
     
-    if not os.path.exists(ANALYSIS_FOLDER):
-        return None
+    # Count stages passed
+    stages_passed = sum(1 for p in progression if p.get('passed', False))
     
-    # Get list of all company IDs from ANALYSIS folder
-    all_company_ids = set()
-    for filename in os.listdir(ANALYSIS_FOLDER):
-        if filename.endswith('.csv'):
-            company_id = filename.replace('.csv', '').strip()
-            all_company_ids.add(company_id)
-    
-    # Process each company's analysis CSV
-    for filename in os.listdir(ANALYSIS_FOLDER):
-        if filename.endswith('.csv'):
-            company_id = filename.replace('.csv', '').strip()
-            filepath = os.path.join(ANALYSIS_FOLDER, filename)
-            company_name = company_name_map.get(company_id, company_id)
-            
+    return {
+        'company_id': str(company_id),
+        'company_name': str(company_name),
+        'stages': [str(s) for s in stages],
+        'progression': progression,
+        'stages_passed': int(stages_passed),
+        'total_stages': int(len(stages)),
+        'last_passed_stage': str(last_passed_stage) if last_passed_stage else None,
+        'failed_at_stage': str(failed_at_stage) if failed_at_stage else None,
+        'final_status': str(final_status),
+        'reached_final': bool(reached_stage_index == len(stages) - 1 if stages else False)
+    }
+
+def _analysis_files():
+    analysis_folder = cohort_config()['analysis_folder']
+    if not os.path.exists(analysis_folder):
+        return []
+    return [
+        os.path.join(analysis_folder, filename)
+        for filename in os.listdir(analysis_folder) if filename.endswith('.csv')
+    ]
+
+# Stage store - every ANALYSIS sheet compiled into one binary file per cohort, which worker
+# processes map read-only with numpy.memmap so they all share one page-cache copy instead
+# of each holding the parsed sheets:
+#     b'PSTAGES2', uint64 header length, JSON header (padded to 8 bytes),
+#     int32 value_ids[id cells], int8 passed[cells]
+# A company's passed cells are its rows x columns matrix over every sheet column (1 = the
+# cell is 1, 0 = not); its value_ids are a rows x id columns matrix (the student name and
+# register number columns) indexing the header's values, the cells exactly as parsed.
+# Rows are matched to roster students when read, so the store changes only with the sheets.
+# A stale store is rebuilt under a lock, reusing the blocks of unchanged sheets, into a
+# temporary file that os.replace swaps in, so readers never see a half written store.
+STAGE_STORE_MAGIC = b'PSTAGES2'
+_stage_store_lock = threading.Lock()
+
+def _file_version(filepath):
+    return '-'.join(map(str, _file_signature(filepath) or ()))
+
+def _stage_store_id_columns(columns):
+    # Every student name column, then the register number columns
+    name_cols = [col for col in columns if 'name' in col.lower() and 'student' in col.lower()]
+    _, reg_no_col = _analysis_id_columns(columns)
+    return list(dict.fromkeys(name_cols + [col for col in [reg_no_col, 'Register Number'] if col in columns]))
+
+def _stage_store_value_key(value):
+    # NaN never equals itself, so every missing cell shares one key
+    return None if pd.isna(value) else (type(value).__name__, value)
+
+def _build_stage_store(path, versions, old_header=None, old_value_ids=None, old_cells=None):
+    # The values of the old store are kept in place so its blocks can be copied as they are
+    values = list(old_header['values']) if old_header else []
+    value_ids = {_stage_store_value_key(value): value_id for value_id, value in enumerate(values)}
+    old_companies = {company['filename']: company for company in old_header['companies']} if old_header else {}
+    companies = []
+    id_blocks = []
+    cell_blocks = []
+    id_offset = 0
+    cell_offset = 0
+    for filepath, version in versions:
+        filename = os.path.basename(filepath)
+        company = old_companies.get(filename)
+        if company is not None and company['version'] == version:
+            id_count = company['rows'] * len(company['id_columns'])
+            cell_count = company['rows'] * len(company['columns'])
+            id_blocks.append(old_value_ids[company['id_offset']:company['id_offset'] + id_count])
+            cell_blocks.append(old_cells[company['cell_offset']:company['cell_offset'] + cell_count])
+            company = dict(company)
+        else:
             try:
-                df = pd.read_csv(filepath)
-                df.columns = df.columns.str.strip()
-                
-                # Find name column and register number column
-                name_col = None
-                reg_no_col = None
-                for col in df.columns:
-                    if 'name' in col.lower() and 'student' in col.lower():
-                        name_col = col
-                    if 'register' in col.lower() and 'number' in col.lower():
-                        reg_no_col = col
-                
-                if name_col is None:
-                    continue
-                
-                # Get student info for matching
-                student_info = get_student_details(student_name)
-                student_reg_no = student_info['reg_no'] if student_info else None
-                student_reg_no_upper = str(student_reg_no).strip().upper() if student_reg_no else None
-                
-                # Find student in this company's data by name or register number
-                student_row = None
-                for _, row in df.iterrows():
-                    row_name = str(row[name_col]).strip().upper()
-                    
-                    # Try exact name match
-                    if row_name == student_name_upper:
-                        student_row = row
-                        break
-                    
-                    # Try register number match if available
-                    if reg_no_col and reg_no_col in row.index and student_reg_no_upper:
-                        row_reg_no = str(row[reg_no_col]).strip().upper()
-                        if row_reg_no == student_reg_no_upper:
-                            student_row = row
-                            break
-                    
-                    # Try fuzzy name match
-                    if student_name_upper in row_name or row_name in student_name_upper:
-                        student_row = row
-                        break
-                
-                if student_row is None:
-                    companies_not_applied.append({
-                        'company_id': str(company_id),
-                        'company_name': str(company_name)
-                    })
-                    continue
-                
-                # Get stages (exclude Name and Register Number columns - these are identifiers, not rounds)
-                exclude_cols = [name_col]
-                if reg_no_col:
-                    exclude_cols.append(reg_no_col)
-                # Also exclude common variations
-                exclude_cols.extend(['Register Number', 'Name', 'Name of the Student', 'Reg.no', 'Reg No'])
-                stages = [col for col in df.columns if col not in exclude_cols]
-                
-                # Track progression through stages
-                progression = []
-                applied = False
-                last_passed_stage = None
-                reached_stage_index = -1
-                failed_at_stage = None
-                
-                for idx, stage in enumerate(stages):
-                    if stage in student_row.index:
-                        value = student_row[stage]
-                        # Convert to int if possible, handle NaN
-                        if pd.isna(value):
-                            passed = False
-                        elif isinstance(value, (int, float)):
-                            passed = int(value) == 1
-                        else:
-                            passed = str(value).strip() == '1'
-                        
-                        # Track if student applied (first stage or any stage with "Applied" in name)
-                        if idx == 0:
-                            applied = passed  # First stage always indicates application
-                        elif 'Applied' in stage and passed:
-                            applied = True
-                        
-                        if passed:
-                            last_passed_stage = stage
-                            reached_stage_index = idx
-                            progression.append({
-                                'stage': stage,
-                                'passed': True,
-                                'index': idx
-                            })
-                        else:
-                            progression.append({
-                                'stage': stage,
-                                'passed': False,
-                                'index': idx
-                            })
-                            
-                            # If this is the first stage after last passed, this is where they failed
-                            if last_passed_stage and failed_at_stage is None and idx > reached_stage_index:
-                                failed_at_stage = stage
-                
-                # Only add if student actually applied
-                if not applied:
-                    companies_not_applied.append({
-                        'company_id': str(company_id),
-                        'company_name': str(company_name)
-                    })
-                    continue
-                
-                # Determine final status
-                if last_passed_stage == 'Selected' or (stages and last_passed_stage == stages[-1] and reached_stage_index == len(stages) - 1):
-                    final_status = 'Selected'
-                elif failed_at_stage:
-                    final_status = f'Failed at {failed_at_stage}'
-                elif last_passed_stage and last_passed_stage != stages[0]:
-                    final_status = f'Reached {last_passed_stage}'
-                else:
-                    final_status = 'Applied Only'
-                
-                # Count stages passed
-                stages_passed = sum(1 for p in progression if p.get('passed', False))
-                
-                application_history.append({
-                    'company_id': str(company_id),
-                    'company_name': str(company_name),
-                    'stages': [str(s) for s in stages],
-                    'progression': progression,
-                    'stages_passed': int(stages_passed),
-                    'total_stages': int(len(stages)),
-                    'last_passed_stage': str(last_passed_stage) if last_passed_stage else None,
-                    'failed_at_stage': str(failed_at_stage) if failed_at_stage else None,
-                    'final_status': str(final_status),
-                    'reached_final': bool(reached_stage_index == len(stages) - 1 if stages else False)
-                })
-                
+                df = load_company_analysis_file(filepath)
             except Exception as e:
-                print(f"Error processing {filename}: {e}")
+                print(f"Error loading {filename}: {e}")
                 continue
+            columns = list(df.columns)
+            id_columns = _stage_store_id_columns(columns)
+            ids = np.empty((len(df), len(id_columns)), dtype=np.int32)
+            for position, col in enumerate(id_columns):
+                for row, value in enumerate(df[col].tolist()):
+                    key = _stage_store_value_key(value)
+                    if key not in value_ids:
+                        value_ids[key] = len(values)
+                        values.append(value)
+                    ids[row, position] = value_ids[key]
+            id_blocks.append(ids.ravel())
+            cell_blocks.append(_passed_matrix(df, columns).astype(np.int8).ravel())
+            company = {
+                'company_id': filename.replace('.csv', '').strip(),
+                'filename': filename,
+                'version': version,
+                'columns': columns,
+                'flags': [col not in ANALYSIS_ID_COLUMNS and (df[col].dtype == 'int8' or _as_stage_flags(df[col]) is not None) for col in columns],
+                'id_columns': id_columns,
+                'rows': len(df)
+            }
+        company['id_offset'] = id_offset
+        company['cell_offset'] = cell_offset
+        companies.append(company)
+        id_offset += len(id_blocks[-1])
+        cell_offset += len(cell_blocks[-1])
+    
+    header = json.dumps({
+        'sources': [[os.path.basename(filepath), version] for filepath, version in versions],
+        'values': values,
+        'id_cells': id_offset,
+        'cells': cell_offset,
+        'companies': companies
+    }).encode('utf-8')
+    header += b' ' * (-len(header) % 8)
+    
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(STAGE_STORE_MAGIC)
+            handle.write(np.uint64(len(header)).tobytes())
+            handle.write(header)
+            for block in id_blocks:
+                handle.write(np.asarray(block, dtype=np.int32).tobytes())
+            for block in cell_blocks:
+                handle.write(np.asarray(block, dtype=np.int8).tobytes())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def _map_array(handle, dtype, offset, length):
+    if length == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(handle, dtype=dtype, mode='r', offset=offset, shape=(length,))
+
+def _map_stage_store(path):
+    """
+    (header, value_ids, cells) of the store file, or (None, None, None) when it is missing or
+    not a store. The arrays map the same file the header was read from.
+    """
+    try:
+        with open(path, 'rb') as handle:
+            if handle.read(len(STAGE_STORE_MAGIC)) != STAGE_STORE_MAGIC:
+                return None, None, None
+            header_length = int(np.frombuffer(handle.read(8), dtype=np.uint64)[0])
+            header = json.loads(handle.read(header_length))
+            data_offset = len(STAGE_STORE_MAGIC) + 8 + header_length
+            value_ids = _map_array(handle, np.int32, data_offset, header['id_cells'])
+            cells = _map_array(handle, np.int8, data_offset + 4 * header['id_cells'], header['cells'])
+    except (OSError, ValueError, IndexError, KeyError):
+        return None, None, None
+    return header, value_ids, cells
+
+def _open_stage_store(path):
+    versions = [(filepath, _file_version(filepath)) for filepath in _analysis_files()]
+    sources = [[os.path.basename(filepath), version] for filepath, version in versions]
+    header, value_ids, cells = _map_stage_store(path)
+    if header is None or header['sources'] != sources:
+        with _stage_store_lock, open(path + '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another thread or worker may have rebuilt it while this one waited for the lock
+            header, value_ids, cells = _map_stage_store(path)
+            if header is None or header['sources'] != sources:
+                _build_stage_store(path, versions, header, value_ids, cells)
+                header, value_ids, cells = _map_stage_store(path)
     
-    # Calculate statistics (convert to native Python types)
-    total_applications = int(len(application_history))
-    total_selected = int(sum(1 for app in application_history if app['final_status'] == 'Selected'))
-    total_reached_final = int(sum(1 for app in application_history if app['reached_final']))
-    failed_at_final = int(sum(1 for app in application_history 
-                         if app['reached_final'] and app['final_status'] != 'Selected'))
-    
-    # Count failure patterns
-    failure_patterns = {}
-    for app in application_history:
-        if app['failed_at_stage']:
-            stage = str(app['failed_at_stage'])
-            failure_patterns[stage] = int(failure_patterns.get(stage, 0) + 1)
-    
-    # Calculate average stages reached
-    avg_stages_reached = float(round(sum(app['stages_passed'] for app in application_history) / total_applications, 2)) if total_applications > 0 else 0.0
-    
-    # Convert student_info to native types
-    student_info_native = {
-        'name': str(student_info['name']),
-        'reg_no': str(student_info['reg_no']),
-        'class': str(student_info['class']) if student_info['class'] else None
+    companies = {}
+    for company in header['companies']:
+        rows, id_count, column_count = company['rows'], len(company['id_columns']), len(company['columns'])
+        companies[company['company_id']] = dict(
+            company,
+            value_ids=value_ids[company['id_offset']:company['id_offset'] + rows * id_count].reshape(rows, id_count),
+            matrix=cells[company['cell_offset']:company['cell_offset'] + rows * column_count].reshape(rows, column_count)
+        )
+    return {'values': header['values'], 'companies': companies}
+
+def get_stage_store():
+    """
+    The current cohort's stage store: {'values', 'companies': {company_id: {'filename', 'version',
+    'columns', 'flags', 'id_columns', 'matrix', 'value_ids'}}}, with the arrays mapped read-only
+    from disk. Companies are in ANALYSIS folder order.
+    """
+    path = cohort_config()['stage_store']
+    return get_cached_derived('stage_store', _analysis_files(), lambda: _open_stage_store(path))
+
+def _store_column_values(store, company, col):
+    """
+    The cells of one of a company's id columns (see _stage_store_id_columns), as parsed from the sheet.
+    """
+    values = store['values']
+    return [values[value_id] for value_id in company['value_ids'][:, company['id_columns'].index(col)].tolist()]
+
+def resolve_store_rows(store, company):
+    """
+    resolve_analysis_rows() for every row of a stored company (all '' when the sheet has no
+    student name column).
+    """
+    name_col, reg_no_col = _analysis_id_columns(company['columns'])
+    if name_col is None:
+        return [''] * company['rows']
+    return resolve_analysis_rows(
+        _store_column_values(store, company, name_col),
+        _store_column_values(store, company, reg_no_col) if reg_no_col else None
+    )
+
+# Student summary table - each student's application entry per company plus running totals.
+# When an ANALYSIS file changes only that company's entries are subtracted and re-added;
+# a roster or alias-table change rebuilds the table.
+_student_summaries = {}  # cohort -> table
+_student_summary_lock = threading.Lock()
+
+def _empty_student_totals():
+    return {
+        'total_applications': 0,
+        'total_selected': 0,
+        'total_reached_final': 0,
+        'failed_at_final': 0,
+        'stages_passed': 0,
+        'failure_patterns': {}
     }
+
+def _apply_company_entries(totals, entries, sign):
+    for reg_no, application in entries.items():
+        student = totals.setdefault(reg_no, _empty_student_totals())
+        student['total_applications'] += sign
+        student['stages_passed'] += sign * application['stages_passed']
+        if application['final_status'] == 'Selected':
+            student['total_selected'] += sign
+        if application['reached_final']:
+            student['total_reached_final'] += sign
+            if application['final_status'] != 'Selected':
+                student['failed_at_final'] += sign
+        stage = application['failed_at_stage']
+        if stage:
+            patterns = student['failure_patterns']
+            patterns[stage] = patterns.get(stage, 0) + sign
+            if patterns[stage] == 0:
+                del patterns[stage]
+
+def _company_entries(store, company_id, company):
+    """
+    Application entries of everyone who applied to one company: (entries keyed by register
+    number, entries of rows that match no roster student keyed by their normalized sheet name).
+    Returns None when the sheet has no student name column.
+    """
+    name_col, _ = _analysis_id_columns(company['columns'])
+    if name_col is None:
+        return None
+    stage_positions = _application_stage_positions(company['columns'])
+    stages = [company['columns'][position] for position in stage_positions]
+    passed = company['matrix'][:, stage_positions] == 1
+    names = _store_column_values(store, company, name_col)
+    entries = {}
+    unresolved = {}
+    for position, reg_no in enumerate(resolve_store_rows(store, company)):
+        if reg_no:
+            target, key = entries, reg_no
+        else:
+            target, key = unresolved, normalize_name(names[position]) if pd.notna(names[position]) else ''
+            if not key:
+                continue
+        # A student's first row in the sheet is the one that counts
+        if key in target:
+            continue
+        application = _company_application(stages, passed[position].tolist(), company_id, company_id)
+        target[key] = application
+    return ({key: application for key, application in entries.items() if application is not None},
+            {key: application for key, application in unresolved.items() if application is not None})
+
+@timed
+def get_student_summary_table():
+    """
+    Bring the current cohort's student summary table up to date with the ANALYSIS files and return it.
+    """
+    config = cohort_config()
+    store = get_stage_store()
+    base_signature = (_file_signature(config['students_csv']), _file_signature(config['alias_csv']))
+    
+    with _student_summary_lock:
+        table = _student_summaries.get(current_cohort())
+        if table is None or table['base_signature'] != base_signature:
+            table = {'base_signature': base_signature, 'companies': {}, 'totals': {}}
+            _student_summaries[current_cohort()] = table
+        companies = table['companies']
+        
+        for company_id in [company_id for company_id in companies if company_id not in store['companies']]:
+            _apply_company_entries(table['totals'], companies.pop(company_id)['entries'], -1)
+        
+        for company_id, stored in store['companies'].items():
+            signature = stored['version']
+            company = companies.get(company_id)
+            if company is not None and company['signature'] == signature:
+                continue
+            record_cache_access('student_summary_company', False)
+            if company is not None:
+                _apply_company_entries(table['totals'], company['entries'], -1)
+            try:
+                company_entries = _company_entries(store, company_id, stored)
+            except Exception as e:
+                print(f"Error processing {stored['filename']}: {e}")
+                company_entries = None
+            entries, unresolved = company_entries or ({}, {})
+            companies[company_id] = {'signature': signature, 'skipped': company_entries is None, 'entries': entries, 'unresolved': unresolved}
+            _apply_company_entries(table['totals'], entries, 1)
+        
+        table['order'] = list(store['companies'])
+    return table
+
+def _student_summary(student_info, table, company_name_map):
+    # One student's history from an up to date summary table
+    reg_no = normalize_reg_no(student_info['reg_no'])
+    
+    application_history = []
+    companies_not_applied = []
+    for company_id in table['order']:
+        company = table['companies'][company_id]
+        if company['skipped']:
+            continue
+        company_name = str(company_name_map.get(company_id, company_id))
+        if reg_no in company['entries']:
+            application_history.append(dict(company['entries'][reg_no], company_name=company_name))
+        else:
+            companies_not_applied.append({'company_id': str(company_id), 'company_name': company_name})
+    
+    totals = table['totals'].get(reg_no, _empty_student_totals())
+    total_applications = totals['total_applications']
+    total_selected = totals['total_selected']
+    total_reached_final = totals['total_reached_final']
+    failed_at_final = totals['failed_at_final']
     
     return {
-        'student_info': student_info_native,
+        'student_info': {
+            'name': str(student_info['name']),
+            'reg_no': str(student_info['reg_no']),
+            'class': str(student_info['class']) if student_info['class'] else None
+        },
         'application_history': application_history,
         'companies_not_applied': companies_not_applied,
         'statistics': {
@@ -1559,552 +2695,486 @@ def get_student_application_history(student_name):
             'total_selected': total_selected,
             'total_reached_final': total_reached_final,
             'failed_at_final': failed_at_final,
-            'total_companies_available': int(len(all_company_ids)),
-            'companies_not_applied_count': int(len(companies_not_applied)),
-            'avg_stages_reached': avg_stages_reached,
+            'total_companies_available': len(_analysis_files()),
+            'companies_not_applied_count': len(companies_not_applied),
+            'avg_stages_reached': float(round(totals['stages_passed'] / total_applications, 2)) if total_applications > 0 else 0.0,
             'selection_rate': float(round((total_selected / total_applications * 100), 2)) if total_applications > 0 else 0.0,
             'final_round_failure_rate': float(round((failed_at_final / total_reached_final * 100), 2)) if total_reached_final > 0 else 0.0
         },
-        'failure_patterns': {str(k): int(v) for k, v in failure_patterns.items()}
+        'failure_patterns': dict(totals['failure_patterns'])
     }
 
-# Load all company analysis data from ANALYSIS folder
-def load_all_company_analysis():
+def get_student_summary(student_name):
     """
-    Load all company analysis CSVs from the ANALYSIS folder.
-    Returns a dictionary mapping company_id to analysis data.
+    Application history and statistics for one student, read from the student summary table.
+    Returns None when the name matches no roster student.
     """
-    analysis_data = {}
+    student_info = get_student_details(student_name)
+    if not student_info:
+        return None
+    if not os.path.exists(cohort_config()['analysis_folder']):
+        return None
     
-    if not os.path.exists(ANALYSIS_FOLDER):
-        return analysis_data
+    table = get_student_summary_table()
+    company_name_map = get_company_status_index()['company_names']
+    return _student_summary(student_info, table, company_name_map)
+
+def get_student_summary_by_reg_no(reg_no):
+    """
+    Same as get_student_summary(), looked up directly by register number without name matching.
+    """
+    student_info = get_roster_lookup()['by_reg_no'].get(normalize_reg_no(reg_no))
+    if not student_info:
+        return None
+    if not os.path.exists(cohort_config()['analysis_folder']):
+        return None
     
-    # Get company name mapping from placements
-    placements = load_placements()
-    company_name_map = {}
-    if not placements.empty and 'company_id' in placements.columns:
-        for _, row in placements.iterrows():
-            company_id = str(row.get('company_id', '')).strip()
-            company_name = str(row.get('company_name', '')).strip()
-            if company_id and company_name:
-                company_name_map[company_id] = company_name
-    
-    # Load all CSV files in ANALYSIS folder
-    for filename in os.listdir(ANALYSIS_FOLDER):
-        if filename.endswith('.csv'):
-            company_id = filename.replace('.csv', '').strip()
-            filepath = os.path.join(ANALYSIS_FOLDER, filename)
-            
-            try:
-                df = pd.read_csv(filepath)
-                df.columns = df.columns.str.strip()
-                
-                # Get company name
-                company_name = company_name_map.get(company_id, company_id)
-                
-                # Identify stage columns (exclude Name and Register Number - these are identifiers, not rounds)
-                exclude_cols = ['Name of the Student', 'Register Number', 'Name', 'Reg.no', 'Reg No']
-                stage_columns = [col for col in df.columns if col not in exclude_cols]
-                
-                analysis_data[company_id] = {
-                    'company_id': company_id,
-                    'company_name': company_name,
-                    'data': df,
-                    'stages': stage_columns,
-                    'filepath': filepath
-                }
-            except Exception as e:
-                print(f"Error loading {filename}: {e}")
-                continue
+    table = get_student_summary_table()
+    company_name_map = get_company_status_index()['company_names']
+    return _student_summary(student_info, table, company_name_map)
+
+def get_student_summaries(queries):
+    """
+    Histories for many students at once. The summary table and company names are fetched once
+    and shared by every student; queries are resolved with resolve_students().
+    Returns (results, not_found) where results maps each found query to its history.
+    """
+    students = resolve_students(queries)
+    if not os.path.exists(cohort_config()['analysis_folder']):
+        return {}, [str(query) for query in queries]
     
-    return analysis_data
+    table = get_student_summary_table()
+    company_name_map = get_company_status_index()['company_names']
+    
+    results = {}
+    not_found = []
+    summaries = {}  # reg_no -> history, so repeated students are built once
+    for query, student_info in zip(queries, students):
+        query = str(query)
+        if student_info is None:
+            not_found.append(query)
+            continue
+        reg_no = normalize_reg_no(student_info['reg_no'])
+        if reg_no not in summaries:
+            summaries[reg_no] = _student_summary(student_info, table, company_name_map)
+        results[query] = summaries[reg_no]
+    return results, not_found
 
-# Get company-wise funnel analysis
-def get_company_funnel_analysis():
+# Company funnels - per company, the number of students who reached each stage, counting a
+# stage only when every earlier stage was also passed. Counts are kept per class and per
+# ANALYSIS file version, so filtering never re-reads a sheet.
+_funnel_cache = {}  # (cohort, company_id) -> (signature, funnel)
+
+def _build_company_funnel(store, company):
+    stage_positions = [position for position, flag in enumerate(company['flags']) if flag]
+    stages = [company['columns'][position] for position in stage_positions]
+    if not stages:
+        return {'stages': [], 'counts_by_class': {}}
+    
+    # Reached stage k = passed stages 0..k
+    reached = np.logical_and.accumulate(company['matrix'][:, stage_positions] == 1, axis=1)
+    roster = get_roster_lookup()['by_reg_no']
+    classes = [str(roster[reg_no]['class']) if reg_no in roster else 'Unknown' for reg_no in resolve_store_rows(store, company)]
+    
+    counts = pd.DataFrame(reached, columns=range(len(stages))).groupby(pd.Series(classes), sort=False).sum()
+    return {
+        'stages': stages,
+        'counts_by_class': {student_class: row.to_numpy(dtype=np.int64) for student_class, row in counts.iterrows()}
+    }
+
+def get_company_funnel_table():
     """
-    Analyze funnel progression for each company.
-    Shows how many students applied and how many passed each round.
+    {company_id: {'stages', 'counts_by_class'}} for the current cohort, recomputing only
+    companies whose ANALYSIS file (or the roster / alias table) changed.
     """
-    all_analysis = load_all_company_analysis()
+    config = cohort_config()
+    cohort_id = current_cohort()
+    base_signature = (_file_signature(config['students_csv']), _file_signature(config['alias_csv']))
+    store = get_stage_store()
     funnels = {}
-    
-    for company_id, company_data in all_analysis.items():
-        df = company_data['data']
-        stages = company_data['stages']
-        
-        # Count students at each stage
-        stage_counts = {}
-        for stage in stages:
-            if stage in df.columns:
-                # Count how many students passed this stage (value = 1)
-                count = df[stage].sum() if stage in df.columns else 0
-                # Get scalar value
-                if isinstance(count, (int, float)):
-                    stage_counts[stage] = int(count)
-                elif hasattr(count, 'item'):
-                    stage_counts[stage] = int(count.item())
-                else:
-                    stage_counts[stage] = 0
+    for company_id, company in store['companies'].items():
+        signature = (company['version'], base_signature)
+        cached = _funnel_cache.get((cohort_id, company_id))
+        record_cache_access('company_funnel', cached is not None and cached[0] == signature)
+        if cached is None or cached[0] != signature:
+            cached = (signature, _build_company_funnel(store, company))
+            _funnel_cache[(cohort_id, company_id)] = cached
+        funnels[company_id] = cached[1]
+    return funnels
+
+@timed
+def get_company_funnels(classes=None, company_ids=None):
+    """
+    Stage counts and stage-to-stage conversion rates per company, optionally limited to
+    students of the given classes and to the given companies.
+    """
+    company_names = get_company_status_index()['company_names']
+    results = []
+    for company_id, funnel in get_company_funnel_table().items():
+        if company_ids and company_id not in company_ids:
+            continue
+        stages = funnel['stages']
+        totals = np.zeros(len(stages), dtype=np.int64)
+        for student_class, counts in funnel['counts_by_class'].items():
+            if classes is None or student_class in classes:
+                totals += counts
+        stage_counts = {stage: int(count) for stage, count in zip(stages, totals)}
         
         # Calculate conversion rates between stages
         conversions = {}
-        stage_list = [s for s in stages if s in df.columns]
-        for i in range(len(stage_list) - 1):
-            current_stage = stage_list[i]
-            next_stage = stage_list[i + 1]
-            current_count = stage_counts.get(current_stage, 0)
-            next_count = stage_counts.get(next_stage, 0)
-            
-            if current_count > 0:
-                conversion_rate = round((next_count / current_count) * 100, 2)
-            else:
-                conversion_rate = 0
-            
-            conversions[f"{current_stage} → {next_stage}"] = {
+        for i in range(len(stages) - 1):
+            current_count = stage_counts[stages[i]]
+            next_count = stage_counts[stages[i + 1]]
+            conversions[f"{stages[i]} → {stages[i + 1]}"] = {
                 'from': current_count,
                 'to': next_count,
-                'rate': conversion_rate
+                'rate': round((next_count / current_count) * 100, 2) if current_count > 0 else 0
             }
         
-        funnels[company_id] = {
+        results.append({
             'company_id': company_id,
-            'company_name': company_data['company_name'],
-            'stages': stage_list,
+            'company_name': str(company_names.get(company_id, company_id)),
+            'stages': stages,
             'stage_counts': stage_counts,
             'conversions': conversions,
-            'total_applied': stage_counts.get(stage_list[0] if stage_list else 'Applied', 0),
-            'total_selected': stage_counts.get('Selected', stage_counts.get(stage_list[-1] if stage_list else 'Selected', 0))
-        }
-    
-    return funnels
+            'total_applied': stage_counts[stages[0]] if stages else 0,
+            'total_selected': stage_counts.get('Selected', stage_counts[stages[-1]] if stages else 0)
+        })
+    return results
+
+# Get company-wise funnel analysis
+def get_company_funnel_analysis():
+    """
+    Analyze funnel progression for each company.
+    Shows how many students applied and how many reached each round.
+    """
+    return {funnel['company_id']: funnel for funnel in get_company_funnels()}
 
 # Get comprehensive placement statistics combining ANALYSIS folder and Master_Placement_Fila.csv
-def get_comprehensive_placement_statistics():
+#
+# Logic:
+# - One student can apply to multiple companies
+# - Once placed, student is "blocked" (excluded from active application counts)
+# - Count unique students, not total applications
+# - Track students who apply most vs least
+#
+# The statistics are served in sections (overall, funnel, round_pass_rates, company_stats,
+# class_stats, student_activity). All of them are derived from one vectorised pass over the
+# ANALYSIS sheets; each section is cached on its own with an ETag of its content.
+PLACEMENT_STATISTICS_SECTIONS = ['overall', 'funnel', 'round_pass_rates', 'company_stats', 'class_stats', 'student_activity']
+
+def _placement_statistics_sources():
+    config = cohort_config()
+    return [config['students_csv'], config['placement_csv']] + _analysis_files()
+
+@timed
+def build_placement_statistics_facts():
     """
-    Combine data from ANALYSIS folder (round-wise progression) and Master_Placement_Fila.csv (placed students)
-    to create comprehensive placement statistics.
-    
-    Logic:
-    - One student can apply to multiple companies
-    - Once placed, student is "blocked" (excluded from active application counts)
-    - Count unique students, not total applications
-    - Track students who apply most vs least
+    Everything the statistics sections are computed from: the roster, the students named on
+    placement records and, per ANALYSIS sheet, every application with how far it got.
     """
     students_df = load_students()
     placements = load_placements()
-    all_analysis = load_all_company_analysis()
     
     # Get all placed students from Master_Placement_Fila.csv (these are "blocked")
     # Count all students from student_names regardless of status
-    placed_students = set()
     placed_students_details = {}
-    for _, row in placements.iterrows():
-        if pd.notna(row.get('student_names')) and str(row['student_names']).strip():
-            names = [n.strip().upper() for n in str(row['student_names']).split(',') if n.strip()]
-            for name in names:
-                placed_students.add(name)
-                if name not in placed_students_details:
+    for record in with_object_columns(placements[['company_id', 'company_name', 'role', 'package', 'status', 'student_names']]).to_dict('records'):
+        if pd.notna(record['student_names']) and str(record['student_names']).strip():
+            for name in str(record['student_names']).split(','):
+                name = name.strip().upper()
+                if name and name not in placed_students_details:
                     placed_students_details[name] = {
-                        'company_id': str(row.get('company_id', '')),
-                        'company_name': str(row.get('company_name', '')),
-                        'role': str(row.get('role', '')),
-                        'package': str(row.get('package', '')),
-                        'status': str(row.get('status', ''))
+                        'company_id': str(record['company_id']),
+                        'company_name': str(record['company_name']),
+                        'role': str(record['role']),
+                        'package': str(record['package']),
+                        'status': str(record['status'])
                     }
     
-    # Build student lookup from FULL NAME LIST
+    # Build student lookup from FULL NAME LIST (a repeated name keeps its last row)
     student_lookup = {}
-    for _, row in students_df.iterrows():
-        name_upper = str(row['Name']).strip().upper()
+    roster_names = []
+    for name, reg_no, student_class in zip(students_df['Name'], students_df['Reg.no'], students_df['Class']):
+        name_upper = str(name).strip().upper()
+        roster_names.append(name_upper)
         student_lookup[name_upper] = {
-            'name': row['Name'],
-            'reg_no': str(row['Reg.no']),
-            'class': str(row['Class']) if pd.notna(row['Class']) else 'Unknown'
+            'name': name,
+            'reg_no': str(reg_no),
+            'class': str(student_class) if pd.notna(student_class) else 'Unknown'
         }
     
-    # Track unique students (not applications)
-    students_applied = set()  # Unique students who applied (at least once)
-    students_application_count = {}  # student -> number of companies applied
-    students_active_applications = {}  # student -> list of companies they applied to (only if not placed)
-    students_never_applied = set()  # Students who never applied
-    students_round_participation = {}  # student -> {stage: count} - how many times they passed each round
-    
-    # Initialize all students as never applied
-    for _, row in students_df.iterrows():
-        name_upper = str(row['Name']).strip().upper()
-        students_never_applied.add(name_upper)
-    
-    # Aggregate statistics from all companies
-    overall_funnel = {}  # Stage -> {unique_students_applied: set, unique_students_passed: set}
-    company_stats = {}  # company_id -> stats
-    round_pass_rates = {}  # Round name -> {passed: set of students, total: set of students}
-    class_stats = {
-        'MCA A': {'unique_applied': set(), 'placed': set(), 'total_applications': 0},
-        'MCA B': {'unique_applied': set(), 'placed': set(), 'total_applications': 0},
-        'MSc AIML': {'unique_applied': set(), 'placed': set(), 'total_applications': 0}
-    }
-    
-    # Process each company's analysis
-    for company_id, company_data in all_analysis.items():
-        df = company_data['data']
-        company_name = company_data['company_name']
-        stages = company_data['stages']
-        
-        if not stages:
-            continue
-        
-        # Find name column
-        name_col = None
-        for col in df.columns:
-            if 'name' in col.lower() and 'student' in col.lower():
-                name_col = col
-                break
-        
-        if name_col is None:
+    # Applications: a student applied when the first stage is 1. depth is the number of
+    # stages passed in a row from the first (Applied counts as passed), so the application
+    # reached stage i when depth >= i and passed it when depth > i.
+    store = get_stage_store()
+    company_names = get_company_status_index()['company_names']
+    # Names are compared as written in the sheet, upper-cased
+    store_names = np.array([str(value).strip().upper() for value in store['values']], dtype=object)
+    named = (store_names != '') & (store_names != 'NAN')
+    companies = []
+    all_stages = {}
+    for company_id, company in store['companies'].items():
+        stage_positions = [position for position, col in enumerate(company['columns']) if col not in ANALYSIS_ID_COLUMNS]
+        stages = [company['columns'][position] for position in stage_positions]
+        all_stages.update(dict.fromkeys(stages))
+        # Statistics take the first student name column
+        name_col = next((col for col in company['columns'] if 'name' in col.lower() and 'student' in col.lower()), None)
+        if not stages or name_col is None:
             continue
         
-        # Initialize company stats
-        if company_id not in company_stats:
-            company_stats[company_id] = {
-                'company_id': company_id,
-                'company_name': company_name,
-                'stages': stages,
-                'funnel': {},
-                'total_applied': 0,
-                'total_placed': 0,
-                'placed_students': []
-            }
-        
-        # Process each student in this company
-        for _, row in df.iterrows():
-            student_name = str(row[name_col]).strip().upper()
-            if not student_name or student_name == 'NAN':
-                continue
-            
-            # Get student class
-            student_class = 'Unknown'
-            if student_name in student_lookup:
-                student_class = student_lookup[student_name]['class']
-            
-            # Check if student applied (first stage = 1)
-            first_stage = stages[0] if stages else None
-            if first_stage and first_stage in row.index:
-                value = row[first_stage]
-                if pd.isna(value):
-                    applied = False
-                elif isinstance(value, (int, float)):
-                    applied = int(value) == 1
-                else:
-                    applied = str(value).strip() == '1'
-            else:
-                applied = False
-            
-            if not applied:
-                continue
-            
-            # Check if student is already placed (blocked)
-            is_placed = student_name in placed_students
-            
-            # Track unique student applied (only count once per student, not per application)
-            students_applied.add(student_name)
-            students_never_applied.discard(student_name)  # Remove from never applied
-            
-            # Track application count per student
-            if student_name not in students_application_count:
-                students_application_count[student_name] = 0
-            students_application_count[student_name] += 1
-            
-            # Track active applications (only if not placed)
-            if not is_placed:
-                if student_name not in students_active_applications:
-                    students_active_applications[student_name] = []
-                students_active_applications[student_name].append(company_id)
-            
-            # Update class stats - track unique students
-            if student_class in class_stats:
-                class_stats[student_class]['unique_applied'].add(student_name)
-                class_stats[student_class]['total_applications'] += 1
-                if is_placed:
-                    class_stats[student_class]['placed'].add(student_name)
-            
-            # Track progression through stages (count unique students, not applications)
-            # Proper funnel logic: each stage only counts students who passed all previous stages
-            student_key = f"{student_name}_{company_id}"  # Unique per company application
-            
-            # Initialize all stages first
-            for stage in stages:
-                if stage not in overall_funnel:
-                    overall_funnel[stage] = {'reached': set(), 'passed': set()}
-                if stage not in company_stats[company_id]['funnel']:
-                    company_stats[company_id]['funnel'][stage] = {'reached': set(), 'passed': set()}
-            
-            # Track which stages student passed
-            student_passed_stages = []
-            
-            for idx, stage in enumerate(stages):
-                # First stage: Applied - all students who applied reach this stage
-                if idx == 0:
-                    overall_funnel[stage]['reached'].add(student_key)
-                    overall_funnel[stage]['passed'].add(student_key)  # Applied = passed first stage
-                    company_stats[company_id]['funnel'][stage]['reached'].add(student_name)
-                    company_stats[company_id]['funnel'][stage]['passed'].add(student_name)
-                    company_stats[company_id]['total_applied'] = len(company_stats[company_id]['funnel'][stage]['reached'])
-                    student_passed_stages.append(stage)
-                    continue  # Move to next stage
-                
-                # For subsequent stages: only check if student passed previous stage
-                previous_stage = stages[idx - 1]
-                if previous_stage not in student_passed_stages:
-                    # Student didn't pass previous stage, so they can't reach this stage
-                    break
-                
-                # Student reached this stage (they passed all previous stages)
-                overall_funnel[stage]['reached'].add(student_key)
-                company_stats[company_id]['funnel'][stage]['reached'].add(student_name)
-                
-                # Check if passed this stage
-                if stage in row.index:
-                    value = row[stage]
-                    if pd.isna(value):
-                        passed = False
-                    elif isinstance(value, (int, float)):
-                        passed = int(value) == 1
-                    else:
-                        passed = str(value).strip() == '1'
-                    
-                    if passed:
-                        overall_funnel[stage]['passed'].add(student_key)
-                        company_stats[company_id]['funnel'][stage]['passed'].add(student_name)
-                        student_passed_stages.append(stage)
-                        
-                        # Track student's round participation
-                        if student_name not in students_round_participation:
-                            students_round_participation[student_name] = {}
-                        if stage not in students_round_participation[student_name]:
-                            students_round_participation[student_name][stage] = 0
-                        students_round_participation[student_name][stage] += 1
-                    else:
-                        # Student reached this stage but didn't pass - they stop here
-                        break
-            
-            # Update round pass rates correctly:
-            # Track which stages the student reached and passed
-            student_key = f"{student_name}_{company_id}"
-            
-            for idx, stage in enumerate(stages):
-                if stage not in round_pass_rates:
-                    round_pass_rates[stage] = {'passed': set(), 'total': set()}
-                
-                # First stage: all who applied reached it
-                if idx == 0:
-                    round_pass_rates[stage]['total'].add(student_key)
-                    if stage in overall_funnel and student_key in overall_funnel[stage].get('passed', set()):
-                        round_pass_rates[stage]['passed'].add(student_key)
-                else:
-                    # Subsequent stages: only count if student reached this stage
-                    if stage in overall_funnel and student_key in overall_funnel[stage].get('reached', set()):
-                        round_pass_rates[stage]['total'].add(student_key)
-                        if student_key in overall_funnel[stage].get('passed', set()):
-                            round_pass_rates[stage]['passed'].add(student_key)
-            
-            # Check if student is placed in this company
-            if student_name in placed_students:
-                placed_info = placed_students_details.get(student_name, {})
-                if str(placed_info.get('company_id', '')) == str(company_id):
-                    # Count unique placed students
-                    if student_name not in [s['name'].upper() for s in company_stats[company_id]['placed_students']]:
-                        company_stats[company_id]['placed_students'].append({
-                            'name': student_lookup.get(student_name, {}).get('name', student_name),
-                            'reg_no': student_lookup.get(student_name, {}).get('reg_no', ''),
-                            'role': placed_info.get('role', ''),
-                            'package': placed_info.get('package', '')
-                        })
-                    company_stats[company_id]['total_placed'] = len(company_stats[company_id]['placed_students'])
-    
-    # Calculate overall statistics (unique students)
-    total_students = len(students_df)
-    total_applied = len(students_applied)  # Unique students who applied
-    total_placed = len(placed_students)  # Unique students placed
-    # total_never_applied will be calculated later after filtering out placed students
-    total_active_applicants = len(students_active_applications)  # Students still applying (not placed)
-    
-    placement_rate = round((total_placed / total_students * 100), 2) if total_students > 0 else 0
-    application_rate = round((total_applied / total_students * 100), 2) if total_students > 0 else 0
-    selection_rate = round((total_placed / total_applied * 100), 2) if total_applied > 0 else 0
-    
-    # Calculate average applications per student (only for those who applied)
-    avg_applications = round(sum(students_application_count.values()) / len(students_application_count), 2) if students_application_count else 0
-    
-    # Find most active and least active students (exclude placed students)
-    # Filter out placed students from application count
-    active_students_only = {name: count for name, count in students_application_count.items() 
-                           if name not in placed_students}
-    
-    most_active_students = sorted(active_students_only.items(), key=lambda x: x[1], reverse=True)[:20]
-    least_active_students = sorted(active_students_only.items(), key=lambda x: x[1])[:20]
-    
-    # Students who never applied (exclude placed students - they shouldn't be in this list anyway)
-    never_applied_list = []
-    for student_name in students_never_applied:
-        # Exclude placed students from never applied list
-        if student_name not in placed_students and student_name in student_lookup:
-            never_applied_list.append({
-                'name': student_lookup[student_name]['name'],
-                'reg_no': student_lookup[student_name]['reg_no'],
-                'class': student_lookup[student_name]['class']
-            })
-    
-    # Update total_never_applied count to exclude placed students
-    total_never_applied = len([s for s in students_never_applied if s not in placed_students])
-    
-    # Build funnel data for visualization - collect all unique stages from all companies
-    all_stages_ordered = []
-    for company_id, company_data in all_analysis.items():
-        stages = company_data.get('stages', [])
-        for stage in stages:
-            if stage not in all_stages_ordered:
-                all_stages_ordered.append(stage)
-    
-    # Build funnel data for visualization (proper funnel progression)
-    # Funnel shows: how many students reached each stage (passed all previous stages)
-    funnel_data = []
-    if overall_funnel and all_stages_ordered:
-        for stage in all_stages_ordered:
-            if stage in overall_funnel:
-                reached_count = len(overall_funnel[stage]['reached'])  # Students who reached this stage
-                passed_count = len(overall_funnel[stage]['passed'])  # Students who passed this stage
-                
-                # For funnel display: show how many reached each stage
-                # "Applied" shows total who applied
-                # Subsequent stages show how many passed all previous stages
-                funnel_data.append({
-                    'stage': stage,
-                    'reached': int(reached_count),  # Students who reached this stage
-                    'passed': int(passed_count),  # Students who passed this stage
-                    'pass_rate': round((passed_count / reached_count * 100), 2) if reached_count > 0 else 0
-                })
-    
-    # Calculate round pass rates (unique students)
-    round_pass_rate_data = []
-    for stage, rates in round_pass_rates.items():
-        passed_count = len(rates['passed'])
-        total_count = len(rates['total'])
-        round_pass_rate_data.append({
-            'round': stage,
-            'passed': int(passed_count),
-            'total': int(total_count),
-            'pass_rate': round((passed_count / total_count * 100), 2) if total_count > 0 else 0
+        name_ids = np.asarray(company['value_ids'][:, company['id_columns'].index(name_col)])
+        passed = np.asarray(company['matrix'][:, stage_positions]) == 1
+        applied = passed[:, 0] & named[name_ids]
+        depth = 1 + np.cumprod(passed[applied, 1:], axis=1).sum(axis=1)
+        companies.append({
+            'company_id': company_id,
+            'company_name': company_names.get(company_id, company_id),
+            'stages': stages,
+            'names': store_names[name_ids[applied]].tolist(),
+            'depth': depth.astype(int).tolist()
         })
     
-    # Convert company stats to list (count unique students)
+    return {
+        'total_students': len(students_df),
+        'roster_names': roster_names,
+        'student_lookup': student_lookup,
+        'placed_students': placed_students_details,
+        'all_stages': list(all_stages),
+        'companies': companies
+    }
+
+# The section endpoints are requested together; one thread builds the facts, the rest wait for it
+_placement_statistics_facts_lock = threading.Lock()
+
+def get_placement_statistics_facts():
+    with _placement_statistics_facts_lock:
+        return get_cached_derived('placement_statistics_facts', _placement_statistics_sources(), build_placement_statistics_facts)
+
+def _application_counts(facts):
+    # student -> number of companies applied to, in order of first application
+    counts = {}
+    for company in facts['companies']:
+        for name in company['names']:
+            counts[name] = counts.get(name, 0) + 1
+    return counts
+
+def _stage_reach_counts(facts):
+    """
+    stage -> [reached, passed] over unique (student, company) applications, with stages in
+    the order they are first met in companies that have applications.
+    """
+    stage_counts = {}
+    for company in facts['companies']:
+        if not company['names']:
+            continue
+        # A student listed twice in a sheet counts once, with their furthest progress
+        depth = {}
+        for name, reached in zip(company['names'], company['depth']):
+            depth[name] = max(depth.get(name, 0), reached)
+        depths = np.array(list(depth.values()))
+        for idx, stage in enumerate(company['stages']):
+            counts = stage_counts.setdefault(stage, [0, 0])
+            counts[0] += len(depths) if idx == 0 else int((depths >= idx).sum())
+            counts[1] += len(depths) if idx == 0 else int((depths > idx).sum())
+    return stage_counts
+
+def _student_entry(facts, name, count):
+    student = facts['student_lookup'].get(name, {})
+    return {
+        'name': student.get('name', name),
+        'reg_no': student.get('reg_no', ''),
+        'class': student.get('class', 'Unknown'),
+        'applications': count
+    }
+
+def _overall_section(facts):
+    total_students = facts['total_students']
+    application_counts = _application_counts(facts)
+    total_applied = len(application_counts)  # Unique students who applied
+    total_placed = len(facts['placed_students'])  # Unique students placed
+    return {
+        'total_students': int(total_students),
+        'total_applied': int(total_applied),
+        'total_placed': int(total_placed),
+        'placement_rate': round((total_placed / total_students * 100), 2) if total_students > 0 else 0,
+        'application_rate': round((total_applied / total_students * 100), 2) if total_students > 0 else 0,
+        'selection_rate': round((total_placed / total_applied * 100), 2) if total_applied > 0 else 0,
+        # Average applications per student (only for those who applied)
+        'avg_applications_per_student': round(sum(application_counts.values()) / len(application_counts), 2) if application_counts else 0
+    }
+
+def _funnel_section(facts):
+    # Funnel shows how many students reached each stage (passed all previous stages)
+    stage_counts = _stage_reach_counts(facts)
+    return [
+        {
+            'stage': stage,
+            'reached': int(stage_counts[stage][0]),
+            'passed': int(stage_counts[stage][1]),
+            'pass_rate': round((stage_counts[stage][1] / stage_counts[stage][0] * 100), 2) if stage_counts[stage][0] > 0 else 0
+        }
+        for stage in facts['all_stages'] if stage in stage_counts
+    ]
+
+def _round_pass_rates_section(facts):
+    return [
+        {
+            'round': stage,
+            'passed': int(passed),
+            'total': int(reached),
+            'pass_rate': round((passed / reached * 100), 2) if reached > 0 else 0
+        }
+        for stage, (reached, passed) in _stage_reach_counts(facts).items()
+    ]
+
+def _company_stats_section(facts):
+    placed = facts['placed_students']
     company_stats_list = []
-    for company_id, stats in company_stats.items():
-        # Count unique students from funnel
-        unique_applied = 0
-        if stats['funnel']:
-            first_stage = stats['stages'][0] if stats['stages'] else None
-            if first_stage and first_stage in stats['funnel']:
-                unique_applied = len(stats['funnel'][first_stage].get('reached', set()))
-        
+    for company in facts['companies']:
+        # Unique placed students of this company who also applied through its sheet
+        placed_students = {}
+        for name in company['names']:
+            if name in placed and name not in placed_students and placed[name]['company_id'] == str(company['company_id']):
+                student = facts['student_lookup'].get(name, {})
+                placed_students[name] = {
+                    'name': student.get('name', name),
+                    'reg_no': student.get('reg_no', ''),
+                    'role': placed[name]['role'],
+                    'package': placed[name]['package']
+                }
+        unique_applied = len(set(company['names']))
         company_stats_list.append({
-            'company_id': company_id,
-            'company_name': stats['company_name'],
+            'company_id': company['company_id'],
+            'company_name': company['company_name'],
             'total_applied': int(unique_applied),
-            'total_placed': int(stats['total_placed']),
-            'placement_rate': round((stats['total_placed'] / unique_applied * 100), 2) if unique_applied > 0 else 0,
-            'placed_students': stats['placed_students']
+            'total_placed': len(placed_students),
+            'placement_rate': round((len(placed_students) / unique_applied * 100), 2) if unique_applied > 0 else 0,
+            'placed_students': list(placed_students.values())
         })
     
     # Sort companies by total applied
     company_stats_list.sort(key=lambda x: x['total_applied'], reverse=True)
-    
+    return company_stats_list
+
+def _class_stats_section(facts):
+    class_stats = {student_class: {'unique_applied': set(), 'placed': set(), 'total_applications': 0} for student_class in cohort_class_names()}
+    for company in facts['companies']:
+        for name in company['names']:
+            student_class = facts['student_lookup'][name]['class'] if name in facts['student_lookup'] else 'Unknown'
+            if student_class in class_stats:
+                class_stats[student_class]['unique_applied'].add(name)
+                class_stats[student_class]['total_applications'] += 1
+                if name in facts['placed_students']:
+                    class_stats[student_class]['placed'].add(name)
     return {
-        'overall': {
-            'total_students': int(total_students),
-            'total_applied': int(total_applied),
-            'total_placed': int(total_placed),
-            'placement_rate': placement_rate,
-            'application_rate': application_rate,
-            'selection_rate': selection_rate,
-            'avg_applications_per_student': avg_applications
-        },
-        'funnel': funnel_data,
-        'round_pass_rates': round_pass_rate_data,
-        'company_stats': company_stats_list,
-        'class_stats': {
-            'MCA A': {
-                'applied': int(len(class_stats['MCA A']['unique_applied'])),
-                'placed': int(len(class_stats['MCA A']['placed'])),
-                'applications': int(class_stats['MCA A']['total_applications']),
-                'placement_rate': round((len(class_stats['MCA A']['placed']) / len(class_stats['MCA A']['unique_applied']) * 100), 2) if len(class_stats['MCA A']['unique_applied']) > 0 else 0
-            },
-            'MCA B': {
-                'applied': int(len(class_stats['MCA B']['unique_applied'])),
-                'placed': int(len(class_stats['MCA B']['placed'])),
-                'applications': int(class_stats['MCA B']['total_applications']),
-                'placement_rate': round((len(class_stats['MCA B']['placed']) / len(class_stats['MCA B']['unique_applied']) * 100), 2) if len(class_stats['MCA B']['unique_applied']) > 0 else 0
-            },
-            'MSc AIML': {
-                'applied': int(len(class_stats['MSc AIML']['unique_applied'])),
-                'placed': int(len(class_stats['MSc AIML']['placed'])),
-                'applications': int(class_stats['MSc AIML']['total_applications']),
-                'placement_rate': round((len(class_stats['MSc AIML']['placed']) / len(class_stats['MSc AIML']['unique_applied']) * 100), 2) if len(class_stats['MSc AIML']['unique_applied']) > 0 else 0
-            }
-        },
-        'student_activity': {
-            'total_never_applied': int(total_never_applied),
-            'total_active_applicants': int(total_active_applicants),
-            'most_active_students': [
-                {
-                    'name': student_lookup.get(name, {}).get('name', name),
-                    'reg_no': student_lookup.get(name, {}).get('reg_no', ''),
-                    'class': student_lookup.get(name, {}).get('class', 'Unknown'),
-                    'applications': count
-                }
-                for name, count in most_active_students
-            ],
-            'least_active_students': [
-                {
-                    'name': student_lookup.get(name, {}).get('name', name),
-                    'reg_no': student_lookup.get(name, {}).get('reg_no', ''),
-                    'class': student_lookup.get(name, {}).get('class', 'Unknown'),
-                    'applications': count
-                }
-                for name, count in least_active_students
-            ],
-            'never_applied_students': never_applied_list[:50]  # Limit to 50 for display
+        student_class: {
+            'applied': int(len(stats['unique_applied'])),
+            'placed': int(len(stats['placed'])),
+            'applications': int(stats['total_applications']),
+            'placement_rate': round((len(stats['placed']) / len(stats['unique_applied']) * 100), 2) if len(stats['unique_applied']) > 0 else 0
+        }
+        for student_class, stats in class_stats.items()
+    }
+
+def _student_activity_section(facts):
+    placed = facts['placed_students']
+    application_counts = _application_counts(facts)
+    
+    # Most and least active students exclude placed students
+    active_students_only = {name: count for name, count in application_counts.items() if name not in placed}
+    most_active_students = sorted(active_students_only.items(), key=lambda x: x[1], reverse=True)[:20]
+    least_active_students = sorted(active_students_only.items(), key=lambda x: x[1])[:20]
+    
+    # Students who never applied, excluding placed students (listed in set order, as before)
+    students_never_applied = set(facts['roster_names'])
+    for name in application_counts:
+        students_never_applied.discard(name)
+    never_applied_list = [
+        {
+            'name': facts['student_lookup'][name]['name'],
+            'reg_no': facts['student_lookup'][name]['reg_no'],
+            'class': facts['student_lookup'][name]['class']
         }
+        for name in students_never_applied if name not in placed and name in facts['student_lookup']
+    ]
+    
+    return {
+        'total_never_applied': len([name for name in students_never_applied if name not in placed]),
+        'total_active_applicants': len(active_students_only),
+        'most_active_students': [_student_entry(facts, name, count) for name, count in most_active_students],
+        'least_active_students': [_student_entry(facts, name, count) for name, count in least_active_students],
+        'never_applied_students': never_applied_list[:50]  # Limit to 50 for display
     }
 
+_placement_statistics_builders = {
+    'overall': _overall_section,
+    'funnel': _funnel_section,
+    'round_pass_rates': _round_pass_rates_section,
+    'company_stats': _company_stats_section,
+    'class_stats': _class_stats_section,
+    'student_activity': _student_activity_section
+}
+
+def get_placement_statistics_section(section):
+    """
+    One statistics section with its ETag, as {'data', 'etag'}; cached until a source file changes.
+    """
+    def build():
+        data = _placement_statistics_builders[section](get_placement_statistics_facts())
+        digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+        return {'data': data, 'etag': f'{section}-{digest[:20]}'}
+    
+    return get_cached_derived(f'placement_statistics:{section}', _placement_statistics_sources(), build)
+
+@timed
+def get_comprehensive_placement_statistics():
+    """
+    Combine data from ANALYSIS folder (round-wise progression) and Master_Placement_Fila.csv (placed students)
+    to create comprehensive placement statistics - every section in one dictionary.
+    """
+    return {section: get_placement_statistics_section(section)['data'] for section in PLACEMENT_STATISTICS_SECTIONS}
+
+def _passed_matrix(df, columns):
+    # Rows x stages boolean matrix of "value is 1" (missing values count as not passed)
+    matrix = np.zeros((len(df), len(columns)), dtype=bool)
+    for position, col in enumerate(columns):
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            matrix[:, position] = np.trunc(values.fillna(0).to_numpy(dtype=float)) == 1
+        else:
+            matrix[:, position] = [
+                (not pd.isna(value) and int(value) == 1) if isinstance(value, (int, float)) else str(value).strip() == '1'
+                for value in values
+            ]
+    return matrix
+
 # Get student-wise performance analysis
+@timed
 def get_student_performance_analysis():
     """
     Analyze each student's performance across all companies.
     Shows how far each student progressed in each company they applied to.
     """
-    all_analysis = load_all_company_analysis()
-    students_df = load_students()
+    if not os.path.exists(cohort_config()['analysis_folder']):
+        return {}
+    store = get_stage_store()
+    company_names = get_company_status_index()['company_names']
     
     # Create student lookup
-    student_lookup = {}
-    for _, row in students_df.iterrows():
-        name_upper = str(row['Name']).strip().upper()
-        student_lookup[name_upper] = {
-            'name': row['Name'],
-            'reg_no': row['Reg.no'],
-            'class': row['Class']
-        }
+    student_lookup = get_roster_lookup()['by_reg_no']
     
     student_performance = {}
     
     # Process each company's data
-    for company_id, company_data in all_analysis.items():
-        df = company_data['data']
-        stages = company_data['stages']
+    for company_id, company in store['companies'].items():
+        columns = company['columns']
+        stages = [col for col in columns if col not in ANALYSIS_ID_COLUMNS]
+        company_name = company_names.get(company_id, company_id)
         
         # Find name column
         name_col = None
-        for col in df.columns:
+        for col in columns:
             if 'name' in col.lower() and 'student' in col.lower():
                 name_col = col
                 break
@@ -2112,26 +3182,33 @@ def get_student_performance_analysis():
         if name_col is None:
             continue
         
+        # Get progression through stages (exclude Register Number - it's an identifier, not a round)
+        exclude_cols = [name_col, 'Register Number', 'Name', 'Reg.no', 'Reg No']
+        stage_positions = [position for position, col in enumerate(columns) if col not in exclude_cols]
+        stage_columns = [columns[position] for position in stage_positions]
+        passed = np.asarray(company['matrix'][:, stage_positions]) == 1
+        
+        # Applied = the value of the last "Applied" (or first) stage column
+        applied_columns = [idx for idx, stage in enumerate(stage_columns) if 'Applied' in stage or (stages and stage == stages[0])]
+        applied = passed[:, applied_columns[-1]] if applied_columns else np.zeros(company['rows'], dtype=bool)
+        
+        # Last passed stage per row (-1 when nothing was passed)
+        any_passed = passed.any(axis=1)
+        last_index = np.where(any_passed, passed.shape[1] - 1 - np.argmax(passed[:, ::-1], axis=1), -1) if stage_columns else np.full(company['rows'], -1)
+        stages_passed_counts = passed.sum(axis=1)
+        
         # Process each student
-        for _, row in df.iterrows():
-            student_name = str(row[name_col]).strip()
-            student_name_upper = student_name.upper()
-            
+        names = _store_column_values(store, company, name_col)
+        row_reg_nos = _store_column_values(store, company, 'Register Number') if 'Register Number' in columns else ['N/A'] * company['rows']
+        resolved = resolve_analysis_rows(names, row_reg_nos if 'Register Number' in columns else None)
+        for position in range(company['rows']):
             # Find matching student in lookup
-            matched_student = None
-            for lookup_name, lookup_data in student_lookup.items():
-                if lookup_name == student_name_upper:
-                    matched_student = lookup_data
-                    break
-                # Try fuzzy matching
-                if student_name_upper in lookup_name or lookup_name in student_name_upper:
-                    matched_student = lookup_data
-                    break
+            matched_student = student_lookup.get(resolved[position])
             
             if not matched_student:
                 matched_student = {
-                    'name': student_name,
-                    'reg_no': row.get('Register Number', 'N/A'),
+                    'name': str(names[position]).strip(),
+                    'reg_no': row_reg_nos[position],
                     'class': 'Unknown'
                 }
             
@@ -2146,47 +3223,18 @@ def get_student_performance_analysis():
                     'companies': []
                 }
             
-            # Get progression through stages (exclude Register Number - it's an identifier, not a round)
-            exclude_cols = [name_col, 'Register Number', 'Name', 'Reg.no', 'Reg No']
-            stage_columns = [col for col in df.columns if col not in exclude_cols]
-            
-            progression = []
-            last_passed_stage = None
-            reached_stage_index = -1
-            applied = False
-            
-            for idx, stage in enumerate(stage_columns):
-                if stage in df.columns:
-                    value = row.get(stage, 0)
-                    # Convert to int if possible
-                    if isinstance(value, (int, float)):
-                        passed = int(value) == 1
-                    else:
-                        passed = str(value).strip() == '1'
-                    
-                    # Track if student applied
-                    if 'Applied' in stage or stage == stages[0]:
-                        applied = passed
-                    
-                    if passed:
-                        last_passed_stage = stage
-                        reached_stage_index = idx
-                        progression.append({
-                            'stage': stage,
-                            'passed': True,
-                            'index': idx
-                        })
-                    else:
-                        progression.append({
-                            'stage': stage,
-                            'passed': False,
-                            'index': idx
-                        })
-            
             # Only add if student actually applied
-            if not applied:
+            if not applied[position]:
                 continue
             
+            row_passed = passed[position]
+            progression = [
+                {'stage': stage, 'passed': bool(row_passed[idx]), 'index': idx}
+                for idx, stage in enumerate(stage_columns)
+            ]
+            reached_stage_index = int(last_index[position])
+            last_passed_stage = stage_columns[reached_stage_index] if reached_stage_index >= 0 else None
+            
             # Determine final status
             if last_passed_stage == 'Selected' or (stages and last_passed_stage == stages[-1] and reached_stage_index == len(stages) - 1):
                 status = 'Selected'
@@ -2195,16 +3243,13 @@ def get_student_performance_analysis():
             else:
                 status = 'Applied Only'
             
-            # Count how many stages were actually passed
-            stages_passed_count = sum(1 for p in progression if p.get('passed', False))
-            
             student_performance[student_key]['companies'].append({
                 'company_id': company_id,
-                'company_name': company_data['company_name'],
+                'company_name': company_name,
                 'progression': progression,
                 'last_stage': last_passed_stage,
                 'status': status,
-                'stages_passed': stages_passed_count,
+                'stages_passed': int(stages_passed_counts[position]),
                 'total_stages': len(stages)
             })
     
@@ -2218,6 +3263,317 @@ def get_student_performance_analysis():
     
     return student_performance
 
+def get_student_performance_table():
+    """
+    Whole-cohort performance table, cached until an ANALYSIS file, the roster, the alias
+    table or the placement file (company names) changes.
+    """
+    config = cohort_config()
+    return get_cached_derived(
+        'student_performance',
+        [config['students_csv'], config['placement_csv'], config['alias_csv']] + _analysis_files(),
+        get_student_performance_analysis
+    )
+
+def build_student_performance_view():
+    performance = sorted(
+        get_student_performance_table().values(),
+        key=lambda student: (-student['total_selected'], -student['avg_stages_reached'], str(student['name']))
+    )
+    total_applications = sum(student['total_applications'] for student in performance)
+    return {
+        'student_performance': performance,
+        'total_students': len(performance),
+        'students_with_selections': sum(1 for student in performance if student['total_selected'] > 0),
+        'total_applications': total_applications,
+        'avg_applications': round(total_applications / len(performance), 2) if performance else 0
+    }
+
+# Aggregate cube - student counts by metric x class x company x stage x campus_type x placement_origin,
+# built once per version of the cohort's files and sliced through /api/cube
+CUBE_DIMENSIONS = ['class', 'company_id', 'company_name', 'stage', 'campus_type', 'placement_origin']
+CUBE_METRICS = ['applied', 'passed', 'placed']
+
+def _company_attributes(placements):
+    attributes = {}
+    if placements.empty or 'company_id' not in placements.columns:
+        return attributes
+    for company_id, group in placements.groupby(normalized_text(placements['company_id']), observed=True, sort=False):
+        # Canonical spellings, so "on campus" and "On Campus" share a cube cell
+        attributes[company_id] = {
+            'campus_type': _first_non_empty(group['campus_norm']),
+            'placement_origin': _first_non_empty(group['origin_norm'])
+        }
+    return attributes
+
+@timed
+def build_placement_cube():
+    """
+    Count students per (metric, class, company, stage, campus_type, placement_origin):
+    applied - applied to the company (ANALYSIS sheet), passed - cleared that stage,
+    placed - named on a Completed placement record. Students not on the roster are
+    counted under the 'Unknown' class.
+    """
+    summary = get_student_summary_table()
+    roster = get_roster_lookup()['by_reg_no']
+    placements = load_placements()
+    company_names = get_company_status_index()['company_names']
+    attributes = _company_attributes(placements)
+    counts = {}
+    
+    def add(metric, student_class, company_id, campus_type, placement_origin, stage='', stage_index=-1):
+        key = (metric, student_class, company_id, stage, stage_index, campus_type or 'Unknown', placement_origin or 'Unknown')
+        counts[key] = counts.get(key, 0) + 1
+    
+    for company_id in summary['order']:
+        company = attributes.get(company_id, {})
+        summary_company = summary['companies'][company_id]
+        applications = [(str(roster[reg_no]['class']) if reg_no in roster else 'Unknown', application)
+                        for reg_no, application in summary_company['entries'].items()]
+        # Sheet rows that match no roster student are counted once per name, as the
+        # placement statistics count them
+        applications += [('Unknown', application) for application in summary_company['unresolved'].values()]
+        for student_class, application in applications:
+            add('applied', student_class, company_id, company.get('campus_type'), company.get('placement_origin'))
+            for step in application['progression']:
+                if step['passed']:
+                    add('passed', student_class, company_id, company.get('campus_type'), company.get('placement_origin'),
+                        step['stage'], step['index'])
+    
+    if not placements.empty and 'status' in placements.columns:
+        completed = with_object_columns(placements[placements['status_norm'] == 'Completed'])
+        for record in completed.to_dict('records'):
+            if pd.isna(record.get('student_names')):
+                continue
+            company_id = str(record.get('company_id', '')).strip()
+            for name, student in placement_students(record['student_names'], record.get('student_reg_nos')):
+                add('placed', (student['class'] if student else None) or 'Unknown', company_id,
+                    record['campus_norm'], record['origin_norm'])
+    
+    cube = pd.DataFrame(
+        [
+            {
+                'metric': metric, 'class': student_class, 'company_id': company_id,
+                'company_name': str(company_names.get(company_id, company_id)), 'stage': stage,
+                'stage_index': stage_index, 'campus_type': campus_type, 'placement_origin': placement_origin,
+                'students': students
+            }
+            for (metric, student_class, company_id, stage, stage_index, campus_type, placement_origin), students in counts.items()
+        ],
+        columns=['metric'] + CUBE_DIMENSIONS + ['stage_index', 'students']
+    )
+    return _apply_categoricals(cube, ['metric'] + CUBE_DIMENSIONS)
+
+def get_placement_cube():
+    """
+    The current cohort's aggregate cube, rebuilt when any of its data files change.
+    """
+    config = cohort_config()
+    return get_cached_derived(
+        'placement_cube',
+        [config['students_csv'], config['placement_csv'], config['alias_csv']] + _analysis_files(),
+        build_placement_cube
+    )
+
+def slice_cube(cube, metrics, by, filters):
+    """
+    Sum student counts per metric, grouped by the `by` dimensions, over the rows matching
+    `filters` ({dimension: [values]}). 'passed' counts stage clearances, so group or
+    filter by stage to read it as a number of students.
+    """
+    facts = cube[cube['metric'].isin(metrics)]
+    for dimension, values in filters.items():
+        facts = facts[facts[dimension].isin(values)]
+    if not by:
+        totals = facts.groupby('metric', observed=True)['students'].sum()
+        return [{metric: int(totals.get(metric, 0)) for metric in metrics}]
+    grouped = facts.groupby(by + ['metric'], observed=True, sort=False)['students'].sum().unstack('metric', fill_value=0)
+    rows = []
+    for keys, counts in grouped.iterrows():
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        row = {dimension: str(value) for dimension, value in zip(by, keys)}
+        row.update({metric: int(counts.get(metric, 0)) for metric in metrics})
+        rows.append(row)
+    return rows
+
+# Background jobs for heavy analytics endpoints. Job state lives per cohort in
+# <cohort>/jobs/: jobs.json lists the jobs (newest last) and <job_id>.json holds a finished
+# result. Jobs are keyed by name and cohort data version, so every worker serves the same
+# finished result and joins the same in-flight job; a request with no fresh result gets a
+# job id (HTTP 202) and polls.
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_HISTORY_SIZE = 100
+JOB_MAX_WAIT = 10  # seconds a request may block on ?wait= before getting the job id back
+JOB_POLL_SECONDS = 0.05
+
+_jobs_lock = threading.Lock()
+_job_executor = None
+
+def _get_job_executor():
+    # Created on first use so no pool threads exist in a preloading gunicorn master
+    global _job_executor
+    if _job_executor is None:
+        _job_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix='analytics-job')
+    return _job_executor
+
+def _read_jobs(folder):
+    try:
+        with open(os.path.join(folder, 'jobs.json')) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return []
+
+@contextmanager
+def _locked_jobs(folder):
+    """
+    Yield the job list of a jobs folder under the thread and file lock; the list is written
+    back (oldest jobs and their results dropped beyond JOB_HISTORY_SIZE) when the block exits.
+    """
+    os.makedirs(folder, exist_ok=True)
+    with _jobs_lock, open(os.path.join(folder, 'jobs.json.lock'), 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        jobs = _read_jobs(folder)
+        yield jobs
+        for evicted in jobs[:max(len(jobs) - JOB_HISTORY_SIZE, 0)]:
+            try:
+                os.remove(os.path.join(folder, f"{evicted['id']}.json"))
+            except OSError:
+                pass
+        del jobs[:max(len(jobs) - JOB_HISTORY_SIZE, 0)]
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=folder)
+        with os.fdopen(fd, 'w') as handle:
+            json.dump(jobs, handle)
+        os.replace(temp_path, os.path.join(folder, 'jobs.json'))
+
+def _worker_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+def _run_job(folder, job_id, name, cohort, builder):
+    with _locked_jobs(folder) as jobs:
+        for job in jobs:
+            if job['id'] == job_id:
+                job['status'] = 'running'
+                job['started_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    start = time.perf_counter()
+    error = None
+    try:
+        with use_cohort(cohort), track_time(f"job:{name}"):
+            result = builder()
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=folder)
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(app.json.dumps(result))
+        os.replace(temp_path, os.path.join(folder, f'{job_id}.json'))
+    except Exception as e:
+        print(f"Error in job {name} ({job_id}): {e}")
+        import traceback
+        traceback.print_exc()
+        error = str(e)
+    
+    with _locked_jobs(folder) as jobs:
+        for job in jobs:
+            if job['id'] == job_id:
+                job['status'] = 'failed' if error else 'done'
+                job['error'] = error
+                job['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+                job['finished_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+def get_or_submit_job(name, builder):
+    """
+    Return the job for `name` in the current cohort and data version: the finished one
+    holding a fresh result, the identical job already in flight in any worker, or a newly
+    queued one.
+    """
+    folder = cohort_config()['jobs_folder']
+    cohort = current_cohort()
+    data_version = get_cohort_data_version()
+    with _locked_jobs(folder) as jobs:
+        for job in reversed(jobs):
+            if job['name'] != name or job['data_version'] != data_version or not job['current']:
+                continue
+            if job['status'] in ('queued', 'running') and not _worker_alive(job['pid']):
+                job.update(status='failed', error='The worker running this job exited')
+            if job['status'] == 'failed':
+                # Hand the failure to this caller once, then let the next request retry
+                job['current'] = False
+            return dict(job)
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'name': name,
+            'cohort': cohort,
+            'data_version': data_version,
+            'pid': os.getpid(),
+            'current': True,
+            'status': 'queued',
+            'submitted_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'started_at': None,
+            'finished_at': None,
+            'duration_ms': None,
+            'error': None
+        }
+        jobs.append(job)
+    _get_job_executor().submit(_run_job, folder, job['id'], name, cohort, builder)
+    return dict(job)
+
+def _wait_for_job(folder, job, wait):
+    # Poll the shared job list, since the job may be running in another worker
+    deadline = time.monotonic() + wait
+    while job['status'] in ('queued', 'running') and time.monotonic() < deadline:
+        time.sleep(JOB_POLL_SECONDS)
+        job = next((entry for entry in _read_jobs(folder) if entry['id'] == job['id']), job)
+    return job
+
+def _job_result_response(folder, job):
+    # The result file is already serialized JSON, so it is sent as is
+    with open(os.path.join(folder, f"{job['id']}.json")) as handle:
+        return app.response_class(handle.read() + '\n', mimetype=app.json.mimetype)
+
+def job_response(name, builder):
+    """
+    Serve a heavy endpoint through the job queue: the result when it is fresh, otherwise
+    202 with the job id. ?wait=<seconds> (up to JOB_MAX_WAIT) waits for the job first.
+    """
+    folder = cohort_config()['jobs_folder']
+    job = get_or_submit_job(name, builder)
+    wait = min(request.args.get('wait', 0, type=float), JOB_MAX_WAIT)
+    if wait > 0:
+        job = _wait_for_job(folder, job, wait)
+    
+    if job['status'] == 'done':
+        return _job_result_response(folder, job)
+    if job['status'] == 'failed':
+        return jsonify({'error': job['error']}), 500
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': url_for('job_status', job_id=job['id'])
+    }), 202, {'Retry-After': '1'}
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    """
+    Status of a background job in the current cohort, from any worker, with its result once done.
+    Re-requesting the original endpoint also returns the result when it is ready.
+    """
+    folder = cohort_config()['jobs_folder']
+    job = next((job for job in _read_jobs(folder) if job['id'] == job_id), None)
+    if job is None:
+        return jsonify({'error': 'Job not found (it may have been evicted)'}), 404
+    wait = min(request.args.get('wait', 0, type=float), JOB_MAX_WAIT)
+    if wait > 0:
+        job = _wait_for_job(folder, job, wait)
+    view = {key: value for key, value in job.items() if key != 'current'}
+    if job['status'] == 'done':
+        with open(os.path.join(folder, f"{job['id']}.json")) as handle:
+            view['result'] = json.load(handle)
+    return jsonify(view)
 
 @app.route('/placement_statistics')
 @login_required
@@ -2225,22 +3581,40 @@ def placement_statistics():
     """
     Display overall placement statistics combining ANALYSIS folder and Master_Placement_Fila.csv data.
     """
-    return render_template('placement_statistics.html')
+    return render_template('placement_statistics.html', classes=cohort_class_names())
 
 @app.route('/api/placement_statistics')
 @login_required
 def api_placement_statistics():
     """
-    Get comprehensive placement statistics combining both data sources.
+    Get comprehensive placement statistics combining both data sources (computed as a background job).
+    """
+    return job_response('placement_statistics', get_comprehensive_placement_statistics)
+
+@app.route('/api/placement_statistics/<section>')
+@login_required
+def api_placement_statistics_section(section):
+    """
+    One section of the placement statistics (overall, funnel, round_pass_rates, company_stats,
+    class_stats or student_activity). Each section carries an ETag of its content, so a client
+    revalidating with If-None-Match gets 304 while the section is unchanged.
     """
+    if section not in PLACEMENT_STATISTICS_SECTIONS:
+        return jsonify({'error': f'Unknown section: {section}', 'sections': PLACEMENT_STATISTICS_SECTIONS}), 404
     try:
-        stats = get_comprehensive_placement_statistics()
-        return jsonify(stats)
+        entry = get_placement_statistics_section(section)
     except Exception as e:
-        print(f"Error in placement statistics: {e}")
+        print(f"Error in placement statistics section {section}: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
+    
+    headers = {'ETag': f'"{entry["etag"]}"', 'Cache-Control': 'private, no-cache'}
+    if request.if_none_match.contains(entry['etag']):
+        return Response(status=304, headers=headers)
+    response = jsonify(entry['data'])
+    response.headers.update(headers)
+    return response
 
 @app.route('/student_analysis')
 @login_required
@@ -2257,7 +3631,24 @@ def api_student_analysis(student_name):
     Get complete application history for a student.
     """
     try:
-        history = get_student_application_history(student_name)
+        history = get_student_summary(student_name)
+        if history is None:
+            return jsonify({'error': 'Student not found'}), 404
+        return jsonify(history)
+    except Exception as e:
+        print(f"Error in student analysis: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/student_analysis/reg_no/<reg_no>')
+@login_required
+def api_student_analysis_by_reg_no(reg_no):
+    """
+    Get complete application history for a student by register number.
+    """
+    try:
+        history = get_student_summary_by_reg_no(reg_no)
         if history is None:
             return jsonify({'error': 'Student not found'}), 404
         return jsonify(history)
@@ -2267,56 +3658,644 @@ def api_student_analysis(student_name):
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+STUDENT_BATCH_LIMIT = 500  # most students one batch request may ask for
+
+@app.route('/api/student_analysis/batch', methods=['POST'])
+@login_required
+def api_student_analysis_batch():
+    """
+    Get application histories for many students in one call.
+    Body: {"students": [name or register number, ...]}
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        queries = payload.get('students')
+        if not isinstance(queries, list) or not all(isinstance(query, (str, int)) for query in queries):
+            return jsonify({'error': 'Expected {"students": [name or register number, ...]}'}), 400
+        if len(queries) > STUDENT_BATCH_LIMIT:
+            return jsonify({'error': f'At most {STUDENT_BATCH_LIMIT} students per request'}), 400
+        
+        results, not_found = get_student_summaries(queries)
+        return jsonify({'results': results, 'not_found': not_found, 'count': len(results)})
+    except Exception as e:
+        print(f"Error in batch student analysis: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+# Analysis across all students of the cohort, read from the student summary table
+@timed
+def build_all_students_analysis():
+    students_df = load_students()
+    histories, _ = get_student_summaries([str(name) for name in students_df['Name']])
+    
+    all_students_stats = []
+    
+    for _, student_row in students_df.iterrows():
+        student_name = student_row['Name']
+        history = histories.get(str(student_name))
+        
+        if history:
+            stats = history['statistics']
+            all_students_stats.append({
+                'name': student_name,
+                'reg_no': student_row['Reg.no'],
+                'class': student_row['Class'],
+                'total_applications': stats['total_applications'],
+                'total_selected': stats['total_selected'],
+                'failed_at_final': stats['failed_at_final'],
+                'total_reached_final': stats['total_reached_final'],
+                'selection_rate': stats['selection_rate'],
+                'final_round_failure_rate': stats['final_round_failure_rate'],
+                'avg_stages_reached': stats['avg_stages_reached'],
+                'companies_not_applied_count': stats['companies_not_applied_count']
+            })
+    
+    # Sort by different criteria
+    least_applications = sorted(all_students_stats, key=lambda x: x['total_applications'])[:20]
+    most_final_failures = sorted([s for s in all_students_stats if s['failed_at_final'] > 0], 
+                                key=lambda x: x['failed_at_final'], reverse=True)[:20]
+    never_applied = [s for s in all_students_stats if s['total_applications'] == 0]
+    
+    return {
+        'all_students': all_students_stats,
+        'least_applications': least_applications,
+        'most_final_failures': most_final_failures,
+        'never_applied': never_applied,
+        'total_students': len(all_students_stats)
+    }
+
 @app.route('/api/all_students_analysis')
 @login_required
 def api_all_students_analysis():
     """
     Get analysis for all students - who applies least, who fails at final rounds often, etc.
+    Computed as a background job.
+    """
+    return job_response('all_students_analysis', build_all_students_analysis)
+
+@app.route('/analysis')
+@login_required
+def analysis():
+    """
+    Name matching and per-company statistics for Analysis - Overall.csv.
     """
     try:
-        students_df = load_students()
+        return render_template('analysis.html',
+                               match_results=match_analysis_names(),
+                               companies_info=get_overall_company_stats())
+    except Exception as e:
+        print(f"Analysis error: {e}")
+        import traceback
+        traceback.print_exc()
+        return f"Error loading analysis: {str(e)}", 500
+
+@app.route('/api/overall_analysis')
+@login_required
+def api_overall_analysis():
+    """
+    Query Analysis - Overall.csv in long format, e.g.
+    /api/overall_analysis?company=Infosys&stage=Selected&value=1 or ?reg_no=2447101.
+    company and stage take comma separated values; student matches part of a name.
+    Without filters only the company summary is returned.
+    """
+    overall = get_overall_analysis()
+    if overall is None:
+        return jsonify({'error': 'Analysis - Overall.csv not found or could not be parsed'}), 404
+    
+    try:
+        long = overall['long']
+        mask = pd.Series(True, index=long.index)
+        filtered = False
+        for column in ('company', 'stage', 'reg_no'):
+            if request.args.get(column):
+                mask &= long[column].isin([value.strip() for value in request.args[column].split(',')])
+                filtered = True
+        if request.args.get('student'):
+            mask &= long['student'].str.upper().str.contains(request.args['student'].strip().upper(), regex=False)
+            filtered = True
+        if request.args.get('value') is not None:
+            mask &= long['value'] == pd.to_numeric(request.args['value'], errors='coerce')
+            filtered = True
         
-        all_students_stats = []
+        response = {'companies': get_overall_company_stats(), 'generation': get_change_generation()}
+        if filtered:
+            rows = long[mask]
+            response['rows'] = convert_to_native(rows.astype({'company': str, 'stage': str}).to_dict('records'))
+        return jsonify(response)
+    except Exception as e:
+        print(f"Error querying overall analysis: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/student_performance')
+@login_required
+def student_performance():
+    """
+    Company funnels and every student's progression through each company's rounds.
+    """
+    try:
+        return render_template('student_performance.html',
+                               company_funnels=get_company_funnel_analysis(),
+                               **build_student_performance_view())
+    except Exception as e:
+        print(f"Student performance error: {e}")
+        import traceback
+        traceback.print_exc()
+        return f"Error loading student performance: {str(e)}", 500
+
+@app.route('/api/student_performance')
+@login_required
+def api_student_performance():
+    """
+    Whole-cohort student performance table as JSON.
+    """
+    try:
+        view = build_student_performance_view()
+        return jsonify(convert_to_native({
+            'students': view['student_performance'],
+            'summary': {key: value for key, value in view.items() if key != 'student_performance'}
+        }))
+    except Exception as e:
+        print(f"Error in student performance: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/company_funnels')
+@login_required
+def api_company_funnels():
+    """
+    Company funnels, e.g. /api/company_funnels?class=MCA A,MCA B&companies=CMP01,CMP03.
+    Both filters are optional and take comma separated values.
+    """
+    classes = [value.strip() for value in request.args.get('class', '').split(',') if value.strip()] or None
+    company_ids = [value.strip() for value in request.args.get('companies', '').split(',') if value.strip()] or None
+    try:
+        funnels = get_company_funnels(classes=classes, company_ids=company_ids)
+    except Exception as e:
+        print(f"Error in company funnels: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+    return jsonify({
+        'funnels': funnels,
+        'classes': classes,
+        'companies': company_ids,
+        'generation': get_change_generation()
+    })
+
+@app.route('/api/cube')
+@login_required
+def api_cube():
+    """
+    Slice the aggregate cube, e.g. /api/cube?metric=applied,placed&by=placement_origin
+    or /api/cube?metric=passed&by=class,stage&company_id=CMP03.
+    metric: comma separated applied / passed / placed; by: comma separated dimensions;
+    any dimension can be passed as a filter with comma separated values.
+    """
+    metrics = [metric for metric in request.args.get('metric', 'applied').split(',') if metric]
+    by = [dimension for dimension in request.args.get('by', '').split(',') if dimension]
+    unknown = [name for name in metrics if name not in CUBE_METRICS] + [name for name in by if name not in CUBE_DIMENSIONS]
+    if unknown:
+        return jsonify({'error': f"Unknown metric or dimension: {', '.join(unknown)}",
+                        'metrics': CUBE_METRICS, 'dimensions': CUBE_DIMENSIONS}), 400
+    filters = {
+        dimension: request.args.get(dimension).split(',')
+        for dimension in CUBE_DIMENSIONS if request.args.get(dimension)
+    }
+    
+    try:
+        rows = slice_cube(get_placement_cube(), metrics, by, filters)
+    except Exception as e:
+        print(f"Error slicing cube: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+    return jsonify({
+        'metrics': metrics,
+        'by': by,
+        'filters': filters,
+        'rows': rows,
+        'generation': get_change_generation()
+    })
+
+# What each kind of change makes stale, named after the page or API that serves it
+CHANGE_AGGREGATES = {
+    'placement': ['dashboard', 'students', 'pr_dashboard', 'companies', 'ongoing_companies', 'cube']
+                 + [f'placement_statistics/{section}' for section in PLACEMENT_STATISTICS_SECTIONS],
+    'analysis': ['student_analysis', 'all_students_analysis', 'student_performance', 'company_funnels', 'cube']
+                + [f'placement_statistics/{section}' for section in PLACEMENT_STATISTICS_SECTIONS]
+}
+
+@app.route('/api/changes')
+@login_required
+def api_changes():
+    """
+    Changes logged after a generation, e.g. /api/changes?since=42.
+    Returns the changes, the current version of every placement record they touch (null once
+    deleted) and the aggregates to refetch. Poll again with since=<generation> from the reply;
+    reset=true means the log was replaced and everything should be reloaded.
+    """
+    since = request.args.get('since', 0, type=int)
+    try:
+        generation = get_change_generation()
+        log = get_change_log()
+        if since > generation:
+            return jsonify({'generation': generation, 'since': since, 'reset': True,
+                            'changes': [], 'records': {}, 'aggregates': []})
         
-        for _, student_row in students_df.iterrows():
-            student_name = student_row['Name']
-            history = get_student_application_history(student_name)
-            
-            if history:
-                stats = history['statistics']
-                all_students_stats.append({
-                    'name': student_name,
-                    'reg_no': student_row['Reg.no'],
-                    'class': student_row['Class'],
-                    'total_applications': stats['total_applications'],
-                    'total_selected': stats['total_selected'],
-                    'failed_at_final': stats['failed_at_final'],
-                    'total_reached_final': stats['total_reached_final'],
-                    'selection_rate': stats['selection_rate'],
-                    'final_round_failure_rate': stats['final_round_failure_rate'],
-                    'avg_stages_reached': stats['avg_stages_reached'],
-                    'companies_not_applied_count': stats['companies_not_applied_count']
-                })
+        changes = log[log['generation'] > since]
+        aggregates = set()
+        for entity, company_id in zip(changes['entity'], changes['company_id']):
+            aggregates.update(CHANGE_AGGREGATES.get(entity, []))
+            if company_id:
+                aggregates.add(f'company_stats/{company_id}')
         
-        # Sort by different criteria
-        least_applications = sorted(all_students_stats, key=lambda x: x['total_applications'])[:20]
-        most_final_failures = sorted([s for s in all_students_stats if s['failed_at_final'] > 0], 
-                                    key=lambda x: x['failed_at_final'], reverse=True)[:20]
-        never_applied = [s for s in all_students_stats if s['total_applications'] == 0]
+        record_ids = set(changes.loc[changes['entity'] == 'placement', 'record_id'])
+        records = dict.fromkeys(record_ids)
+        if record_ids:
+            placements = load_placements().drop(columns=list(PLACEMENT_NORMALIZED_COLUMNS))
+            changed = with_object_columns(placements[placements['record_id'].astype(str).isin(record_ids)])
+            for record in changed.fillna('').to_dict('records'):
+                records[str(record['record_id'])] = record
         
         return jsonify({
-            'all_students': all_students_stats,
-            'least_applications': least_applications,
-            'most_final_failures': most_final_failures,
-            'never_applied': never_applied,
-            'total_students': len(all_students_stats)
+            'generation': generation,
+            'since': since,
+            'reset': False,
+            'changes': changes.drop(columns=['version']).to_dict('records'),
+            'records': records,
+            'aggregates': sorted(aggregates)
         })
     except Exception as e:
-        print(f"Error in all students analysis: {e}")
+        print(f"Error reading change log: {e}")
         import traceback
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/cohort_comparison')
+@login_required
+def api_cohort_comparison():
+    """
+    Compare cohorts side by side. Each cohort contributes its cached dashboard aggregates,
+    so only cohorts whose files changed are recomputed.
+    """
+    cohorts = []
+    totals = {'total_students': 0, 'total_placed': 0, 'class_counts': {}, 'campus_stats': {}, 'origin_stats': {}}
+    for cohort_id, cohort in get_cohorts().items():
+        try:
+            with use_cohort(cohort_id):
+                stats = get_dashboard_stats()
+        except Exception as e:
+            print(f"Error loading cohort {cohort_id}: {e}")
+            continue
+        
+        cohorts.append({
+            'cohort': cohort_id,
+            'label': cohort['label'],
+            'total_students': int(stats['total_students']),
+            'total_placed': int(stats['total_placed']),
+            'placement_rate': round(stats['total_placed'] / stats['total_students'] * 100, 2) if stats['total_students'] else 0,
+            'total_companies': int(stats['total_companies']),
+            'avg_package': float(stats['avg_package']),
+            'class_counts': stats['class_counts'],
+            'campus_stats': stats['campus_stats'],
+            'origin_stats': stats['origin_stats']
+        })
+        totals['total_students'] += int(stats['total_students'])
+        totals['total_placed'] += int(stats['total_placed'])
+        for key in ('class_counts', 'campus_stats', 'origin_stats'):
+            for label, count in stats[key].items():
+                totals[key][label] = totals[key].get(label, 0) + int(count)
+    
+    totals['placement_rate'] = round(totals['total_placed'] / totals['total_students'] * 100, 2) if totals['total_students'] else 0
+    return jsonify(convert_to_native({'cohorts': cohorts, 'totals': totals}))
+
+# On-demand request profiling for admins: add ?_profile=1 or the X-Profile-Request: 1 header.
+# Profiles are kept one file per profile in RUNTIME_FOLDER/profiles, so every worker sees
+# every capture; the oldest files are pruned beyond PROFILE_BUFFER_SIZE.
+PROFILE_BUFFER_SIZE = 20
+_profiles_lock = threading.Lock()
+
+def _profiles_folder():
+    return os.path.join(RUNTIME_FOLDER, 'profiles')
+
+def _stored_profile_ids():
+    # Oldest first
+    try:
+        names = os.listdir(_profiles_folder())
+    except OSError:
+        return []
+    return sorted(int(name[:-len('.profile')]) for name in names if name.endswith('.profile') and name[:-len('.profile')].isdigit())
+
+def _load_profile(profile_id):
+    try:
+        with open(os.path.join(_profiles_folder(), f'{profile_id}.profile'), 'rb') as handle:
+            return marshal.load(handle)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+def _profiling_requested():
+    if session.get('role') != 'admin' or (request.endpoint or '').startswith('request_profile'):
+        return False
+    return request.args.get('_profile') == '1' or request.headers.get('X-Profile-Request') == '1'
+
+def _store_profile(profiler, response, elapsed):
+    stats_text = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stats_text)
+    stats.sort_stats('cumulative').print_stats(40)
+    profile = {
+        'captured_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.endpoint or 'unmatched',
+        'status': response.status_code,
+        'duration_ms': round(elapsed * 1000, 2),
+        'data_generation': get_data_generation(),
+        'pid': os.getpid(),
+        'stats_text': stats_text.getvalue(),
+        'stats_dump': marshal.dumps(stats.stats)
+    }
+    folder = _profiles_folder()
+    try:
+        os.makedirs(folder, exist_ok=True)
+        with _profiles_lock, open(os.path.join(folder, '.lock'), 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            profile_ids = _stored_profile_ids()
+            profile['id'] = (profile_ids[-1] if profile_ids else 0) + 1
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=folder)
+            with os.fdopen(fd, 'wb') as handle:
+                marshal.dump(profile, handle)
+            os.replace(temp_path, os.path.join(folder, f"{profile['id']}.profile"))
+            for profile_id in profile_ids[:max(len(profile_ids) + 1 - PROFILE_BUFFER_SIZE, 0)]:
+                os.remove(os.path.join(folder, f'{profile_id}.profile'))
+    except Exception as e:
+        print(f"Error storing profile: {e}")
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    if _profiling_requested():
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def record_request_metrics(response):
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+    start = g.pop('request_start', None)
+    if start is not None:
+        elapsed = time.perf_counter() - start
+        if profiler is not None:
+            _store_profile(profiler, response, elapsed)
+        endpoint = request.endpoint or 'unmatched'
+        with _metrics_lock:
+            latency = _metrics['request_latency'].setdefault(
+                endpoint, {'buckets': [0] * len(LATENCY_BUCKETS), 'sum': 0.0, 'count': 0}
+            )
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    latency['buckets'][i] += 1
+            latency['sum'] += elapsed
+            latency['count'] += 1
+            key = (endpoint, str(response.status_code))
+            _metrics['requests'][key] = _metrics['requests'].get(key, 0) + 1
+        if time.time() - _metrics_file['flushed_at'] >= METRICS_FLUSH_SECONDS:
+            flush_metrics()
+    return response
+
+def _metric_labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{key}="{escape(value)}"' for key, value in labels.items()) + '}'
+
+def render_metrics():
+    """
+    Render the metrics of all workers in Prometheus text exposition format.
+    """
+    collected = collected_metrics()
+    lines = [
+        '# HELP placement_request_duration_seconds Request latency by endpoint.',
+        '# TYPE placement_request_duration_seconds histogram'
+    ]
+    for endpoint, latency in sorted(collected['request_latency'].items()):
+        for bound, count in zip(LATENCY_BUCKETS, latency['buckets']):
+            lines.append(f"placement_request_duration_seconds_bucket{_metric_labels(endpoint=endpoint, le=bound)} {count}")
+        lines.append(f"placement_request_duration_seconds_bucket{_metric_labels(endpoint=endpoint, le='+Inf')} {latency['count']}")
+        lines.append(f"placement_request_duration_seconds_sum{_metric_labels(endpoint=endpoint)} {latency['sum']:.6f}")
+        lines.append(f"placement_request_duration_seconds_count{_metric_labels(endpoint=endpoint)} {latency['count']}")
+    
+    lines += ['# HELP placement_requests_total Requests by endpoint and status code.',
+              '# TYPE placement_requests_total counter']
+    for (endpoint, status), count in sorted(collected['requests'].items()):
+        lines.append(f"placement_requests_total{_metric_labels(endpoint=endpoint, status=status)} {count}")
+    
+    lines += ['# HELP placement_csv_loads_total CSV files parsed, by file.',
+              '# TYPE placement_csv_loads_total counter']
+    for label, count in sorted(collected['csv_loads'].items()):
+        lines.append(f"placement_csv_loads_total{_metric_labels(file=label)} {count}")
+    
+    lines += ['# HELP placement_csv_bytes_read_total Bytes of CSV data parsed, by file.',
+              '# TYPE placement_csv_bytes_read_total counter']
+    for label, count in sorted(collected['csv_bytes'].items()):
+        lines.append(f"placement_csv_bytes_read_total{_metric_labels(file=label)} {count}")
+    
+    lines += ['# HELP placement_cache_requests_total Cache lookups by cache and result.',
+              '# TYPE placement_cache_requests_total counter']
+    for (cache_name, result), count in sorted(collected['cache'].items()):
+        lines.append(f"placement_cache_requests_total{_metric_labels(cache=cache_name, result=result)} {count}")
+    
+    lines += ['# HELP placement_function_duration_seconds Time spent in heavy analytics functions.',
+              '# TYPE placement_function_duration_seconds summary']
+    for name, entry in sorted(collected['function_time'].items()):
+        lines.append(f"placement_function_duration_seconds_sum{_metric_labels(function=name)} {entry['sum']:.6f}")
+        lines.append(f"placement_function_duration_seconds_count{_metric_labels(function=name)} {entry['count']}")
+    return '\n'.join(lines) + '\n'
+
+@app.route('/metrics')
+def metrics():
+    """
+    Prometheus scrape endpoint for the request, data-load and cache metrics of all workers.
+    Open to METRICS_ALLOWED_ADDRESSES and to logged in admins.
+    """
+    if request.remote_addr not in METRICS_ALLOWED_ADDRESSES and session.get('role') != 'admin':
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profiles')
+@admin_required
+def request_profiles():
+    """
+    List the most recent profiled requests, newest first.
+    """
+    profiles = [
+        {key: value for key, value in profile.items() if key not in ('stats_text', 'stats_dump')}
+        for profile in map(_load_profile, reversed(_stored_profile_ids())) if profile is not None
+    ]
+    return render_template('profiles.html', profiles=profiles, buffer_size=PROFILE_BUFFER_SIZE)
+
+@app.route('/admin/profiles/<int:profile_id>')
+@admin_required
+def request_profile_detail(profile_id):
+    """
+    Show a captured profile as text, or download it as a .prof file with ?format=prof
+    (readable with pstats or snakeviz).
+    """
+    profile = _load_profile(profile_id)
+    if profile is None:
+        return 'Profile not found (it may have been evicted from the buffer)', 404
+    if request.args.get('format') == 'prof':
+        return Response(
+            profile['stats_dump'],
+            mimetype='application/octet-stream',
+            headers={'Content-Disposition': f'attachment; filename=profile-{profile_id}-{profile["endpoint"]}.prof'}
+        )
+    header = (f"{profile['method']} {profile['path']} -> {profile['status']} in {profile['duration_ms']} ms "
+              f"(endpoint {profile['endpoint']}, data generation {profile['data_generation']}, "
+              f"captured {profile['captured_at']})\n\n")
+    return Response(header + profile['stats_text'], mimetype='text/plain')
+
+# Warmup - build every cache and index up front. Under gunicorn (preload_app, see
+# gunicorn.conf.py) this runs once in the master so forked workers share the structures.
+_warmup_state = {'warm': False, 'warmed_at': None, 'build_seconds': {}, 'total_seconds': None, 'pid': None}
+
+def warmup():
+    """
+    Load every cohort's CSVs and build its student cache, company status index,
+    stage store and dashboard aggregates. Safe to call again; later calls rebuild
+    anything whose source file changed.
+    """
+    steps = [
+        ('student_df', _load_students_cached),
+        ('student_lookups', lambda: _prime_student_lookups(_load_students_cached())),
+        ('company_status_index', get_company_status_index),
+        ('stage_store', get_stage_store),
+        ('overall_analysis', get_overall_analysis),
+        ('alias_table', get_alias_table),
+        ('student_summary_table', get_student_summary_table),
+        ('placement_cube', get_placement_cube),
+        ('company_funnels', get_company_funnel_table),
+        ('student_performance', get_student_performance_table),
+        ('placement_statistics', get_comprehensive_placement_statistics),
+        ('dashboard_stats', get_dashboard_stats),
+    ]
+    build_seconds = {}
+    start = time.perf_counter()
+    for cohort_id in get_cohorts():
+        build_seconds[cohort_id] = {}
+        with use_cohort(cohort_id):
+            for name, step in steps:
+                step_start = time.perf_counter()
+                try:
+                    step()
+                except Exception as e:
+                    print(f"Warmup step {name} failed for cohort {cohort_id}: {e}")
+                build_seconds[cohort_id][name] = round(time.perf_counter() - step_start, 4)
+    get_data_generation()
+    
+    _warmup_state.update(
+        warm=True,
+        warmed_at=time.strftime('%Y-%m-%d %H:%M:%S'),
+        build_seconds=build_seconds,
+        total_seconds=round(time.perf_counter() - start, 4),
+        pid=os.getpid()
+    )
+    print(f"Warmup finished in {_warmup_state['total_seconds']}s")
+    return _warmup_state
+
+@app.route('/healthz')
+def healthz():
+    """
+    Readiness probe: 200 once warmup has run, 503 before that.
+    """
+    body = {
+        'status': 'ok' if _warmup_state['warm'] else 'warming',
+        'warm': _warmup_state['warm'],
+        'warmed_at': _warmup_state['warmed_at'],
+        'warmed_in_pid': _warmup_state['pid'],
+        'pid': os.getpid(),
+        'warmup_seconds': _warmup_state['total_seconds'],
+        'build_seconds': _warmup_state['build_seconds'],
+        'cache_build_seconds': dict(_derived_build_seconds),
+        'cohorts': list(get_cohorts()),
+        'data_generation': get_data_generation()
+    }
+    return jsonify(body), 200 if _warmup_state['warm'] else 503
+
+@app.route('/admin/aliases', methods=['GET', 'POST'])
+@admin_required
+def name_aliases():
+    """
+    Review the name alias table: ambiguous and unmatched names by default, everything with ?show=all.
+    POST records a manual decision for one alias.
+    """
+    roster = get_roster_lookup()['by_reg_no']
+    if request.method == 'POST':
+        alias = request.form.get('alias', '')
+        reg_no = (request.form.get('custom_reg_no') or request.form.get('reg_no') or '').strip()
+        if not alias.strip():
+            flash('No alias given.', 'error')
+        elif reg_no and normalize_reg_no(reg_no) not in roster:
+            flash(f'Register number {reg_no} is not in the student list.', 'error')
+        else:
+            set_alias_override(alias, reg_no)
+            # Placement records store resolved register numbers - re-resolve them
+            backfill_student_reg_nos()
+            target = roster[normalize_reg_no(reg_no)]['name'] if reg_no else 'no student'
+            flash(f'"{normalize_name(alias)}" now resolves to {target}.', 'success')
+        return redirect(url_for('name_aliases', show=request.args.get('show', 'review')))
+    
+    show = request.args.get('show', 'review')
+    get_alias_table()
+    rows = list(_read_alias_rows(cohort_config()['alias_csv']).values())
+    counts = {}
+    for row in rows:
+        counts[row['match_type']] = counts.get(row['match_type'], 0) + 1
+    if show != 'all':
+        rows = [row for row in rows if row['match_type'] in ALIAS_REVIEW_TYPES]
+    for row in rows:
+        row['student'] = roster.get(row['reg_no'])
+        row['candidate_students'] = [
+            {'reg_no': reg_no, 'name': roster[reg_no]['name'] if reg_no in roster else reg_no}
+            for reg_no in row['candidates'].split(';') if reg_no
+        ]
+    return render_template('aliases.html', aliases=rows, counts=counts, show=show)
+
+@app.route('/admin/aliases/rebuild', methods=['POST'])
+@admin_required
+def rebuild_name_aliases():
+    """
+    Re-run the batch matcher over every alias, keeping manual decisions.
+    """
+    refresh_alias_table(full=True)
+    backfill_student_reg_nos()
+    flash('Alias table rebuilt.', 'success')
+    return redirect(url_for('name_aliases'))
+
+@app.cli.command('build-aliases')
+@click.option('--cohort', default=DEFAULT_COHORT, help='Cohort to build the table for.')
+@click.option('--full', is_flag=True, help='Re-match every alias that was not set manually.')
+def build_aliases_command(cohort, full):
+    """Batch-match student name aliases into the cohort's name_aliases.csv."""
+    with use_cohort(cohort):
+        refresh_alias_table(full=full)
+        rows = _read_alias_rows(cohort_config()['alias_csv'])
+    review = sum(1 for row in rows.values() if row['match_type'] in ALIAS_REVIEW_TYPES)
+    click.echo(f"{len(rows)} aliases, {review} to review")
+
+@app.cli.command('backfill-reg-nos')
+@click.option('--cohort', default=None, help='Cohort to backfill (default: every cohort).')
+def backfill_reg_nos_command(cohort):
+    """Resolve student_reg_nos for existing placement records."""
+    for cohort_id in ([cohort] if cohort else list(get_cohorts())):
+        with use_cohort(cohort_id):
+            records, names, unresolved = backfill_student_reg_nos()
+        click.echo(f"{cohort_id}: {records} records, {names} names, {unresolved} unresolved")
+
 @app.context_processor
 def inject_user_role():
     return dict(
@@ -2324,6 +4303,15 @@ def inject_user_role():
         username=session.get('username', None)
     )
 
+@app.context_processor
+def inject_cohort():
+    return dict(
+        cohorts=get_cohorts(),
+        current_cohort=current_cohort()
+    )
+
 if __name__ == '__main__':
     os.makedirs('data', exist_ok=True)
+    clear_shared_metrics()
+    warmup()
     app.run(host="0.0.0.0", port=10000)
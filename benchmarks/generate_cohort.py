@@ -0,0 +1,266 @@
+"""
+Synthetic cohort generator for benchmarking the placement app.
+
+Writes a data/ folder laid out exactly like the real one:
+    data/FULL NAME LIST.csv
+    data/Master_Placement_Fila.csv
+    data/Analysis - Overall.csv
+    data/ANALYSIS/CMPxx.csv
+
+Usage:
+    python benchmarks/generate_cohort.py --students 2000 --companies 200 --output /tmp/cohort
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import PR_MAPPING, get_class_from_slno  # noqa: E402
+
+FIRST_NAMES = [
+    'AARAV', 'ABHINAV', 'ADITI', 'ADITYA', 'AISHWARYA', 'AJAY', 'AKASH', 'ALAN', 'ALEX', 'AMAL',
+    'ANAGHA', 'ANANYA', 'ANJALI', 'ANKIT', 'ANN', 'ANSON', 'ARJUN', 'ARUN', 'ASHWIN', 'ATHIRA',
+    'BHARATH', 'BINDU', 'CHRISTY', 'DEBIN', 'DEEPAK', 'DEVIKA', 'DHANUSH', 'DIVYA', 'EBIN', 'GAYATHRI',
+    'GOKUL', 'HARI', 'HARSHA', 'JEEVAN', 'JERIN', 'JOEL', 'JOSEPH', 'KAVYA', 'KEERTHANA', 'KIRAN',
+    'KRISHNA', 'LAKSHMI', 'MANASA', 'MARIA', 'MEGHA', 'MERIN', 'NAVEEN', 'NEHA', 'NIKHIL', 'NITHIN',
+    'PAVAN', 'POOJA', 'PRANAV', 'PRIYA', 'RAHUL', 'RAKESH', 'RESHMA', 'ROHAN', 'SACHIN', 'SANJANA',
+    'SHREYA', 'SIDHARTH', 'SNEHA', 'SOUJANYA', 'SREYA', 'SURYA', 'SWATHI', 'TEJAS', 'VARUN', 'VIDYA',
+    'VIGNESH', 'VISHNU', 'VIVEK', 'VYSHNAVI', 'YASH'
+]
+LAST_NAMES = [
+    'ABRAHAM', 'BHAT', 'BIJU', 'CHANDRAN', 'CHRISTOPHER', 'DAS', 'DSOUZA', 'GEORGE', 'GUPTA', 'IYER',
+    'JACOB', 'JAIN', 'JOSE', 'JOSEPH', 'KUMAR', 'KURIAN', 'MATHEW', 'MENON', 'MISHRA', 'NAIR',
+    'PAUL', 'PILLAI', 'PRASAD', 'RAJ', 'RAO', 'REDDY', 'SEBASTIAN', 'SHARMA', 'SHETTY', 'SINGH',
+    'STEPHEN', 'THOMAS', 'VARGHESE', 'VERMA', 'YADAV'
+]
+COMPANY_WORDS = [
+    'Analytics', 'Bytes', 'Cloud', 'Data', 'Digital', 'Dynamics', 'Global', 'Infotech', 'Labs', 'Logic',
+    'Minds', 'Networks', 'Nova', 'Quantum', 'Sigma', 'Soft', 'Solutions', 'Systems', 'Tech', 'Vision'
+]
+ROLES = [
+    'Software Engineer', 'Data Analyst', 'Associate Consultant', 'QA Engineer', 'ML Intern',
+    'Business Analyst', 'Full Stack Developer', 'Cloud Engineer', 'Technical Support Engineer'
+]
+PACKAGES = ['4.5 LPA', '5.5 LPA', '6 LPA', '7 LPA', '8 LPA', '9 LPA', '12 LPA', '30000 pm', 'NOT DISCLOSED']
+STAGE_POOL = [
+    'Aptitude Test', 'Technical Assessment', 'Group Discussion', 'Technical Round 1',
+    'Technical Round 2', 'Managerial Round', 'HR Round'
+]
+
+PLACEMENT_COLUMNS = [
+    'record_id', 'company_id', 'company_name', 'campus_type', 'pr_assigned', 'pr_name',
+    'placement_origin', 'status', 'noof_students_placed', 'role', 'package',
+    'student_names', 'class_distribution'
+]
+
+
+def _unique_names(rng, count):
+    names = []
+    seen = set()
+    while len(names) < count:
+        parts = [rng.choice(FIRST_NAMES)]
+        if rng.random() < 0.45:
+            parts.append(rng.choice('ABCDEFGHJKLMNPRSTV'))
+        parts.append(rng.choice(LAST_NAMES))
+        if rng.random() < 0.2:
+            parts.append(rng.choice(LAST_NAMES))
+        name = ' '.join(parts)
+        if name in seen:
+            # Disambiguate the way real rosters do, with an extra initial
+            name = f'{name} {rng.choice("ABCDEFGHJKLMNPRSTV")}{len(names) % 10}'
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def _name_variant(rng, name):
+    """
+    Return the name as a placement officer might type it: dropped middle initials,
+    extra spaces or mixed case, so the app's fuzzy matching is exercised.
+    """
+    words = name.split()
+    roll = rng.random()
+    if roll < 0.1 and len(words) > 2:
+        words = [w for w in words if len(w) > 1] or words
+    elif roll < 0.15:
+        return '  '.join(words)
+    elif roll < 0.2:
+        return ' '.join(words).title()
+    return ' '.join(words)
+
+
+def generate_cohort(output_dir, students=200, companies=20, seed=0,
+                    analysis_fraction=0.6, overall_companies=30):
+    """
+    Generate a synthetic cohort under output_dir/data and return a summary of what was written.
+    """
+    rng = random.Random(seed)
+    data_dir = os.path.join(output_dir, 'data')
+    analysis_dir = os.path.join(data_dir, 'ANALYSIS')
+    os.makedirs(analysis_dir, exist_ok=True)
+    for filename in os.listdir(analysis_dir):
+        if filename.endswith('.csv'):
+            os.remove(os.path.join(analysis_dir, filename))
+
+    # FULL NAME LIST
+    names = _unique_names(rng, students)
+    roster = [
+        {'sl_no': i + 1, 'reg_no': str(2447101 + i), 'name': name}
+        for i, name in enumerate(names)
+    ]
+    with open(os.path.join(data_dir, 'FULL NAME LIST.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Sl .no', 'Reg.no', 'Name'])
+        for student in roster:
+            writer.writerow([student['sl_no'], student['reg_no'], student['name']])
+
+    # Companies and their recruitment stages
+    pr_codes = list(PR_MAPPING.keys())
+    company_list = []
+    for i in range(companies):
+        company_id = f'CMP{str(i + 1).zfill(2)}'
+        on_campus = rng.random() < 0.85
+        rounds = rng.randint(2, 5)
+        stages = ['Applied'] + sorted(rng.sample(STAGE_POOL, rounds), key=STAGE_POOL.index) + ['Selected']
+        company_list.append({
+            'company_id': company_id,
+            'company_name': f'{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {i + 1}',
+            'campus_type': 'On Campus' if on_campus else 'Off Campus',
+            'placement_origin': rng.choice(['CPCG', 'Department']) if on_campus else 'Off Campus',
+            'pr_assigned': rng.choice(pr_codes) if on_campus and rng.random() < 0.8 else '',
+            'status': rng.choices(['Completed', 'On-going', 'Cancelled', 'On-Hold'], [0.55, 0.35, 0.06, 0.04])[0],
+            'stages': stages,
+            'has_analysis': on_campus and rng.random() < analysis_fraction
+        })
+
+    # ANALYSIS/CMPxx.csv - one row per student, sequential 0/1 funnel per stage
+    placed = {}
+    available = list(range(students))
+    rng.shuffle(available)
+    analysis_rows = {}
+    for company in company_list:
+        if not company['has_analysis']:
+            continue
+        apply_rate = rng.uniform(0.2, 0.8)
+        rows = []
+        selected = []
+        for idx, student in enumerate(roster):
+            values = [0] * len(company['stages'])
+            if rng.random() < apply_rate:
+                values[0] = 1
+                for stage_idx in range(1, len(values)):
+                    if rng.random() < 0.55:
+                        values[stage_idx] = 1
+                    else:
+                        break
+                if values[-1] == 1:
+                    selected.append(idx)
+            rows.append(values)
+        analysis_rows[company['company_id']] = rows
+        company['selected'] = selected
+        with open(os.path.join(analysis_dir, f"{company['company_id']}.csv"), 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Name of the Student', 'Register Number'] + company['stages'])
+            for student, values in zip(roster, rows):
+                writer.writerow([student['name'], student['reg_no']] + values)
+
+    # Master_Placement_Fila - 1 to 3 records per company
+    records = []
+    record_id = 1
+    for company in company_list:
+        pool = [idx for idx in company.get('selected', []) if idx not in placed]
+        if not pool:
+            pool = [available.pop() for _ in range(min(rng.randint(0, 4), len(available)))]
+        for record_no in range(rng.randint(1, 3)):
+            if company['status'] == 'Completed' or (company['status'] == 'On-going' and rng.random() < 0.3):
+                take = pool[:rng.randint(1, 4)]
+                pool = pool[len(take):]
+            else:
+                take = []
+            for idx in take:
+                placed[idx] = company['company_id']
+            status = company['status']
+            if status == 'Completed' and record_no > 0 and rng.random() < 0.2:
+                status = 'On-going'
+            pr_code = company['pr_assigned']
+            records.append({
+                'record_id': record_id,
+                'company_id': company['company_id'],
+                'company_name': company['company_name'],
+                'campus_type': company['campus_type'],
+                'pr_assigned': pr_code,
+                'pr_name': PR_MAPPING.get(pr_code, ''),
+                'placement_origin': company['placement_origin'],
+                'status': status,
+                'noof_students_placed': float(len(take)) if take else '',
+                'role': rng.choice(ROLES),
+                'package': rng.choice(PACKAGES),
+                'student_names': ', '.join(_name_variant(rng, roster[idx]['name']) for idx in take),
+                'class_distribution': ', '.join(get_class_from_slno(roster[idx]['sl_no']) for idx in take)
+            })
+            record_id += 1
+    with open(os.path.join(data_dir, 'Master_Placement_Fila.csv'), 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=PLACEMENT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(records)
+
+    # Analysis - Overall.csv - banner/rounds/counts/header rows, then one row per student
+    overall = [c for c in company_list if c['has_analysis']][:overall_companies]
+    banner = ['', '']
+    rounds_row = ['', '']
+    counts_row = ['', '']
+    headers = ['Name of the Student', 'Register Number']
+    for company in overall:
+        stages = company['stages']
+        rows = analysis_rows[company['company_id']]
+        banner += [f"Company Name : {company['company_name']}"] + [''] * (len(stages) - 1)
+        rounds_row += [f'Number of Rounds : {len(stages) - 2}'] + [''] * (len(stages) - 1)
+        counts_row += [sum(row[i] for row in rows) for i in range(len(stages))]
+        headers += stages
+    with open(os.path.join(data_dir, 'Analysis - Overall.csv'), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerows([banner, rounds_row, counts_row, headers])
+        for idx, student in enumerate(roster):
+            values = []
+            for company in overall:
+                values += analysis_rows[company['company_id']][idx]
+            writer.writerow([_name_variant(rng, student['name']), student['reg_no']] + values)
+
+    total_bytes = 0
+    for root, _, files in os.walk(data_dir):
+        total_bytes += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return {
+        'data_dir': data_dir,
+        'students': students,
+        'companies': companies,
+        'placement_records': len(records),
+        'analysis_files': len(analysis_rows),
+        'overall_companies': len(overall),
+        'placed_students': len(placed),
+        'bytes': total_bytes
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic placement cohort.')
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--companies', type=int, default=20)
+    parser.add_argument('--output', required=True, help='Directory to create the data/ folder in')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--analysis-fraction', type=float, default=0.6,
+                        help='Share of on-campus companies that get an ANALYSIS/CMPxx.csv file')
+    parser.add_argument('--overall-companies', type=int, default=30,
+                        help='Maximum number of companies in Analysis - Overall.csv')
+    args = parser.parse_args()
+    summary = generate_cohort(args.output, args.students, args.companies, args.seed,
+                              args.analysis_fraction, args.overall_companies)
+    for key, value in summary.items():
+        print(f'{key}: {value}')
+
+
+if __name__ == '__main__':
+    main()
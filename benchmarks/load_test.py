@@ -0,0 +1,492 @@
+"""
+Concurrent load test for the placement app.
+
+A synthetic cohort is generated, a real server is started on it (gunicorn with
+gunicorn.conf.py when available, otherwise the threaded werkzeug server) and a pool of
+virtual users - admins and viewers, each with its own login session - replays a weighted
+mix of page views, typeahead bursts and record writes for a fixed duration. The JSON
+report has throughput and p50/p95/p99 latency per route, and a write-safety section
+that flags failures caused by concurrent writes to the placement CSV.
+
+Usage:
+    python benchmarks/load_test.py --students 2000 --companies 200 --users 20 --duration 60
+    python benchmarks/load_test.py --server werkzeug --admin-fraction 0.2 \\
+        --mix dashboard=30,companies=15,search=20,student_analysis=15,placement_statistics=10,add_record=5,edit_record=5
+"""
+import argparse
+import csv
+import http.cookiejar
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from benchmarks.generate_cohort import generate_cohort  # noqa: E402
+
+DEFAULT_MIX = ('dashboard=30,companies=15,search=20,student_analysis=15,'
+               'placement_statistics=10,add_record=5,edit_record=5')
+ADMIN_ACTIONS = {'add_record', 'edit_record'}
+PLACEMENT_STATISTICS_SECTIONS = ['overall', 'funnel', 'round_pass_rates', 'company_stats', 'class_stats', 'student_activity']
+CREDENTIALS = {
+    'admin': ('admin', 'admin123'),
+    'viewer': ('user1', 'user123')
+}
+# Server log lines that point at a half-written or concurrently replaced placement file
+CSV_ERROR_MARKERS = ('ParserError', 'EmptyDataError', 'No columns to parse', 'Error tokenizing data',
+                     'Master_Placement_Fila', 'index 0 is out of bounds')
+
+
+def _parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        action, weight = item.split('=')
+        if action.strip() not in ACTIONS:
+            raise SystemExit(f"Unknown action '{action}'. Known actions: {', '.join(ACTIONS)}")
+        mix[action.strip()] = float(weight)
+    return mix
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _module_available(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class Server:
+    """
+    The app running in a child process on a generated data folder.
+    """
+
+    def __init__(self, workdir, kind, workers, threads, log_path):
+        self.port = _free_port()
+        self.base_url = f'http://127.0.0.1:{self.port}'
+        self.log_path = log_path
+        env = dict(os.environ, PYTHONPATH=REPO_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+        if kind == 'gunicorn':
+            command = [
+                sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_DIR, 'gunicorn.conf.py'),
+                '--bind', f'127.0.0.1:{self.port}', '--workers', str(workers), '--threads', str(threads),
+                '--chdir', workdir, 'app:app'
+            ]
+        else:
+            command = [
+                sys.executable, '-c',
+                'import app; app.warmup(); '
+                f"app.app.run(host='127.0.0.1', port={self.port}, threaded=True, use_reloader=False)"
+            ]
+        self.log = open(log_path, 'w')
+        self.process = subprocess.Popen(command, cwd=workdir, env=env, stdout=self.log, stderr=subprocess.STDOUT)
+
+    def wait_until_ready(self, timeout):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f'Server exited with code {self.process.returncode}; see {self.log_path}')
+            try:
+                with urllib.request.urlopen(self.base_url + '/healthz', timeout=2) as response:
+                    if response.status == 200:
+                        return
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                pass
+            time.sleep(0.25)
+        raise RuntimeError(f'Server not ready after {timeout}s; see {self.log_path}')
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+    def csv_errors(self):
+        with open(self.log_path, errors='replace') as f:
+            return [line.rstrip() for line in f if any(marker in line for marker in CSV_ERROR_MARKERS)]
+
+
+class VirtualUser:
+    """
+    One logged-in browser session issuing requests and recording their timings.
+    """
+
+    def __init__(self, base_url, role, inputs, recorder, rng):
+        self.base_url = base_url
+        self.role = role
+        self.inputs = inputs
+        self.recorder = recorder
+        self.rng = rng
+        self.etags = {}
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()),
+            _NoRedirect()
+        )
+
+    def request(self, route, path, data=None, etags=None):
+        """
+        Send one request and record its latency. With etags ({path: etag}) the request is a
+        conditional GET, like a browser revalidating its cached copy, and the response's
+        ETag is remembered for the next one.
+        """
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        http_request = urllib.request.Request(self.base_url + path, data=body)
+        if etags is not None and path in etags:
+            http_request.add_header('If-None-Match', etags[path])
+        headers = {}
+        start = time.perf_counter()
+        try:
+            with self.opener.open(http_request, timeout=120) as response:
+                status = response.status
+                payload = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            status, payload, headers = e.code, e.read(), e.headers
+        except (urllib.error.URLError, ConnectionError, socket.timeout) as e:
+            status, payload = None, str(e).encode()
+        self.recorder.record(route, time.perf_counter() - start, status, self.role)
+        if etags is not None and headers.get('ETag'):
+            etags[path] = headers.get('ETag')
+        return status, payload, headers.get('Retry-After')
+
+    def login(self):
+        username, password = CREDENTIALS[self.role]
+        status, _, _ = self.request('POST /login', '/login', {'username': username, 'password': password})
+        return status in (200, 302)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    # Redirects after login and form posts count as the response itself
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class Recorder:
+    """
+    Thread-safe collection of (route, seconds, status) samples.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.writes = {'attempted': 0, 'succeeded': 0, 'failed': []}
+
+    def record(self, route, seconds, status, role):
+        with self.lock:
+            self.samples.setdefault(route, []).append((seconds, status, role))
+
+    def record_write(self, route, status):
+        with self.lock:
+            self.writes['attempted'] += 1
+            if status in (200, 302):
+                self.writes['succeeded'] += 1
+            else:
+                self.writes['failed'].append({'route': route, 'status': status})
+
+
+def _dashboard(user):
+    user.request('GET /', '/')
+
+
+def _companies(user):
+    user.request('GET /companies', '/companies')
+
+
+def _search(user):
+    # Typeahead: one request per keystroke of a student's name
+    name = user.rng.choice(user.inputs['names'])
+    for length in range(1, min(len(name), user.rng.randint(3, 8)) + 1):
+        user.request('GET /api/search_students', '/api/search_students?q=' + urllib.parse.quote(name[:length]))
+
+
+def _student_analysis(user):
+    name = user.rng.choice(user.inputs['names'])
+    user.request('GET /student_analysis', '/student_analysis')
+    user.request('GET /api/student_analysis/<name>', '/api/student_analysis/' + urllib.parse.quote(name))
+
+
+def _placement_statistics_section(user, section):
+    route = f'GET /api/placement_statistics/{section}'
+    path = f'/api/placement_statistics/{section}'
+    status, _, retry_after = user.request(route, path, etags=user.etags)
+    # Sections still being built answer 202; poll like the page's script does
+    for _ in range(30):
+        if status != 202:
+            break
+        time.sleep(float(retry_after or 1))
+        status, _, retry_after = user.request(f'{route} (retry)', path, etags=user.etags)
+
+
+def _placement_statistics(user):
+    # The page loads its sections in parallel and revalidates each with its ETag
+    user.request('GET /placement_statistics', '/placement_statistics')
+    threads = [
+        threading.Thread(target=_placement_statistics_section, args=(user, section))
+        for section in PLACEMENT_STATISTICS_SECTIONS
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _add_record(user):
+    status, _, _ = user.request('GET /add_record', '/add_record')
+    names = user.rng.sample(user.inputs['names'], k=min(2, len(user.inputs['names'])))
+    status, _, _ = user.request('POST /add_record', '/add_record', {
+        'company_name': f'Load Test Co {user.rng.randint(1, 10 ** 6)}',
+        'campus_type': user.rng.choice(['On Campus', 'Off Campus']),
+        'pr_assigned': user.rng.choice(user.inputs['pr_codes']),
+        'placement_origin': user.rng.choice(['CPCG', 'Department']),
+        'status': user.rng.choice(['On-going', 'Completed']),
+        'noof_students_placed': str(len(names)),
+        'role': 'Load Test Engineer',
+        'package': f'{user.rng.randint(3, 20)} LPA',
+        'student_names': ', '.join(names)
+    })
+    user.recorder.record_write('POST /add_record', status)
+
+
+def _edit_record(user):
+    record = user.rng.choice(user.inputs['records'])
+    user.request('GET /edit_record/<id>', f"/edit_record/{record['record_id']}")
+    status, _, _ = user.request('POST /edit_record/<id>', f"/edit_record/{record['record_id']}", {
+        'company_name': record['company_name'],
+        'campus_type': record['campus_type'],
+        'pr_assigned': record['pr_assigned'],
+        'placement_origin': record['placement_origin'],
+        'status': record['status'],
+        'noof_students_placed': record['noof_students_placed'],
+        'role': record['role'],
+        'package': record['package'],
+        'student_names': record['student_names']
+    })
+    user.recorder.record_write('POST /edit_record/<id>', status)
+
+
+ACTIONS = {
+    'dashboard': _dashboard,
+    'companies': _companies,
+    'search': _search,
+    'student_analysis': _student_analysis,
+    'placement_statistics': _placement_statistics,
+    'add_record': _add_record,
+    'edit_record': _edit_record
+}
+
+
+def _sample_inputs(data_dir):
+    with open(os.path.join(data_dir, 'FULL NAME LIST.csv'), newline='') as f:
+        names = [row['Name'].strip() for row in csv.DictReader(f)]
+    with open(os.path.join(data_dir, 'Master_Placement_Fila.csv'), newline='') as f:
+        records = list(csv.DictReader(f))
+    return {
+        'names': names,
+        'records': records,
+        'pr_codes': sorted({row['pr_assigned'] for row in records if row['pr_assigned']}) or ['']
+    }
+
+
+def _run_user(user, mix, deadline, think_time):
+    if not user.login():
+        return
+    actions = [action for action in mix if user.role == 'admin' or action not in ADMIN_ACTIONS]
+    weights = [mix[action] for action in actions]
+    if not actions or not any(weights):
+        return
+    while time.time() < deadline:
+        ACTIONS[user.rng.choices(actions, weights)[0]](user)
+        if think_time:
+            time.sleep(user.rng.uniform(0, 2 * think_time))
+
+
+def check_placement_file(data_dir, initial_rows, writes):
+    """
+    After the run the placement CSV must still parse, keep unique record ids and hold
+    one new row per successful add.
+    """
+    problems = []
+    try:
+        with open(os.path.join(data_dir, 'Master_Placement_Fila.csv'), newline='') as f:
+            rows = list(csv.DictReader(f))
+    except Exception as e:
+        return {'rows': None, 'problems': [f'placement file unreadable: {type(e).__name__}: {e}']}
+    record_ids = [row.get('record_id') for row in rows]
+    duplicates = sorted({rid for rid in record_ids if record_ids.count(rid) > 1})
+    if duplicates:
+        problems.append(f'duplicate record_id values: {", ".join(duplicates[:20])}')
+    expected = initial_rows + writes['successful_adds']
+    if len(rows) != expected:
+        problems.append(f'{len(rows)} rows on disk, expected {expected} ({expected - len(rows)} adds lost)')
+    return {'rows': len(rows), 'problems': problems}
+
+
+def summarise(recorder, elapsed):
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        latencies = sorted(seconds for seconds, _, _ in samples)
+        errors = [status for _, status, _ in samples if status is None or status >= 500]
+        status_counts = {}
+        for _, status, _ in samples:
+            status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+        routes[route] = {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / elapsed, 2),
+            'p50_ms': round(_percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(_percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(_percentile(latencies, 0.99) * 1000, 2),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+            'errors': len(errors),
+            'status_counts': status_counts
+        }
+    all_latencies = sorted(seconds for samples in recorder.samples.values() for seconds, _, _ in samples)
+    total = len(all_latencies)
+    return {
+        'routes': routes,
+        'overall': {
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2),
+            'p50_ms': round(_percentile(all_latencies, 0.50) * 1000, 2) if total else None,
+            'p95_ms': round(_percentile(all_latencies, 0.95) * 1000, 2) if total else None,
+            'p99_ms': round(_percentile(all_latencies, 0.99) * 1000, 2) if total else None,
+            'errors': sum(route['errors'] for route in routes.values())
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Drive a running placement app with concurrent mixed traffic.')
+    parser.add_argument('--students', type=int, default=2000)
+    parser.add_argument('--companies', type=int, default=200)
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--admin-fraction', type=float, default=0.1,
+                        help='Share of virtual users logged in as admin (only admins add/edit records)')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds of traffic after ramp-up')
+    parser.add_argument('--ramp-up', type=float, default=5.0, help='Seconds over which users log in')
+    parser.add_argument('--think-time', type=float, default=0.5, help='Mean pause between actions, in seconds')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Comma separated action=weight list')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'werkzeug'], default='auto')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+    parser.add_argument('--startup-timeout', type=float, default=300.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-data', action='store_true', help='Leave the generated cohort and server log on disk')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    mix = _parse_mix(args.mix)
+    kind = args.server
+    if kind == 'auto':
+        kind = 'gunicorn' if shutil.which('gunicorn') or _module_available('gunicorn') else 'werkzeug'
+
+    workdir = tempfile.mkdtemp(prefix=f'placement-load-{args.students}x{args.companies}-')
+    dataset = generate_cohort(workdir, args.students, args.companies, seed=args.seed)
+    inputs = _sample_inputs(dataset['data_dir'])
+    initial_rows = len(inputs['records'])
+
+    print(f'Starting {kind} on {args.students} students x {args.companies} companies', file=sys.stderr)
+    server = Server(workdir, kind, args.workers, args.threads, os.path.join(workdir, 'server.log'))
+    recorder = Recorder()
+    try:
+        started = time.time()
+        server.wait_until_ready(args.startup_timeout)
+        startup_s = time.time() - started
+
+        rng = random.Random(args.seed)
+        admins = max(1, round(args.users * args.admin_fraction)) if args.admin_fraction > 0 else 0
+        start = time.time()
+        deadline = start + args.ramp_up + args.duration
+        threads = []
+        for index in range(args.users):
+            role = 'admin' if index < admins else 'viewer'
+            user = VirtualUser(server.base_url, role, inputs, recorder, random.Random(rng.random()))
+            thread = threading.Thread(target=_run_user, args=(user, mix, deadline, args.think_time), daemon=True)
+            threads.append(thread)
+        for index, thread in enumerate(threads):
+            thread.start()
+            time.sleep(args.ramp_up / max(len(threads), 1))
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+
+        # Writes that ended in a server error plus lines in the server log about unreadable CSVs
+        adds = recorder.samples.get('POST /add_record', [])
+        writes = {
+            'attempted': recorder.writes['attempted'],
+            'succeeded': recorder.writes['succeeded'],
+            'failed': recorder.writes['failed'],
+            'successful_adds': sum(1 for _, status, _ in adds if status in (200, 302))
+        }
+        file_check = check_placement_file(dataset['data_dir'], initial_rows, writes)
+        log_errors = server.csv_errors()
+    finally:
+        server.stop()
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'server': kind
+        },
+        'settings': dict(vars(args), mix=mix),
+        'dataset': dataset,
+        'startup_s': round(startup_s, 3),
+        'elapsed_s': round(elapsed, 3),
+        **summarise(recorder, elapsed),
+        'write_safety': {
+            'writes': writes,
+            'placement_file': file_check,
+            'server_log_csv_errors': log_errors[:50],
+            'concurrent_write_errors': bool(writes['failed'] or file_check['problems'] or log_errors)
+        }
+    }
+
+    for route, stats in report['routes'].items():
+        print(f"  {route:<40} {stats['requests']:6d} req {stats['throughput_rps']:8.2f}/s  "
+              f"p50 {stats['p50_ms']:8.1f}ms  p95 {stats['p95_ms']:8.1f}ms  p99 {stats['p99_ms']:8.1f}ms  "
+              f"errors {stats['errors']}", file=sys.stderr)
+    if report['write_safety']['concurrent_write_errors']:
+        print('  Concurrent write problems detected - see write_safety in the report', file=sys.stderr)
+    if not args.keep_data:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Benchmark runner for the placement app.
+
+For each requested scale a synthetic cohort is generated, the app is pointed at it,
+and every route (through Flask's test client) and every heavy analytics function is
+timed cold (caches cleared) and warm (repeated calls). The JSON report contains the
+raw timings, a scaling curve per target and the targets ordered by what breaks first.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scales 200x20,2000x200 --output bench_report.json
+    python benchmarks/run_benchmarks.py --scales 200x20,2000x200,20000x1000 --budget 60
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+import app as placement_app  # noqa: E402
+from benchmarks.generate_cohort import generate_cohort  # noqa: E402
+
+DEFAULT_SCALES = '200x20,2000x200'
+
+
+def _parse_scales(value):
+    scales = []
+    for item in value.split(','):
+        students, companies = item.lower().split('x')
+        scales.append((int(students), int(companies)))
+    return scales
+
+
+def point_app_at(data_dir):
+    """
+    Point the app's file paths at a generated data folder and drop every cache.
+    """
+    placement_app.STUDENTS_CSV = os.path.join(data_dir, 'FULL NAME LIST.csv')
+    placement_app.PLACEMENT_CSV = os.path.join(data_dir, 'Master_Placement_Fila.csv')
+    placement_app.ANALYSIS_CSV = os.path.join(data_dir, 'Analysis - Overall.csv')
+    placement_app.ANALYSIS_FOLDER = os.path.join(data_dir, 'ANALYSIS')
+    placement_app.COHORTS_FOLDER = os.path.join(data_dir, 'cohorts')
+    reset_app_caches()
+
+
+def reset_app_caches():
+    placement_app._student_caches.clear()
+    placement_app._student_df_caches.clear()
+    placement_app._student_summaries.clear()
+    placement_app._funnel_cache.clear()
+    placement_app._placements_caches.clear()
+    for cohort in placement_app.get_cohorts().values():
+        shutil.rmtree(cohort['jobs_folder'], ignore_errors=True)
+    placement_app.invalidate_derived_cache()
+
+
+def _sample_inputs(data_dir):
+    students = pd.read_csv(os.path.join(data_dir, 'FULL NAME LIST.csv'))
+    placements = pd.read_csv(os.path.join(data_dir, 'Master_Placement_Fila.csv'))
+    student_name = str(students['Name'].iloc[len(students) // 2])
+    placed = placements[placements['student_names'].notna()]
+    company_id = str((placed if not placed.empty else placements)['company_id'].iloc[0])
+    return {
+        'student_name': student_name,
+        'search_query': student_name.split()[0][:3],
+        'company_id': company_id,
+        'record_id': int(placements['record_id'].iloc[0])
+    }
+
+
+def build_targets(client, inputs):
+    """
+    Return (name, callable) pairs; each callable returns a status code or None.
+    """
+    def route(path):
+        def call():
+            return client.get(path).status_code
+        return call
+
+    def job_route(path):
+        # Job-backed endpoints answer 202 until their background job is done; time until the result
+        separator = '&' if '?' in path else '?'
+        def call():
+            while True:
+                response = client.get(f'{path}{separator}wait={placement_app.JOB_MAX_WAIT}')
+                if response.status_code != 202:
+                    return response.status_code
+        return call
+
+    def function(fn, *args):
+        def call():
+            fn(*args)
+            return None
+        return call
+
+    name = inputs['student_name']
+    return [
+        ('route:/', route('/')),
+        ('route:/students', route('/students')),
+        ('route:/pr_dashboard', route('/pr_dashboard')),
+        ('route:/companies', route('/companies')),
+        ('route:/ongoing_companies', route('/ongoing_companies')),
+        ('route:/add_record', route('/add_record')),
+        ('route:/edit_record', route(f"/edit_record/{inputs['record_id']}")),
+        ('route:/api/search_students', route(f"/api/search_students?q={inputs['search_query']}")),
+        ('route:/api/company_stats', route(f"/api/company_stats/{inputs['company_id']}")),
+        ('route:/api/student_class', route(f'/api/student_class/{name}')),
+        ('route:/api/student_analysis', route(f'/api/student_analysis/{name}')),
+        ('route:/api/placement_statistics', job_route('/api/placement_statistics')),
+        ('route:/api/placement_statistics/overall', route('/api/placement_statistics/overall')),
+        ('route:/api/placement_statistics/student_activity', route('/api/placement_statistics/student_activity')),
+        ('route:/api/all_students_analysis', job_route('/api/all_students_analysis')),
+        ('route:/api/company_funnels', route('/api/company_funnels')),
+        ('fn:get_comprehensive_placement_statistics',
+         function(placement_app.get_comprehensive_placement_statistics)),
+        ('fn:get_student_summary',
+         function(placement_app.get_student_summary, name)),
+        ('fn:build_company_views',
+         lambda: function(placement_app.build_company_views, placement_app.load_placements())()),
+        ('fn:build_company_status_index',
+         lambda: function(placement_app.build_company_status_index, placement_app.load_placements())()),
+        ('fn:match_analysis_names', function(placement_app.match_analysis_names)),
+    ]
+
+
+def _timed(call):
+    # The app reports progress with print(); keep it out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        status = call()
+        elapsed = time.perf_counter() - start
+    return elapsed, status
+
+
+def run_scale(students, companies, args, over_budget):
+    workdir = tempfile.mkdtemp(prefix=f'placement-bench-{students}x{companies}-')
+    dataset = generate_cohort(workdir, students, companies, seed=args.seed,
+                              analysis_fraction=args.analysis_fraction,
+                              overall_companies=args.overall_companies)
+    point_app_at(dataset['data_dir'])
+
+    placement_app.app.testing = True
+    client = placement_app.app.test_client()
+    client.post('/login', data={'username': 'admin', 'password': 'admin123'})
+
+    results = {}
+    for name, call in build_targets(client, _sample_inputs(dataset['data_dir'])):
+        if name in over_budget:
+            results[name] = {'skipped': f'exceeded {args.budget}s budget at {over_budget[name]}'}
+            continue
+        reset_app_caches()
+        try:
+            cold, status = _timed(call)
+            warm = [cold] if cold > args.budget else [_timed(call)[0] for _ in range(args.repeat)]
+        except Exception as e:
+            results[name] = {'error': f'{type(e).__name__}: {e}'}
+            continue
+        results[name] = {
+            'cold_s': round(cold, 6),
+            'warm_median_s': round(statistics.median(warm), 6),
+            'warm_min_s': round(min(warm), 6),
+            'status_code': status
+        }
+        if cold > args.budget:
+            over_budget[name] = f'{students}x{companies}'
+        print(f"  {name:<45} cold {cold:8.3f}s  warm {results[name]['warm_median_s']:8.3f}s", file=sys.stderr)
+    return {'students': students, 'companies': companies, 'dataset': dataset, 'results': results}
+
+
+def summarise(scale_runs):
+    """
+    Build a scaling curve per target plus a log-log growth exponent against cohort size,
+    and order the targets by what breaks first.
+    """
+    curves = {}
+    for run in scale_runs:
+        for name, result in run['results'].items():
+            curves.setdefault(name, []).append({
+                'students': run['students'],
+                'companies': run['companies'],
+                'cold_s': result.get('cold_s'),
+                'warm_median_s': result.get('warm_median_s'),
+                'note': result.get('skipped') or result.get('error')
+            })
+
+    growth = {}
+    for name, points in curves.items():
+        measured = [p for p in points if p['cold_s']]
+        if len(measured) >= 2:
+            first, last = measured[0], measured[-1]
+            size_ratio = math.log((last['students'] * last['companies']) / (first['students'] * first['companies']))
+            growth[name] = round(math.log(last['cold_s'] / first['cold_s']) / size_ratio, 3) if size_ratio else None
+        else:
+            growth[name] = None
+
+    def break_order(name):
+        points = curves[name]
+        measured = [p for p in points if p['cold_s']]
+        # Targets that stopped being measurable sort first, then by slowest last measurement
+        return (len(measured), -(measured[-1]['cold_s'] if measured else 0))
+
+    return {
+        'curves': curves,
+        'growth_exponent': growth,
+        'breaks_first': sorted(curves, key=break_order)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark placement app routes and analytics functions.')
+    parser.add_argument('--scales', default=DEFAULT_SCALES,
+                        help='Comma separated STUDENTSxCOMPANIES list, e.g. 200x20,2000x200,20000x1000')
+    parser.add_argument('--repeat', type=int, default=3, help='Warm repetitions per target')
+    parser.add_argument('--budget', type=float, default=30.0,
+                        help='Seconds a single cold call may take before the target is skipped at larger scales')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--analysis-fraction', type=float, default=0.6)
+    parser.add_argument('--overall-companies', type=int, default=30)
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    scale_runs = []
+    over_budget = {}
+    for students, companies in _parse_scales(args.scales):
+        print(f'Scale {students} students x {companies} companies', file=sys.stderr)
+        scale_runs.append(run_scale(students, companies, args, over_budget))
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count()
+        },
+        'settings': vars(args),
+        'scales': scale_runs,
+        **summarise(scale_runs)
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
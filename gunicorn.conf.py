@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for the placement app.
+
+    gunicorn -c gunicorn.conf.py app:app
+
+The app is imported once in the master (preload_app) and warmed there before any
+worker is forked, so every worker starts with the CSV caches and indexes already
+built and shares those pages copy-on-write instead of loading its own copy.
+"""
+import gc
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:10000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before workers are spawned
+    import app as placement_app
+
+    os.makedirs('data', exist_ok=True)
+    # Counters start from zero; the warmup's own counts go in the master's snapshot file
+    placement_app.clear_shared_metrics()
+    placement_app.warmup()
+    placement_app.flush_metrics()
+    # Move everything built so far out of the collector's generations; otherwise the
+    # first collection in each worker touches every object and un-shares the pages
+    gc.freeze()